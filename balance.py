@@ -0,0 +1,375 @@
+"""Párhuzamos játékegyensúly-sweep: headless AI játékok a balansz-paraméterek rácsán vagy mintáján.
+
+A balansz-állandók szét vannak szórva: a nehézségi szintek életei és sebességszorzója
+(`main.DIFFICULTY_SETTINGS`), az ellenség-ugrás esélyei és távolságai (`move_enemies`),
+a lövési késleltetések és a power-up spawn esélye (`helper`). A sweep minden ponton
+ugyanazokkal a magokkal futtat `games` headless játékot (közös véletlenszámok: a pontok
+közti különbség nem a sorsolásból jön), a pontokat folyamatkészleten osztja szét, és
+pontonként összesíti a túlélési időt és a pontszámot.
+
+A lépéskorlátig (`--max-steps`) kitartó játék túlélése ismeretlen (csak alsó korlát), ezért
+a túlélési idő csak a véget ért (game over) játékokon átlagolódik, mellette a korlátot elérő
+játékok aránya (`capped_rate`) áll. A túlélés szerinti rangsor ezt is figyelembe veszi:
+előbb a korlátig kitartó arány, azon belül a véget ért játékok túlélése dönt.
+
+    python balance.py --param speed_multiplier=0.8:1.6:5 --param lives=2,3,4 \\
+        --games 8 --out sweep.csv --heatmap sweep.png
+    python balance.py --param enemy_jump_chance_close=0.05:0.3 \\
+        --param base_shoot_delay=600:1400 --samples 40 --step-scale 2
+
+Paraméter-megadás: "név=a,b,c" (felsorolás), "név=alsó:felső[:n]" (rácson n egyenletes
+pont, alapból 5; `--samples` esetén egyenletes minta a tartományból).
+"""
+
+import argparse
+import contextlib
+import csv
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from headless import MAX_GAME_STEPS
+from helper import SIM_STEP_MS
+
+# sweepelhető paraméterek: név -> leírás; a nagybetűs név a `helper` (és a `main`) állandója,
+# kivéve a nehézségi szint kulcsait (`DIFFICULTY_KEYS`)
+PARAMETERS: Dict[str, str] = {
+    "speed_multiplier": "ellenség-sebességszorzó (nehézségi szint)",
+    "lives": "kezdő életek (nehézségi szint)",
+    "enemy_count": "kezdő ellenségszám (nehézségi szint)",
+    "enemy_jump_chance_far": "ugrás esélye lépésenként, távoli ellenség",
+    "enemy_jump_chance_close": "ugrás esélye lépésenként, közeli ellenség",
+    "enemy_jump_distance": "ugrás hossza px-ben",
+    "enemy_close_distance": "a közeli ellenség távolsághatára px-ben",
+    "base_shoot_delay": "alap lövési késleltetés ms-ban",
+    "powerup_shoot_delay": "lövési késleltetés csillaggal ms-ban",
+    "powerup_spawn_chance": "csillag-spawn esélye lépésenként",
+}
+DIFFICULTY_KEYS = ("speed_multiplier", "lives", "enemy_count")
+INT_PARAMETERS = ("lives", "enemy_count", "enemy_jump_distance", "enemy_close_distance",
+                  "base_shoot_delay", "powerup_shoot_delay")
+METRICS = ("survival_s", "score", "level", "capped_rate")
+DEFAULT_GRID_POINTS = 5
+
+ParamSpec = Tuple[str, Union[List[float], Tuple[float, float, int]]]
+
+
+def parse_param(text: str) -> ParamSpec:
+    """"név=a,b,c" vagy "név=alsó:felső[:n]" paraméter-megadás feldolgozása.
+
+    Visszatérés:
+        ParamSpec: (név, értéklista) vagy (név, (alsó, felső, n)).
+
+    Kivétel dobása:
+        argparse.ArgumentTypeError: Ismeretlen név vagy hibás formátum esetén.
+    """
+    name, sep, values = text.partition("=")
+    name = name.strip()
+    if not sep or name not in PARAMETERS:
+        raise argparse.ArgumentTypeError(
+            f"hibás paraméter: {text!r} (ismert nevek: {', '.join(PARAMETERS)})")
+    try:
+        if ":" in values:
+            parts = [float(v) for v in values.split(":")]
+            if len(parts) not in (2, 3) or parts[0] > parts[1]:
+                raise ValueError
+            n = int(parts[2]) if len(parts) == 3 else DEFAULT_GRID_POINTS
+            if n < 1:
+                raise ValueError
+            return name, (parts[0], parts[1], n)
+        return name, [float(v) for v in values.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"hibás értékek: {text!r} (várt: név=a,b,c vagy név=alsó:felső[:n])")
+
+
+def _cast(name: str, value: float) -> Union[int, float]:
+    return int(round(value)) if name in INT_PARAMETERS else float(value)
+
+
+def grid_points(specs: Sequence[ParamSpec]) -> List[Dict[str, Union[int, float]]]:
+    """A paraméterek teljes rácsa (Descartes-szorzat); tartománynál n egyenletes pont."""
+    axes = []
+    for name, values in specs:
+        if isinstance(values, tuple):
+            lo, hi, n = values
+            values = list(np.linspace(lo, hi, n))
+        axes.append([_cast(name, v) for v in dict.fromkeys(values)])
+    names = [name for name, _ in specs]
+    points = [dict(zip(names, combo)) for combo in itertools.product(*axes)]
+    # egészre kerekítésnél a rács pontjai egybeeshetnek
+    return [dict(p) for p in dict.fromkeys(tuple(p.items()) for p in points)]
+
+
+def sample_points(specs: Sequence[ParamSpec], count: int, seed: int = 0) -> List[Dict[str, Union[int, float]]]:
+    """`count` véletlen pont: tartományból egyenletesen, felsorolásból választva."""
+    rng = np.random.default_rng(seed)
+    points = []
+    for _ in range(count):
+        point = {}
+        for name, values in specs:
+            if isinstance(values, tuple):
+                value = rng.uniform(values[0], values[1])
+            else:
+                value = values[int(rng.integers(len(values)))]
+            point[name] = _cast(name, value)
+        points.append(point)
+    return points
+
+
+def baseline(difficulty_index: int = 1) -> Dict[str, Union[int, float]]:
+    """A paraméterek jelenlegi (kódbeli) értéke a megadott nehézségen."""
+    import helper
+    import main
+
+    settings = main.DIFFICULTY_SETTINGS[difficulty_index]
+    return {name: settings[name] if name in DIFFICULTY_KEYS else getattr(helper, name.upper())
+            for name in PARAMETERS}
+
+
+@contextlib.contextmanager
+def apply_params(params: Dict[str, Union[int, float]], difficulty_index: int = 1) -> Iterator[None]:
+    """A paraméterek ideiglenes felülírása (a `with` blokk végén visszaáll).
+
+    A nagybetűs állandót minden modulban átírjuk, ahol ilyen nevű kötés van (a `main` a
+    `from helper import *` miatt saját másolatot tart); a nehézségi kulcsok a
+    `main.DIFFICULTY_SETTINGS` adott szintjén módosulnak.
+    """
+    import helper
+    import main
+
+    saved: List[Tuple[Any, str, Any]] = []
+
+    def _set(obj: Any, attr: str, value: Any) -> None:
+        saved.append((obj, attr, getattr(obj, attr)))
+        setattr(obj, attr, value)
+
+    try:
+        level = {name: value for name, value in params.items() if name in DIFFICULTY_KEYS}
+        if level:
+            table = list(main.DIFFICULTY_SETTINGS)
+            table[difficulty_index] = dict(table[difficulty_index], **level)
+            _set(main, "DIFFICULTY_SETTINGS", tuple(table))
+        for name, value in params.items():
+            if name in DIFFICULTY_KEYS:
+                continue
+            for module in (helper, main):
+                if hasattr(module, name.upper()):
+                    _set(module, name.upper(), value)
+        if "powerup_shoot_delay" in params:
+            _set(helper, "POWERUP_SHOOT_DELAYS", dict(helper.POWERUP_SHOOT_DELAYS,
+                                                      star=params["powerup_shoot_delay"]))
+        yield
+    finally:
+        for obj, attr, value in reversed(saved):
+            setattr(obj, attr, value)
+
+
+def run_point(index: int, params: Dict[str, Union[int, float]], games: int = 8, seed: int = 0,
+              difficulty_index: int = 1, policy_name: str = "rule", step_scale: int = 1,
+              max_steps: int = MAX_GAME_STEPS) -> Dict[str, Any]:
+    """Egy paraméterpont kiértékelése (folyamatkészlet-feladat).
+
+    Paraméterek:
+        index (int): A pont sorszáma (a kimenet sorrendjéhez).
+        params (Dict[str,int|float]): Felülírt paraméterek.
+        games (int): Játékok száma; a g-edik játék magja `seed + g` minden ponton.
+        difficulty_index (int): Nehézség (0..2), ennek a szintnek a kulcsai módosulnak.
+        policy_name (str): Policy (lásd `headless.resolve_policy`).
+        step_scale (int): Összevont lépés (lásd `HeadlessGame`).
+        max_steps (int): Lépéskorlát alaplépésben.
+
+    Visszatérés:
+        Dict[str,Any]: {"index","params","survival_s","survival_sd","ended","capped_rate","score",
+            "score_sd","level","seconds"}; a "survival_s"/"survival_sd" csak a véget ért
+            ("ended" darab) játékokra vonatkozik (NaN, ha mind elérte a lépéskorlátot).
+    """
+    from headless import resolve_policy, run_game
+
+    policy = resolve_policy(policy_name)
+    t0 = time.perf_counter()
+    with apply_params(params, difficulty_index):
+        runs = [run_game(policy, difficulty_index, seed + g, max_steps, step_scale=step_scale)
+                for g in range(games)]
+    # a lépéskorlátig kitartó játék túlélése csak alsó korlát: nem kerül az átlagba
+    survival = np.array([r["game_seconds"] for r in runs if r["game_over"]])
+    scores = np.array([r["score"] for r in runs], dtype=float)
+    return {"index": index, "params": params,
+            "survival_s": float(survival.mean()) if len(survival) else float("nan"),
+            "survival_sd": float(survival.std()) if len(survival) else float("nan"),
+            "ended": len(survival), "capped_rate": 1.0 - len(survival) / len(runs),
+            "score": float(scores.mean()), "score_sd": float(scores.std()),
+            "level": float(np.mean([r["level"] for r in runs])),
+            "seconds": time.perf_counter() - t0}
+
+
+def sweep(points: Sequence[Dict[str, Union[int, float]]], games: int = 8, seed: int = 0,
+          difficulty_index: int = 1, policy_name: str = "rule", step_scale: int = 1,
+          max_steps: int = MAX_GAME_STEPS, workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Minden pont kiértékelése folyamatkészleten (pontonként egy feladat).
+
+    Visszatérés:
+        List[Dict[str,Any]]: `run_point` eredményei a pontok sorrendjében.
+    """
+    workers = workers or os.cpu_count() or 1
+    results: List[Optional[Dict[str, Any]]] = [None] * len(points)
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_point, i, dict(p), games, seed, difficulty_index, policy_name,
+                               step_scale, max_steps)
+                   for i, p in enumerate(points)]
+        for done, fut in enumerate(as_completed(futures), 1):
+            res = fut.result()
+            results[res["index"]] = res
+            print(f"  [{done}/{len(points)}] {_format_params(res['params'])} | {_format_survival(res)} "
+                  f"| pont {res['score']:7.1f} | {res['seconds']:.1f} s (eltelt {time.perf_counter() - t0:.0f} s)")
+    return [r for r in results if r is not None]
+
+
+def _format_params(params: Dict[str, Union[int, float]]) -> str:
+    return ", ".join(f"{name}={value:g}" for name, value in params.items())
+
+
+def _format_survival(res: Dict[str, Any]) -> str:
+    survival = ("     -" if not res["ended"] else
+                f"{res['survival_s']:6.1f} ± {res['survival_sd']:.1f} s")
+    return f"túlélés {survival} (korlátig {res['capped_rate'] * 100:3.0f}%)"
+
+
+def rank_key(res: Dict[str, Any], metric: str = "survival_s") -> Tuple[float, ...]:
+    """Rendezési kulcs (nagyobb = jobb).
+
+    Túlélésnél előbb a lépéskorlátig kitartó játékok aránya, azon belül a véget ért
+    játékok átlagos túlélése (ha egy sem ért véget, az a legjobb), végül a pontszám dönt;
+    a többi metrikánál maga az érték.
+    """
+    if metric == "survival_s":
+        survival = res["survival_s"] if res["ended"] else float("inf")
+        return (res["capped_rate"], survival, res["score"])
+    return (res[metric],)
+
+
+def write_table(results: Sequence[Dict[str, Any]], path: str) -> None:
+    """Az eredmények CSV-táblája: paraméteroszlopok, majd a metrikák (szórással)."""
+    names = list(results[0]["params"]) if results else []
+    columns = ["survival_s", "survival_sd", "ended", "capped_rate", "score", "score_sd", "level"]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(names + columns)
+        for res in results:
+            # NaN (egyetlen játék sem ért véget) üres cellaként
+            w.writerow([res["params"][n] for n in names]
+                       + ["" if res[c] != res[c] else round(res[c], 4) for c in columns])
+
+
+def _heat_color(t: float) -> Tuple[int, int, int]:
+    """0..1 érték színe (sötétkék -> zöld -> sárga)."""
+    stops = ((0.0, (40, 30, 110)), (0.5, (30, 150, 130)), (1.0, (250, 230, 40)))
+    for (t0, c0), (t1, c1) in zip(stops, stops[1:]):
+        if t <= t1:
+            u = (t - t0) / (t1 - t0)
+            return tuple(int(a + (b - a) * u) for a, b in zip(c0, c1))  # type: ignore[return-value]
+    return stops[-1][1]
+
+
+def write_heatmap(results: Sequence[Dict[str, Any]], path: str, metric: str = "survival_s",
+                  cell: int = 64) -> None:
+    """Két paraméteres rács hőtérképe PNG-be (cellánként a metrika értékével).
+
+    Kivétel dobása:
+        ValueError: Ha az eredmények nem pontosan két paraméter rácsán vannak.
+    """
+    import pygame
+
+    names = list(results[0]["params"]) if results else []
+    if len(names) != 2:
+        raise ValueError("hőtérkép csak két sweepelt paraméterrel készíthető")
+    xs = sorted({r["params"][names[0]] for r in results})
+    ys = sorted({r["params"][names[1]] for r in results})
+    if len(xs) * len(ys) != len(results):
+        raise ValueError("hőtérképhez teljes rács kell (--samples nélkül)")
+    values = {(r["params"][names[0]], r["params"][names[1]]): r[metric] for r in results}
+    finite = [v for v in values.values() if v == v] or [0.0]   # NaN: minden játék elérte a korlátot
+    lo, hi = min(finite), max(finite)
+    pygame.font.init()
+    font = pygame.font.SysFont(None, 20)
+    title = font.render(f"{metric} | x: {names[0]} | y: {names[1]}", True, (0, 0, 0))
+    margin_x, margin_y = 90, 50
+    surface = pygame.Surface((max(margin_x + cell * len(xs), title.get_width() + 10) + 10,
+                              margin_y + cell * len(ys) + 40))
+    surface.fill((255, 255, 255))
+    for i, x in enumerate(xs):
+        for j, y in enumerate(ys):
+            value = values[(x, y)]
+            if value != value:
+                color = (200, 200, 200)
+            else:
+                color = _heat_color((value - lo) / (hi - lo) if hi > lo else 0.5)
+            rect = pygame.Rect(margin_x + i * cell, margin_y + (len(ys) - 1 - j) * cell, cell, cell)
+            surface.fill(color, rect)
+            text_color = (0, 0, 0) if sum(color) > 380 else (255, 255, 255)
+            label = font.render("korlát" if value != value else f"{value:.4g}", True, text_color)
+            surface.blit(label, label.get_rect(center=rect.center))
+        label = font.render(f"{x:g}", True, (0, 0, 0))
+        surface.blit(label, label.get_rect(midtop=(margin_x + i * cell + cell // 2, margin_y + cell * len(ys) + 4)))
+    for j, y in enumerate(ys):
+        label = font.render(f"{y:g}", True, (0, 0, 0))
+        surface.blit(label, label.get_rect(midright=(margin_x - 6, margin_y + (len(ys) - 1 - j) * cell + cell // 2)))
+    surface.blit(title, (10, 10))
+    surface.blit(font.render(f"min {lo:.4g} .. max {hi:.4g}", True, (0, 0, 0)), (10, 28))
+    pygame.image.save(surface, path)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Parancssori belépési pont: sweep, táblázat és (két paraméternél) hőtérkép."""
+    parser = argparse.ArgumentParser(description="Párhuzamos játékegyensúly-paraméter sweep")
+    parser.add_argument("--param", type=parse_param, action="append", required=True, metavar="NÉV=ÉRTÉKEK",
+                        help="név=a,b,c vagy név=alsó:felső[:n]; többször megadható "
+                             f"(nevek: {', '.join(PARAMETERS)})")
+    parser.add_argument("--samples", type=int, default=None,
+                        help="teljes rács helyett ennyi véletlen pont a tartományokból")
+    parser.add_argument("--games", type=int, default=8, help="játékok pontonként (azonos magokkal)")
+    parser.add_argument("--policy", default="rule", help="rule | hybrid | modul:függvény")
+    parser.add_argument("--difficulty", type=int, default=1, choices=(0, 1, 2))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-steps", type=int, default=MAX_GAME_STEPS, help="lépéskorlát játékonként (alaplépés)")
+    parser.add_argument("--step-scale", type=int, default=1,
+                        help="összevont szimulációs lépés (2–4: gyorsabb, lásd bench.py timestep)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", default="sweep.csv", help="eredménytábla (CSV)")
+    parser.add_argument("--heatmap", default=None, metavar="PNG", help="hőtérkép (két paraméteres rácsnál)")
+    parser.add_argument("--metric", choices=METRICS, default="survival_s", help="a hőtérkép és a rangsor metrikája")
+    args = parser.parse_args(argv)
+
+    names = [name for name, _ in args.param]
+    if len(set(names)) != len(names):
+        parser.error("egy paraméter csak egyszer adható meg")
+    if args.heatmap and (len(names) != 2 or args.samples):
+        parser.error("a --heatmap két paraméteres teljes rácsot igényel")
+    points = (sample_points(args.param, args.samples, args.seed) if args.samples
+              else grid_points(args.param))
+    base = baseline(args.difficulty)
+    print(f"{len(points)} pont × {args.games} játék | alapértékek: "
+          f"{_format_params({n: base[n] for n in names})}")
+    t0 = time.perf_counter()
+    results = sweep(points, args.games, args.seed, args.difficulty, args.policy, args.step_scale,
+                    args.max_steps, args.workers)
+    write_table(results, args.out)
+    print(f"Táblázat mentve: {args.out} ({time.perf_counter() - t0:.1f} s)")
+    if args.heatmap:
+        write_heatmap(results, args.heatmap, args.metric)
+        print(f"Hőtérkép mentve: {args.heatmap}")
+    cap_s = args.max_steps * SIM_STEP_MS / 1000.0
+    best = sorted(results, key=lambda r: rank_key(r, args.metric), reverse=True)[:5]
+    print(f"Legjobb pontok ({args.metric}; túlélés csak a véget ért játékokon, korlát {cap_s:.0f} s):")
+    for res in best:
+        print(f"  {_format_params(res['params'])} | {_format_survival(res)} "
+              f"| pont {res['score']:.1f} ± {res['score_sd']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,527 @@
+"""Mérő- és ellenőrző szkriptek a játéklogikához (a statisztikai ellenőrzések a tests/ alatt).
+
+Használat:
+    python bench.py clone [--n N] [--warmup-steps N] [--horizon H] [--enemies N]
+    python bench.py collisions [--steps N] [--games N] [--enemies N] [--seed S]
+    python bench.py render [--bullets N] [--enemies N] [--frames N] [--seed S]
+    python bench.py timestep [--scales 1,2,4] [--games N] [--policy rule] [--seed S] [--no-sweep]
+    python bench.py trace [--steps N] [--games N] [--enemies N] [--seed S] [--rounds N] [--detail] [--out trace.json]
+    python bench.py observe [--frames N] [--factor F] [--stack K] [--seed S]
+
+Az alparancsok kirajzolás nélkül (SDL "dummy" driverrel) futnak.
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+import collision
+import helper
+import render
+
+TRACE_OVERHEAD_TARGET_PCT = 1.0   # az eseménynapló overheadjének célja a frame-munkához képest
+
+
+def clone_bench(n: int = 20000, warmup_steps: int = 300, horizon: int = 30,
+                enemy_count: Optional[int] = None, seed: int = 0) -> Dict[str, Any]:
+    """`GameState` klónozás/visszaállítás sebessége és pillanatképenkénti memória.
+
+    Egy headless játékot `warmup_steps` lépésig futtat, majd mér:
+        - clone/s: független másolat készítése,
+        - restore/s: meglévő scratch állapot visszaállítása a gyökérre,
+        - branch/s: restore + `horizon` lépés (ahogy egy előretekintő tervező használja),
+        - memória: tracemalloc szerint `n` élő klón / n.
+
+    Paraméterek:
+        n (int): Klónok száma a méréshez.
+        warmup_steps (int): Lépések a mérés előtt (power-upok, időzítők, lövedékek legyenek).
+        horizon (int): Ágankénti szimulált lépések.
+        enemy_count (Optional[int]): Kezdő ellenségszám (None: nehézség szerint).
+        seed (int): Mag.
+
+    Visszatérés:
+        Dict[str,Any]: {"enemies","clones_per_s","restores_per_s","branches_per_s",
+            "branch_steps_per_s","bytes_per_snapshot"}
+    """
+    from headless import HeadlessGame, rule_policy
+    from stress import auto_grid
+
+    grid = auto_grid(enemy_count) if enemy_count else None
+    game = HeadlessGame(1, seed, grid=grid, enemy_count=enemy_count)
+    for _ in range(warmup_steps):
+        game.step(rule_policy(game))
+    root = game.snapshot()
+
+    t0 = time.perf_counter()
+    for _ in range(n):
+        root.clone()
+    clone_s = time.perf_counter() - t0
+
+    scratch = root.clone()
+    t0 = time.perf_counter()
+    for _ in range(n):
+        scratch.restore(root)
+    restore_s = time.perf_counter() - t0
+
+    branches = max(1, n // max(1, horizon * 10))
+    t0 = time.perf_counter()
+    for _ in range(branches):
+        scratch.restore(root)
+        for _ in range(horizon):
+            scratch.step(None)
+    branch_s = time.perf_counter() - t0
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    keep = [root.clone() for _ in range(n)]
+    per_snapshot = (tracemalloc.get_traced_memory()[0] - before) / len(keep)
+    tracemalloc.stop()
+
+    return {"enemies": len(root.enemies), "clones_per_s": n / clone_s,
+            "restores_per_s": n / restore_s, "branches_per_s": branches / branch_s,
+            "branch_steps_per_s": branches * horizon / branch_s,
+            "bytes_per_snapshot": per_snapshot}
+
+
+def collision_bench(steps: int = 3000, games: int = 3, enemy_count: Optional[int] = None,
+                    seed: int = 0) -> Dict[str, Dict[str, float]]:
+    """Rect-alapú és pixelpontos (maszkos) ütközés összevetése headless játékokon.
+
+    Mindkét módban ugyanazokkal a magokkal fut `games` játék (legfeljebb `steps` lépés),
+    a szabály-alapú AI-jal. Az ütközésvizsgáló függvények (`handle_bullet_collisions`,
+    `check_player_collision`) idejét külön mérjük, így a pontosság ára lépésenként látszik.
+
+    Paraméterek:
+        steps (int): Lépések játékonként (legfeljebb).
+        games (int): Játékok száma módonként.
+        enemy_count (Optional[int]): Kezdő ellenségszám (None: nehézség szerint).
+        seed (int): Az első játék magja.
+
+    Visszatérés:
+        Dict[str,Dict[str,float]]: "rect" és "mask" kulccsal: {"steps","step_us","collide_us",
+            "score","rect_hits","mask_rejects","cache_entries"}
+    """
+    from headless import HeadlessGame, rule_policy
+    from stress import auto_grid
+
+    grid = auto_grid(enemy_count) if enemy_count else None
+    originals = (helper.handle_bullet_collisions, helper.check_player_collision)
+    timed = {"s": 0.0}
+
+    def _timed(func: Any) -> Any:
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            t0 = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timed["s"] += time.perf_counter() - t0
+        return wrapper
+
+    results: Dict[str, Dict[str, float]] = {}
+    helper.handle_bullet_collisions = _timed(originals[0])
+    helper.check_player_collision = _timed(originals[1])
+    try:
+        for name, pixel in (("rect", False), ("mask", True)):
+            timed["s"] = 0.0
+            collision.stats.update(rect_hits=0, mask_rejects=0)
+            total_s = 0.0
+            done = 0
+            score = 0
+            for g in range(games):
+                game = HeadlessGame(1, seed + g, grid=grid, enemy_count=enemy_count)
+                game.level_data["pixel_collisions"] = pixel
+                for _ in range(steps):
+                    action = rule_policy(game)
+                    t0 = time.perf_counter()
+                    over = game.step(action)
+                    total_s += time.perf_counter() - t0
+                    done += 1
+                    if over:
+                        break
+                score += game.score
+            results[name] = {"steps": done, "step_us": total_s / done * 1e6,
+                             "collide_us": timed["s"] / done * 1e6, "score": score / games,
+                             "rect_hits": collision.stats["rect_hits"],
+                             "mask_rejects": collision.stats["mask_rejects"],
+                             "cache_entries": len(collision._cache)}
+    finally:
+        helper.handle_bullet_collisions, helper.check_player_collision = originals
+    return results
+
+
+def _draw_unbatched(screen: pygame.Surface, bullets: List[List[int]], enemies: List[Dict[str, Any]],
+                    heart_img: pygame.Surface, lives: int) -> int:
+    """A korábbi kirajzolás (körönkénti `draw.circle`, ellenségenkénti `blit`, frame-enként
+    új `SysFont` a UI-hoz); a kiadott rajzolási hívások számával tér vissza."""
+    screen.fill((0, 0, 0))
+    for b in bullets:
+        pygame.draw.circle(screen, render.BULLET_COLOR, b, render.BULLET_RADIUS)
+    for e in enemies:
+        screen.blit(e["image"], e["rect"])
+    font = pygame.font.SysFont(None, 36)
+    screen.blit(font.render("Level 1", True, (255, 255, 255)), (10, 10))
+    screen.blit(font.render("Score: 0", True, (255, 255, 255)), (helper.WIDTH - 150, 10))
+    screen.blit(font.render("AI Mód (M = váltás)", True, (0, 255, 0)), (10, helper.HEIGHT - 40))
+    for i in range(lives):
+        screen.blit(heart_img, (10 + i * 34, 50))
+    return 1 + len(bullets) + len(enemies) + 3 + lives
+
+
+def render_bench(bullet_count: int = 400, enemy_count: int = 200, frames: int = 300,
+                 seed: int = 0) -> Dict[str, Any]:
+    """Egyedi és kötegelt kirajzolás összevetése sok lövedékkel és ellenséggel.
+
+    A jelenet egy headless játék ellenség-formációja (színezett sprite-okkal) és a
+    képernyőn egyenletesen szórt lövedékek. Kijelző-frissítés nincs, csak a réteg-rajzolás
+    ideje számít (a UI feliratokkal és szívekkel együtt); a két kimenetnek pixelre egyeznie kell.
+
+    Visszatérés:
+        Dict[str,Any]: "unbatched" és "batched" kulccsal {"draw_calls","frame_us"},
+            plus "identical" (bool) és "enemies" (int).
+    """
+    from headless import HeadlessGame
+    from main import draw_ui
+    from stress import auto_grid
+
+    game = HeadlessGame(1, seed, recolor=True, grid=auto_grid(enemy_count), enemy_count=enemy_count)
+    enemies = game.enemies
+    rng = np.random.default_rng(seed)
+    bullets = [[int(x), int(y)] for x, y in zip(rng.integers(0, helper.WIDTH, bullet_count),
+                                                rng.integers(0, helper.HEIGHT, bullet_count))]
+    screens = [pygame.Surface((helper.WIDTH, helper.HEIGHT)) for _ in range(2)]
+    heart_img = pygame.Surface((32, 32), pygame.SRCALPHA)
+    pygame.draw.circle(heart_img, (255, 0, 0), (16, 16), 14)
+
+    def _batched(screen: pygame.Surface) -> int:
+        render.begin_frame(screen)
+        render.draw_bullets(screen, bullets)
+        render.draw_enemies(screen, enemies)
+        draw_ui(screen, 1, game.lives, heart_img, 0, True)
+        return render.stats["draw_calls"]
+
+    results: Dict[str, Any] = {"enemies": len(enemies)}
+    runs = (("unbatched", lambda scr: _draw_unbatched(scr, bullets, enemies, heart_img, game.lives)),
+            ("batched", _batched))
+    for (name, draw), screen in zip(runs, screens):
+        calls = draw(screen)  # bemelegítés (sprite-gyorsítótár, RLE kódolás)
+        t0 = time.perf_counter()
+        for _ in range(frames):
+            draw(screen)
+        results[name] = {"draw_calls": calls, "frame_us": (time.perf_counter() - t0) / frames * 1e6}
+    results["identical"] = (pygame.image.tobytes(screens[0], "RGB")
+                            == pygame.image.tobytes(screens[1], "RGB"))
+    return results
+
+
+def timestep_bench(scales: List[int], games: int = 10, policy: str = "rule", seed: int = 0,
+                   sweep: bool = True) -> Dict[int, Dict[str, float]]:
+    """Összevont (durvább) szimulációs lépések: kimenet és CPU-idő az alaplépéshez képest.
+
+    Minden `step_scale`-lel ugyanazok a magok futnak teljes (3 perces vagy game over-ig
+    tartó) headless játékként. `sweep=False` esetén a lövedék és a játékos ütközése csak a
+    lépés végpontján vizsgált (a régi viselkedés) – ez mutatja, mennyi találat "repülne át"
+    a nagy lépéseken.
+
+    Visszatérés:
+        Dict[int,Dict[str,float]]: step_scale -> {"score","score_sd","level","game_seconds",
+            "cpu_ms_per_game_s"}
+    """
+    import collision as col
+    from headless import resolve_policy, run_game
+
+    policy_fn = resolve_policy(policy)
+    original = helper.segment_entry
+    if not sweep:
+        # csak a végpont: a szakasz a lövedék mostani helyére zsugorodik
+        helper.segment_entry = lambda rect, mask, x, y_top, y_bottom: col.segment_entry(rect, mask, x, y_top, y_top)
+    original_check = helper.check_player_collision
+    if not sweep:
+        helper.check_player_collision = lambda rect, enemies, mask=None, start=None: original_check(rect, enemies, mask)
+    results: Dict[int, Dict[str, float]] = {}
+    try:
+        for scale in scales:
+            runs = [run_game(policy_fn, 1, seed + g, step_scale=scale) for g in range(games)]
+            scores = np.array([r["score"] for r in runs], dtype=float)
+            game_s = sum(r["game_seconds"] for r in runs)
+            results[scale] = {"score": float(scores.mean()), "score_sd": float(scores.std()),
+                              "level": float(np.mean([r["level"] for r in runs])),
+                              "game_seconds": game_s / games,
+                              "cpu_ms_per_game_s": sum(r["seconds"] for r in runs) * 1000.0 / game_s}
+    finally:
+        helper.segment_entry = original
+        helper.check_player_collision = original_check
+    return results
+
+
+def trace_bench(steps: int = 1000, games: int = 2, enemy_count: Optional[int] = None,
+                seed: int = 0, rounds: int = 5, out: Optional[str] = None,
+                detail: bool = False) -> Dict[str, Any]:
+    """Az eseménynapló overheadje headless játékokon (kikapcsolva / bekapcsolva).
+
+    Egy "frame" egy szabály-AI döntés, egy szimulációs lépés és a jelenet kirajzolása
+    (a `main.draw_game`-mel azonosan, HUD-dal) egy képernyőn kívüli felületre, kijelző-frissítés
+    és `clock.tick` nélkül. Kikapcsolva nincs becsomagolás; bekapcsolva a `tracing.instrument`
+    csomagolja a fázisokat (`detail` mellett a `DETAIL_PHASES`-t is), és a `main`-hez
+    hasonlóan "sim_step", "draw" és "frame" szakasz is rögzül.
+    A két mód `rounds` körön át váltakozva, azonos magokkal fut; módonként a legjobb kör
+    átlaga számít (a gépzaj csak lassíthat, így a minimum a legstabilabb becslés).
+
+    A ki/be különbség néhány µs egy több száz µs-os frame-en, ezért terhelt gépen zajos.
+    Stabilabb becslés: egy rekord külön mért költsége (`record_us`, szoros ciklusban) szorozva
+    a frame-enkénti rekordszámmal, a kikapcsolt frame-munkához viszonyítva (`estimated_pct`).
+
+    Visszatérés:
+        Dict[str,Any]: "off" és "on" kulccsal {"frames","frame_us"}, plus "records_per_frame",
+            "record_us", "estimated_pct", "overhead_pct" (mért ki/be különbség a frame-munkához
+            képest), "budget_pct" (a `SIM_STEP_MS` frame-kerethez képest) és (ha `out` meg van
+            adva) "exported".
+    """
+    import tracing
+    from headless import HeadlessGame, rule_policy
+    from main import draw_ui
+    from stress import auto_grid
+
+    grid = auto_grid(enemy_count) if enemy_count else None
+    screen = pygame.Surface((helper.WIDTH, helper.HEIGHT))
+    heart_img = pygame.Surface((32, 32), pygame.SRCALPHA)
+    tracer = tracing.Tracer()
+    ids = [tracer.name_id(n) for n in ("sim_step", "draw", "frame")]
+    best: Dict[str, float] = {}
+    frames: Dict[str, int] = {}
+    for name in ("off", "on") * rounds:
+        on = name == "on"
+        restore = tracing.instrument(tracer, [helper], detail=detail) if on else None
+        count, total = 0, 0.0
+        try:
+            for g in range(games):
+                game = HeadlessGame(1, seed + g, grid=grid, enemy_count=enemy_count)
+                player_img = pygame.Surface(game.player_rect.size)  # a headless játék nem tartja meg
+                for _ in range(steps):
+                    t0 = time.perf_counter()
+                    t_frame = tracer.now() if on else 0
+                    over = game.step(rule_policy(game))
+                    if on:
+                        tracer.span(ids[0], t_frame)
+                        t_draw = tracer.now()
+                    render.begin_frame(screen)
+                    render.draw_bullets(screen, game.bullets)
+                    render.draw_enemies(screen, game.enemies)
+                    render.draw_group(screen, game.powerups)
+                    render.blit(screen, player_img, game.player_rect)
+                    draw_ui(screen, game.level, game.lives, heart_img, game.score, True)
+                    if on:
+                        tracer.span(ids[1], t_draw)
+                        tracer.span(ids[2], t_frame, len(game.enemies))
+                    count += 1
+                    total += time.perf_counter() - t0
+                    if over:
+                        break
+        finally:
+            if restore is not None:
+                restore()
+        best[name] = min(best.get(name, math.inf), total / count * 1e6)
+        frames[name] = frames.get(name, 0) + count
+    results: Dict[str, Any] = {name: {"frames": frames[name], "frame_us": best[name]} for name in best}
+    results["records_per_frame"] = tracer.written / frames["on"]
+    results["record_us"] = _trace_record_us(tracing.Tracer(1024))
+    results["estimated_pct"] = results["records_per_frame"] * results["record_us"] / results["off"]["frame_us"] * 100
+    results["overhead_pct"] = (results["on"]["frame_us"] / results["off"]["frame_us"] - 1) * 100
+    results["budget_pct"] = (results["on"]["frame_us"] - results["off"]["frame_us"]) / (helper.SIM_STEP_MS * 10)
+    if out:
+        results["exported"] = tracer.export_chrome(out, {"source": "bench.py trace"})
+    return results
+
+
+def _trace_record_us(tracer: Any, n: int = 50000, repeats: int = 5) -> float:
+    """Egy span rekord (két időbélyeg + írás a gyűrűbe) költsége µs-ban, a legjobb ismétlés szerint."""
+    nid = tracer.name_id("mérés")
+    best = math.inf
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        for _ in range(n):
+            tracer.span(nid, tracer.now())
+        best = min(best, (time.perf_counter() - t0) / n * 1e6)
+    return best
+
+
+def observe_bench(frames: int = 600, factor: int = 4, stack: int = 4, seed: int = 0) -> Dict[str, Any]:
+    """Pixel-megfigyelés sebessége: `PixelObserver` (nézet) vs. teljes másolat.
+
+    Egy szabály-AI headless játék kockáit rajzoljuk ki egy képernyőn kívüli felületre, és
+    mindkét módszer ugyanazt a kockát figyeli meg. Az összevetési alap a szokásos megoldás:
+    `array3d` másolat, szürkítés, mintavétel, majd `deque` + `np.stack` halmozás. Csak a
+    megfigyelés ideje számít (a szimuláció és a kirajzolás nem).
+
+    Visszatérés:
+        Dict[str,Any]: "copy" és "view" kulccsal {"obs_per_s","obs_us"}, plus "shape"
+            (a halmozott tömb alakja), "frames" és "identical" (bool).
+    """
+    from collections import deque
+
+    from headless import HeadlessGame, rule_policy
+    from observation import PixelObserver, copy_observation
+
+    screen = pygame.Surface((helper.WIDTH, helper.HEIGHT))
+    observer = PixelObserver(screen.get_size(), factor, stack)
+    window: "deque[np.ndarray]" = deque(maxlen=stack)
+    blank = np.zeros(observer.shape, dtype=np.uint8)   # kitöltés az első kockáknál, egyszer foglalva
+    game = HeadlessGame(1, seed, recolor=True)
+    player_img = pygame.Surface(game.player_rect.size)  # a headless játék nem tartja meg
+    player_img.fill((0, 200, 255))
+    spent = {"copy": 0.0, "view": 0.0}
+    identical = True
+    count = 0
+    for _ in range(frames):
+        if game.step(rule_policy(game)):
+            game = HeadlessGame(1, seed + count, recolor=True)
+            observer.reset()
+            window.clear()
+        render.begin_frame(screen)
+        render.draw_bullets(screen, game.bullets)
+        render.draw_enemies(screen, game.enemies)
+        render.draw_group(screen, game.powerups)
+        render.blit(screen, player_img, game.player_rect)
+        t0 = time.perf_counter()
+        window.append(copy_observation(screen, factor))
+        copied = np.stack([blank] * (stack - len(window)) + list(window))
+        t1 = time.perf_counter()
+        viewed = observer.observe(screen)
+        t2 = time.perf_counter()
+        spent["copy"] += t1 - t0
+        spent["view"] += t2 - t1
+        identical = identical and np.array_equal(copied, viewed)
+        count += 1
+    results: Dict[str, Any] = {name: {"obs_per_s": count / sec, "obs_us": sec / count * 1e6}
+                               for name, sec in spent.items()}
+    results.update(shape=observer.stacked().shape, frames=count, identical=identical)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Parancssori belépési pont. A visszatérési érték a folyamat kilépési kódja."""
+    parser = argparse.ArgumentParser(description="Space Invaders mérések és ellenőrzések")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("clone", help="GameState klónozás/visszaállítás sebessége és memóriája")
+    p.add_argument("--n", type=int, default=20000)
+    p.add_argument("--warmup-steps", type=int, default=300)
+    p.add_argument("--horizon", type=int, default=30)
+    p.add_argument("--enemies", type=int, default=None)
+    p.add_argument("--seed", type=int, default=0)
+
+    p = sub.add_parser("collisions", help="rect vs. pixelpontos (maszkos) ütközés: pontosság és költség")
+    p.add_argument("--steps", type=int, default=3000, help="lépés játékonként (legfeljebb)")
+    p.add_argument("--games", type=int, default=3)
+    p.add_argument("--enemies", type=int, default=None)
+    p.add_argument("--seed", type=int, default=0)
+
+    p = sub.add_parser("render", help="egyedi vs. kötegelt (blits) kirajzolás: hívásszám és idő")
+    p.add_argument("--bullets", type=int, default=400)
+    p.add_argument("--enemies", type=int, default=200)
+    p.add_argument("--frames", type=int, default=300)
+    p.add_argument("--seed", type=int, default=0)
+
+    p = sub.add_parser("timestep", help="összevont szimulációs lépések: kimenet és CPU/játék-mp")
+    p.add_argument("--scales", default="1,2,4", help="vesszővel elválasztott step_scale értékek")
+    p.add_argument("--games", type=int, default=10)
+    p.add_argument("--policy", default="rule")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--no-sweep", action="store_true", help="csak végpont-ütközés (összevetéshez)")
+
+    p = sub.add_parser("trace", help="eseménynapló overheadje (ki/be) headless játékon")
+    p.add_argument("--steps", type=int, default=1000, help="frame játékonként (legfeljebb)")
+    p.add_argument("--games", type=int, default=2)
+    p.add_argument("--enemies", type=int, default=None)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--rounds", type=int, default=5, help="váltakozó ki/be körök száma")
+    p.add_argument("--detail", action="store_true", help="az olcsó fázisok is (mint main.py --trace-detail)")
+    p.add_argument("--out", default=None, help="a bekapcsolt futás napló-exportja (Chrome trace JSON)")
+
+    p = sub.add_parser("observe", help="pixel-megfigyelés: nézet (surfarray.pixels3d) vs. teljes másolat")
+    p.add_argument("--frames", type=int, default=600)
+    p.add_argument("--factor", type=int, default=4, help="mintavételi lépésköz")
+    p.add_argument("--stack", type=int, default=4, help="halmozott kockák")
+    p.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args(argv)
+    pygame.init()
+
+    if args.cmd == "clone":
+        res = clone_bench(args.n, args.warmup_steps, args.horizon, args.enemies, args.seed)
+        print(f"ellenség: {res['enemies']} | clone: {res['clones_per_s']:,.0f}/s | "
+              f"restore: {res['restores_per_s']:,.0f}/s | "
+              f"ág ({args.horizon} lépés): {res['branches_per_s']:,.0f}/s "
+              f"({res['branch_steps_per_s']:,.0f} lépés/s) | "
+              f"memória: {res['bytes_per_snapshot'] / 1024:.1f} KiB/pillanatkép")
+        return 0
+    if args.cmd == "collisions":
+        res = collision_bench(args.steps, args.games, args.enemies, args.seed)
+        for name in ("rect", "mask"):
+            r = res[name]
+            print(f"{name:>4}: {r['steps']} lépés | lépés {r['step_us']:.1f} µs | "
+                  f"ütközés {r['collide_us']:.2f} µs/lépés | átlagpont {r['score']:.0f}")
+        m = res["mask"]
+        extra_us = m["collide_us"] - res["rect"]["collide_us"]
+        rejected = m["mask_rejects"] / m["rect_hits"] * 100 if m["rect_hits"] else 0.0
+        print(f"maszk: {m['rect_hits']} rect-teszten átment vizsgálatból {m['mask_rejects']} üres sarok "
+              f"({rejected:.1f}%) | "
+              f"gyorsítótár: {m['cache_entries']} változat")
+        print(f"többletköltség: {extra_us:+.2f} µs/lépés = {extra_us / res['rect']['step_us'] * 100:+.2f}% "
+              f"a szimulációs lépésből, {extra_us / (1e6 / 60) * 100:+.3f}% egy 60 FPS frame-ből")
+        return 0
+    if args.cmd == "render":
+        res = render_bench(args.bullets, args.enemies, args.frames, args.seed)
+        for name in ("unbatched", "batched"):
+            r = res[name]
+            print(f"{name:>9}: {r['draw_calls']} rajzolási hívás | {r['frame_us']:.0f} µs/frame")
+        saved = res["unbatched"]["frame_us"] - res["batched"]["frame_us"]
+        print(f"{args.bullets} lövedék, {res['enemies']} ellenség | megtakarítás: {saved:.0f} µs/frame "
+              f"({saved / res['unbatched']['frame_us'] * 100:.0f}%) | "
+              f"kép {'pixelre azonos' if res['identical'] else 'ELTÉR'}")
+        return 0 if res["identical"] else 1
+    if args.cmd == "timestep":
+        scales = [int(v) for v in args.scales.split(",")]
+        res = timestep_bench(scales, args.games, args.policy, args.seed, not args.no_sweep)
+        base = res[scales[0]]
+        for scale, r in res.items():
+            print(f"step_scale {scale}: pont {r['score']:7.1f} ± {r['score_sd']:5.1f} "
+                  f"({r['score'] - base['score']:+6.1f}) | szint {r['level']:.2f} | "
+                  f"{r['game_seconds']:5.1f} játék-mp | {r['cpu_ms_per_game_s']:6.2f} CPU-ms/játék-mp "
+                  f"({base['cpu_ms_per_game_s'] / r['cpu_ms_per_game_s']:.2f}×)")
+        return 0
+    if args.cmd == "trace":
+        res = trace_bench(args.steps, args.games, args.enemies, args.seed, args.rounds, args.out, args.detail)
+        print(f"kikapcsolva: {res['off']['frame_us']:.1f} µs/frame | bekapcsolva: {res['on']['frame_us']:.1f} µs/frame "
+              f"| mért különbség: {res['overhead_pct']:+.2f}% ({res['budget_pct']:+.3f}% a {helper.SIM_HZ} Hz-es "
+              f"frame-kerethez)")
+        print(f"{res['records_per_frame']:.1f} rekord/frame × {res['record_us']:.2f} µs = "
+              f"{res['estimated_pct']:.2f}% a frame-munkához")
+        verdict = "teljesül" if res["estimated_pct"] < TRACE_OVERHEAD_TARGET_PCT else "NEM teljesül"
+        print(f"cél: < {TRACE_OVERHEAD_TARGET_PCT:g}% a frame-munkához -> {verdict}")
+        if args.out:
+            print(f"Mentve: {args.out} ({res['exported']} esemény)")
+        return 0
+    if args.cmd == "observe":
+        res = observe_bench(args.frames, args.factor, args.stack, args.seed)
+        for name in ("copy", "view"):
+            r = res[name]
+            print(f"{name:>4}: {r['obs_per_s']:8,.0f} megfigyelés/s | {r['obs_us']:7.1f} µs/megfigyelés")
+        print(f"{res['frames']} kocka, alak {res['shape']} | gyorsulás: "
+              f"{res['copy']['obs_us'] / res['view']['obs_us']:.1f}× | "
+              f"kimenet {'pixelre azonos' if res['identical'] else 'ELTÉR'} | "
+              f"60 FPS keret {res['view']['obs_us'] / (helper.SIM_STEP_MS * 10):.2f}%-a")
+        return 0 if res["identical"] else 1
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
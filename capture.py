@@ -0,0 +1,186 @@
+"""Képkocka-rögzítés és videóexport háttérszálon.
+
+A játékkör a `draw_game` után átadja a kirajzolt `screen`-t (`FrameRecorder.capture`);
+ez csak egy bájtmásolatot tesz egy korlátos sorba, a kódolás (ffmpeg vagy PNG-sorozat)
+egy háttérszálon fut. Ha a sor tele van, a képkockát eldobjuk (a játék nem lassul),
+és a végén riportoljuk, hány kocka veszett el.
+
+    python main.py --capture run.mp4                 # ffmpeg, ha elérhető
+    python main.py --capture frames/ --capture-every 2  # PNG-sorozat minden 2. frame-ből
+"""
+
+import os
+import queue
+import shutil
+import subprocess
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import pygame
+
+VIDEO_EXTENSIONS = (".mp4", ".mkv", ".webm", ".avi", ".mov")
+DEFAULT_QUEUE_SIZE = 120  # ~2 s 60 FPS-nél; 800×600 RGB ≈ 1.4 MB/kocka
+
+_STOP = object()
+
+
+class FrameRecorder:
+    """Korlátos sorú, háttérszálas képkocka-rögzítő.
+
+    Attribútumok:
+        path (str): Cél: videófájl (ffmpeg) vagy könyvtár (PNG-sorozat).
+        every (int): Minden `every`-edik kirajzolt frame kerül rögzítésre.
+        fps (float): A videó képkockasebessége.
+        offered (int): `capture` hívások száma.
+        queued (int): Sorba tett kockák.
+        written (int): Kiírt kockák.
+        skipped (int): Szándékosan kihagyott kockák (`every` miatt).
+        dropped_full (int): Teli sor miatt eldobott kockák (csak a játékkör szála írja).
+        dropped_encoder (int): A kódoló szálon eldobott kockák (méretváltás, hiba utáni
+            ürítés; csak a kódoló szál írja).
+        dropped (int): A kettő összege (csak olvasható).
+        mode (str): "ffmpeg" vagy "png".
+        error (Optional[str]): A háttérszál hibája, ha volt.
+    """
+
+    def __init__(self, path: str, every: int = 1, fps: float = 60.0,
+                 queue_size: int = DEFAULT_QUEUE_SIZE) -> None:
+        """Inicializálja a rögzítőt és elindítja a kódoló szálat.
+
+        Paraméterek:
+            path (str): Videófájl (`VIDEO_EXTENSIONS`) vagy könyvtár. Videó kiterjesztésnél
+                ffmpeg kell a PATH-on; ha nincs, a kiterjesztés nélküli könyvtárba PNG-sorozat kerül.
+            every (int): Rögzítési gyakoriság frame-ben (1 = mind).
+            fps (float): A videó képkockasebessége.
+            queue_size (int): A sor kapacitása kockában.
+
+        Kivétel dobása:
+            ValueError: Ha `every` vagy `queue_size` nem pozitív.
+        """
+        if every <= 0 or queue_size <= 0:
+            raise ValueError("every és queue_size pozitív kell legyen")
+        self.every = every
+        self.fps = fps
+        self.offered = 0
+        self.queued = 0
+        self.written = 0
+        self.skipped = 0
+        # szálanként külön számláló: a `+=` nem atomi, két szálról írva elveszhetnének értékek
+        self.dropped_full = 0
+        self.dropped_encoder = 0
+        self.error: Optional[str] = None
+        root, ext = os.path.splitext(path)
+        if ext.lower() in VIDEO_EXTENSIONS and shutil.which("ffmpeg"):
+            self.mode = "ffmpeg"
+            self.path = path
+        else:
+            if ext.lower() in VIDEO_EXTENSIONS:
+                print(f"Figyelem: ffmpeg nem található, PNG-sorozat készül ide: {root}/")
+                path = root
+            self.mode = "png"
+            self.path = path
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._size: Optional[Tuple[int, int]] = None
+        self._thread = threading.Thread(target=self._run, name="frame-recorder", daemon=True)
+        self._thread.start()
+
+    def capture(self, surface: pygame.Surface) -> bool:
+        """A kirajzolt felület másolatának sorba tétele (nem blokkol).
+
+        Paraméterek:
+            surface (pygame.Surface): A kirajzolt képernyő.
+
+        Visszatérés:
+            bool: True, ha a kocka sorba került.
+        """
+        self.offered += 1
+        if (self.offered - 1) % self.every:
+            self.skipped += 1
+            return False
+        if self._queue.full():
+            self.dropped_full += 1  # olcsóbb, mint lemásolni és utána eldobni
+            return False
+        size = surface.get_size()
+        try:
+            self._queue.put_nowait((size, pygame.image.tobytes(surface, "RGB")))
+        except queue.Full:
+            self.dropped_full += 1
+            return False
+        self.queued += 1
+        return True
+
+    @property
+    def dropped(self) -> int:
+        """Összes eldobott kocka (teli sor + kódoló oldal)."""
+        return self.dropped_full + self.dropped_encoder
+
+    def _run(self) -> None:
+        proc: Optional[subprocess.Popen] = None
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _STOP:
+                    break
+                size, data = item
+                if self.mode == "ffmpeg":
+                    if proc is None:
+                        proc = self._start_ffmpeg(size)
+                    if size != self._size:
+                        self.dropped_encoder += 1  # ablakméret-váltás: a videóstream nem méretezhető át
+                        continue
+                    assert proc.stdin is not None
+                    proc.stdin.write(data)
+                else:
+                    os.makedirs(self.path, exist_ok=True)
+                    image = pygame.image.frombuffer(data, size, "RGB")
+                    pygame.image.save(image, os.path.join(self.path, f"frame_{self.written:06d}.png"))
+                self.written += 1
+        except (OSError, ValueError, pygame.error) as exc:
+            self.error = str(exc)
+            # a maradékot kiürítjük, hogy a játékkör ne akadjon el a teli soron
+            while True:
+                try:
+                    if self._queue.get_nowait() is _STOP:
+                        break
+                    self.dropped_encoder += 1
+                except queue.Empty:
+                    break
+        finally:
+            if proc is not None:
+                if proc.stdin is not None:
+                    try:
+                        proc.stdin.close()
+                    except OSError:
+                        pass
+                proc.wait()
+
+    def _start_ffmpeg(self, size: Tuple[int, int]) -> subprocess.Popen:
+        self._size = size
+        cmd = ["ffmpeg", "-loglevel", "error", "-y",
+               "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{size[0]}x{size[1]}",
+               "-r", f"{self.fps:g}", "-i", "-",
+               "-pix_fmt", "yuv420p", self.path]
+        return subprocess.Popen(cmd, stdin=subprocess.PIPE)
+
+    def close(self) -> Dict[str, Any]:
+        """Lezárja a sort, megvárja a kódolást, és visszaadja a számlálókat.
+
+        Visszatérés:
+            Dict[str,Any]: {"path","mode","written","skipped","dropped","dropped_full",
+                "dropped_encoder","error"}
+        """
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        return {"path": self.path, "mode": self.mode, "written": self.written,
+                "skipped": self.skipped, "dropped": self.dropped, "dropped_full": self.dropped_full,
+                "dropped_encoder": self.dropped_encoder, "error": self.error}
+
+    def summary(self) -> str:
+        """Egysoros összefoglaló (a `close` után pontos)."""
+        line = (f"felvétel ({self.mode}): {self.written} kocka mentve -> {self.path} | "
+                f"kihagyva (minden {self.every}.): {self.skipped} | eldobva: {self.dropped} "
+                f"(teli sor {self.dropped_full}, kódoló {self.dropped_encoder})")
+        if self.error:
+            line += f" | hiba: {self.error}"
+        return line
@@ -0,0 +1,135 @@
+"""Pixelpontos ütközés gyorsítótárazott maszkokkal, a rect-alapú előszűrés mögött.
+
+Az ellenség- és játékos-sprite-ok átlátszó szegélyű PNG-k, így a puszta rect-teszt az
+üres sarkokban is találatot ad. A pontos teszt `pygame.mask`-kal történik, de:
+    - a maszk csak a sprite alakjától (alfa-csatornájától) és méretétől függ, a színezéstől
+      nem, ezért (sprite, méret) változatonként egyszer készül, és utána újrahasznosul;
+    - maszk-tesztet csak az olcsó rect-tesztet már átment párokon futtatunk.
+
+A lövedék nem pontként, hanem az adott lépésben bejárt függőleges szakaszként ütközik
+(`segment_entry`), így nagyobb (összevont) szimulációs lépésnél sem repül át egy
+ellenségen; a találat a szakasz mentén elsőként elért nem átlátszó pixel.
+
+A `stats` számlálók a rect-találatokat és a maszk által elvetett ("üres sarok") találatokat
+mutatják (`python bench.py collisions`).
+"""
+
+from typing import Dict, Optional, Sequence, Tuple
+
+import pygame
+
+MASK_THRESHOLD = 127      # ennél átlátszóbb pixel nem számít találatnak
+MASK_CACHE_LIMIT = 256    # ennyi változat fölött a legrégebbieket eldobjuk
+
+MaskKey = Tuple[int, Tuple[int, int]]  # (id(forrás sprite), (szélesség, magasság))
+
+# diagnosztika: rect-teszten átment párok és ebből a maszk által elvetettek
+stats: Dict[str, int] = {"rect_hits": 0, "mask_rejects": 0}
+
+
+class MaskCache:
+    """(sprite, méret) → `pygame.mask.Mask` gyorsítótár.
+
+    A forrás Surface-t is megtartjuk, így az `id` nem hasznosulhat újra, amíg a bejegyzés él.
+
+    Attribútumok:
+        hits (int): Gyorsítótárból kiszolgált kérések.
+        misses (int): Újonnan épített maszkok.
+    """
+
+    def __init__(self, threshold: int = MASK_THRESHOLD, limit: int = MASK_CACHE_LIMIT) -> None:
+        self.threshold = threshold
+        self.limit = limit
+        self.hits = 0
+        self.misses = 0
+        self._masks: Dict[MaskKey, Tuple[pygame.Surface, pygame.mask.Mask]] = {}
+
+    def __len__(self) -> int:
+        return len(self._masks)
+
+    def get(self, image: pygame.Surface, size: Optional[Sequence[int]] = None) -> pygame.mask.Mask:
+        """A `image` sprite `size` méretű változatának maszkja.
+
+        Paraméterek:
+            image (pygame.Surface): Forrás sprite (alfa-csatornával).
+            size (Optional[Sequence[int]]): Cél méret; None esetén a sprite saját mérete.
+                Átméretezésnél ugyanúgy `smoothscale` fut, mint a kirajzolt sprite-nál.
+
+        Visszatérés:
+            pygame.mask.Mask: A (megosztott, nem módosítandó) maszk.
+        """
+        size = image.get_size() if size is None else (int(size[0]), int(size[1]))
+        key = (id(image), size)
+        entry = self._masks.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        scaled = image if size == image.get_size() else pygame.transform.smoothscale(image, size)
+        mask = pygame.mask.from_surface(scaled, self.threshold)
+        if len(self._masks) >= self.limit:
+            del self._masks[next(iter(self._masks))]  # a legrégebbi bejegyzés (beszúrási sorrend)
+        self._masks[key] = (image, mask)
+        return mask
+
+    def clear(self) -> None:
+        self._masks.clear()
+
+
+_cache = MaskCache()
+
+
+def mask_for(image: pygame.Surface, size: Optional[Sequence[int]] = None) -> pygame.mask.Mask:
+    """Maszk a modul közös gyorsítótárából (lásd `MaskCache.get`)."""
+    return _cache.get(image, size)
+
+
+def sprites_overlap(rect_a: pygame.Rect, mask_a: Optional[pygame.mask.Mask],
+                    rect_b: pygame.Rect, mask_b: Optional[pygame.mask.Mask]) -> bool:
+    """Két sprite ütközése: rect előszűrés, utána maszk-átfedés.
+
+    Ha bármelyik maszk hiányzik (vagy nem a rect méretéhez készült), a rect-teszt dönt.
+    """
+    if not rect_a.colliderect(rect_b):
+        return False
+    if mask_a is None or mask_b is None or mask_a.get_size() != rect_a.size or mask_b.get_size() != rect_b.size:
+        return True
+    stats["rect_hits"] += 1
+    if mask_a.overlap(mask_b, (rect_b.x - rect_a.x, rect_b.y - rect_a.y)) is not None:
+        return True
+    stats["mask_rejects"] += 1
+    return False
+
+
+def segment_entry(rect: pygame.Rect, mask: Optional[pygame.mask.Mask], x: int,
+                  y_top: int, y_bottom: int) -> Optional[int]:
+    """Függőleges szakasz és sprite ütközése: a felfelé haladó lövedék első találati pontja.
+
+    A szakasz az (x, y_bottom) pontból az (x, y_top) pontba tart (mindkét vég benne van);
+    a lövedék alulról érkezik, így az első találat a legnagyobb y-ú nem átlátszó pixel.
+
+    Paraméterek:
+        rect (pygame.Rect): A sprite helye.
+        mask (Optional[pygame.mask.Mask]): A sprite maszkja; None esetén csak a rect számít.
+        x (int): A szakasz oszlopa.
+        y_top (int): A szakasz felső vége (a lövedék mostani helye).
+        y_bottom (int): A szakasz alsó vége (a lövedék lépés előtti helye).
+
+    Visszatérés:
+        Optional[int]: A találat y koordinátája, vagy None, ha a szakasz nem ér a sprite-hoz.
+    """
+    if not rect.left <= x < rect.right:
+        return None
+    top = max(y_top, rect.top)
+    bottom = min(y_bottom, rect.bottom - 1)
+    if top > bottom:
+        return None
+    if mask is None or mask.get_size() != rect.size:
+        return bottom
+    stats["rect_hits"] += 1
+    col = int(x) - rect.x
+    for y in range(int(bottom), int(top) - 1, -1):
+        if mask.get_at((col, y - rect.y)):
+            return y
+    stats["mask_rejects"] += 1
+    return None
@@ -0,0 +1,266 @@
+"""Tanítóadat-tömörítés: duplikált példák összevonása súlyokká, bináris (.npz) adatkészlet.
+
+A `log_example` minden lenyomott billentyűt külön sorként fűz az `examples.csv`-hez, így
+egy nyomva tartott gomb sok (szinte) azonos (dx, dy, action) sort termel. Ez az eszköz
+    - opcionálisan kvantálja a (dx, dy) jellemzőket (`--quantize` pixel rácsra),
+    - az azonos (dx, dy, action) sorokat egy sorrá vonja össze, darabszámukkal mint súllyal,
+    - az eredményt tömörített NumPy archívumba írja (X, y, weight + metaadatok).
+
+    python compact_examples.py examples.csv -o examples.npz [--quantize 4]
+    python compact_examples.py selfplay_data/ -o selfplay.npz
+    python compact_examples.py examples.csv -o examples.npz --append --truncate-source
+    python train_player_ai.py examples.npz
+
+A `--append` a meglévő kimenethez fűzi az új sorokat (újratömörítve), a `--truncate-source`
+sikeres írás után a CSV-t a fejlécre csonkolja, így az `examples.csv` nem nő korlátlanul.
+A súlyozott adatkészleten a `WeightedKNeighborsClassifier` tanít: a szomszédok szavazata
+a súlyukkal (az összevont sorok számával) arányos.
+"""
+
+import argparse
+import csv
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sklearn.neighbors import KNeighborsClassifier
+
+from helper import EXAMPLE_COLUMNS
+
+FORMAT_VERSION = 1
+
+Dataset = Tuple[np.ndarray, np.ndarray, np.ndarray]  # (X: (n,2) float32, y: (n,) int64, weight: (n,) int64)
+
+
+def example_files(csv_path: str) -> List[Path]:
+    """Feloldja a tanítóadat forrását fájllistára.
+
+    Paraméterek:
+        csv_path (str): Egy CSV fájl, vagy egy könyvtár, amelynek minden `*.csv` fájlja
+            (pl. a `selfplay.py` shardjai) egy-egy adatforrás.
+
+    Visszatérés:
+        List[Path]: A beolvasandó fájlok, rendezve.
+
+    Kivétel dobása:
+        FileNotFoundError: Ha az útvonal nem létezik, vagy a könyvtárban nincs CSV.
+    """
+    path = Path(csv_path)
+    if not path.exists():
+        raise FileNotFoundError(f"A {csv_path} fájl nem létezik.")
+    if path.is_dir():
+        files = sorted(path.glob("*.csv"))
+        if not files:
+            raise FileNotFoundError(f"A {csv_path} könyvtárban nincs CSV fájl.")
+        return files
+    return [path]
+
+
+def load_examples(csv_path: str) -> Tuple[List[List[float]], List[int]]:
+    """Beolvassa a (dx, dy) jellemzőket és az akció címkéket.
+
+    Paraméterek:
+        csv_path (str): CSV fájl vagy shardokat tartalmazó könyvtár (lásd `example_files`).
+
+    Visszatérés:
+        Tuple[List[List[float]], List[int]]: (X, y).
+
+    Kivétel dobása:
+        FileNotFoundError: Ha a forrás nem létezik.
+        ValueError: Ha egy CSV-ből hiányzik a szükséges fejléc.
+    """
+    X: List[List[float]] = []
+    y: List[int] = []
+    for file in example_files(csv_path):
+        with open(file, newline="", encoding="utf-8") as f:
+            r = csv.reader(f)
+            header = next(r, None) or []
+            # Ellenőrizzük a fejlécet
+            if not all(field in header for field in ["dx", "dy", "action"]):
+                raise ValueError(f"A CSV-nek ({file}) tartalmaznia kell a 'dx', 'dy', 'action' oszlopokat.")
+            ix, iy, ia = header.index("dx"), header.index("dy"), header.index("action")
+            for row in r:
+                X.append([float(row[ix]), float(row[iy])])
+                y.append(int(row[ia]))
+    return X, y
+
+
+def compact(X: Any, y: Any, weight: Optional[Any] = None, quantum: float = 0.0) -> Dataset:
+    """Kvantálás és duplikátum-összevonás.
+
+    Paraméterek:
+        X (array-like): (n, 2) jellemzők (dx, dy).
+        y (array-like): (n,) akció címkék.
+        weight (Optional[array-like]): Meglévő súlyok (pl. egy korábban tömörített készletből);
+            None esetén minden sor súlya 1.
+        quantum (float): Rácsméret pixelben; 0 esetén nincs kvantálás (csak pontos duplikátumok).
+
+    Visszatérés:
+        Dataset: (X, y, weight) egyedi (dx, dy, action) sorokkal, rendezve.
+
+    Kivétel dobása:
+        ValueError: Negatív `quantum` vagy eltérő hosszúságú bemenetek esetén.
+    """
+    if quantum < 0:
+        raise ValueError("a kvantálási rács nem lehet negatív")
+    X = np.asarray(X, dtype=np.float64).reshape(-1, 2)
+    y = np.asarray(y, dtype=np.int64).reshape(-1)
+    w = np.ones(len(y), dtype=np.int64) if weight is None else np.asarray(weight, dtype=np.int64)
+    if not len(X) == len(y) == len(w):
+        raise ValueError("X, y és weight hossza eltér")
+    if quantum:
+        X = np.round(X / quantum) * quantum
+    if not len(y):
+        return X.astype(np.float32), y, w
+    keys = np.column_stack([X, y])
+    unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+    merged = np.bincount(inverse.reshape(-1), weights=w, minlength=len(unique)).astype(np.int64)
+    return unique[:, :2].astype(np.float32), unique[:, 2].astype(np.int64), merged
+
+
+def save_dataset(path: str, dataset: Dataset, quantum: float = 0.0,
+                 sources: Optional[List[str]] = None) -> None:
+    """Tömörített adatkészlet mentése `.npz` archívumba.
+
+    Paraméterek:
+        path (str): Célfájl (`.npz`).
+        dataset (Dataset): `compact` eredménye.
+        quantum (float): A használt kvantálási rács (metaadat).
+        sources (Optional[List[str]]): A forrásfájlok (metaadat).
+    """
+    X, y, w = dataset
+    np.savez_compressed(path, X=X, y=y, weight=w, features=np.array(EXAMPLE_COLUMNS[:2]),
+                        quantum=np.float64(quantum), version=np.int64(FORMAT_VERSION),
+                        sources=np.array(sources or [], dtype=str))
+
+
+def load_dataset(path: str) -> Dataset:
+    """Tömörített (`.npz`) adatkészlet betöltése.
+
+    Kivétel dobása:
+        FileNotFoundError: Ha a fájl nem létezik.
+        ValueError: Ha a fájl nem ennek az eszköznek a kimenete.
+    """
+    if not Path(path).exists():
+        raise FileNotFoundError(f"A {path} fájl nem létezik.")
+    with np.load(path, allow_pickle=False) as data:
+        if not {"X", "y", "weight"} <= set(data.files):
+            raise ValueError(f"A {path} nem tömörített tanítóadat (hiányzó X/y/weight).")
+        return data["X"], data["y"], data["weight"]
+
+
+def dataset_info(path: str) -> Dict[str, Any]:
+    """Metaadatok egy `.npz` adatkészletről: sorok, képviselt példák, rács, források."""
+    with np.load(path, allow_pickle=False) as data:
+        return {"rows": int(len(data["y"])), "examples": int(data["weight"].sum()),
+                "quantum": float(data["quantum"]) if "quantum" in data.files else 0.0,
+                "sources": [str(s) for s in data["sources"]] if "sources" in data.files else []}
+
+
+class WeightedKNeighborsClassifier(KNeighborsClassifier):
+    """KNN osztályozó mintasúlyokkal (a sklearn-féle KNN `fit`-je nem fogad súlyt).
+
+    Minden szomszéd a saját súlyával szavaz (`weights="distance"` esetén ez még osztódik
+    a távolsággal). Tömörített adatkészleten így egy n-szer előforduló sor egyetlen
+    pontként, n súllyal számít.
+
+    A k-adik távolságnál fennálló holtversenyt determinisztikusan, a kisebb tanítóindex
+    javára dönti el (az sklearn kupaca a holtversenyben lévők közül esetlegesen választ).
+    Ugyanezt a szabályt követi a `knn_model.NumpyKNN`, így az exportált `.npz` modell
+    jóslatai minden lekérdezésen azonosak.
+    """
+
+    def fit(self, X: Any, y: Any, sample_weight: Optional[Any] = None) -> "WeightedKNeighborsClassifier":
+        super().fit(X, y)
+        y = np.asarray(y)
+        self.sample_weight_ = (np.ones(len(y)) if sample_weight is None
+                               else np.asarray(sample_weight, dtype=np.float64))
+        self._label_index = np.searchsorted(self.classes_, y)
+        return self
+
+    def stable_kneighbors(self, X: Any) -> Tuple[np.ndarray, np.ndarray]:
+        """A k legközelebbi tanítópont, (távolság, index) szerint rendezve.
+
+        Addig kér több szomszédot, amíg a k-adik távolsággal egyező összes pont a
+        jelöltek közé nem kerül; ezekből a kisebb indexűek töltik fel a k helyet.
+        """
+        k, n = self.n_neighbors, self.n_samples_fit_
+        m = min(n, 2 * k + 8)
+        while True:
+            dist, ind = self.kneighbors(X, n_neighbors=m)
+            if m == n or (dist[:, -1] > dist[:, k - 1]).all():
+                break
+            m = min(n, 2 * m)
+        order = np.lexsort((ind, dist))[:, :k]
+        return np.take_along_axis(dist, order, axis=1), np.take_along_axis(ind, order, axis=1)
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        dist, ind = self.stable_kneighbors(X)
+        votes = self.sample_weight_[ind]
+        if self.weights == "distance":
+            # mint az sklearn-nél: ha van nulla távolságú szomszéd, csak a pontos egyezések szavaznak
+            exact = dist == 0
+            with np.errstate(divide="ignore"):
+                inv = 1.0 / dist
+            votes = votes * np.where(exact.any(axis=1, keepdims=True), exact, inv)
+        proba = np.zeros((len(ind), len(self.classes_)))
+        rows = np.repeat(np.arange(len(ind)), ind.shape[1])
+        np.add.at(proba, (rows, self._label_index[ind].reshape(-1)), votes.reshape(-1))
+        proba /= proba.sum(axis=1, keepdims=True)
+        return proba
+
+    def predict(self, X: Any) -> np.ndarray:
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def _truncate_to_header(path: Path) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerow(EXAMPLE_COLUMNS)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Parancssori belépési pont. A visszatérési érték a folyamat kilépési kódja."""
+    parser = argparse.ArgumentParser(description="examples.csv tömörítése súlyozott bináris adatkészletté")
+    parser.add_argument("source", nargs="?", default="examples.csv",
+                        help="CSV fájl vagy shard-könyvtár (alapértelmezett: examples.csv)")
+    parser.add_argument("-o", "--output", default="examples.npz", help="kimeneti .npz fájl")
+    parser.add_argument("--quantize", type=float, default=0.0, metavar="PX",
+                        help="(dx, dy) kvantálása PX pixeles rácsra (0 = csak pontos duplikátumok)")
+    parser.add_argument("--append", action="store_true",
+                        help="a meglévő kimenethez fűzés (a régi és új sorok együtt tömörülnek)")
+    parser.add_argument("--truncate-source", action="store_true",
+                        help="sikeres írás után a forrás CSV-t a fejlécre csonkolja (csak fájl forrásnál)")
+    args = parser.parse_args(argv)
+
+    try:
+        X, y = load_examples(args.source)
+        weight = None
+        sources = [str(f) for f in example_files(args.source)]
+        if args.append and Path(args.output).exists():
+            old_X, old_y, old_w = load_dataset(args.output)
+            sources = dataset_info(args.output)["sources"] + sources
+            X = np.concatenate([old_X, np.asarray(X, dtype=np.float32).reshape(-1, 2)])
+            y = np.concatenate([old_y, np.asarray(y, dtype=np.int64)])
+            weight = np.concatenate([old_w, np.ones(len(y) - len(old_y), dtype=np.int64)])
+        dataset = compact(X, y, weight, args.quantize)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Hiba: {e}")
+        return 1
+
+    examples = int(dataset[2].sum())
+    save_dataset(args.output, dataset, args.quantize, sources)
+    print(f"{examples} példa -> {len(dataset[1])} egyedi sor "
+          f"({examples / max(1, len(dataset[1])):.1f}× tömörítés, rács: {args.quantize:g} px) -> {args.output}")
+    if args.truncate_source:
+        source = Path(args.source)
+        if source.is_file():
+            _truncate_to_header(source)
+            print(f"{source} csonkolva (csak a fejléc maradt)")
+        else:
+            print("Figyelem: --truncate-source csak egyetlen CSV forrásnál működik, kihagyva")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
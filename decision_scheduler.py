@@ -0,0 +1,219 @@
+"""Amortizált AI döntések: az utolsó akció újrahasznosítása, amíg a világ érdemben nem változik.
+
+A célpont két frame között alig mozdul (ellenség ~1.2 px/lépés, játékos 5 px/lépés),
+ezért a döntést nem kell minden lépésben újraszámolni. A `DecisionScheduler` egy
+olcsó (O(1)) kulcsot képez a döntést befolyásoló jellemzőkből, és csak akkor hívja a
+drága döntést, ha a kulcs változik:
+
+    - a célpont megváltozott (kilőtték, új szint, új/eltűnt power-up),
+    - a dx előjele vagy |dx| sávja változott (a célzás tényleges küszöbei:
+      dinamikus align_eps, ALIGN_EPS, FAR_X; csillagnál 5 px és ALIGN_EPS_BASE),
+    - letelt (vagy elindult) a lövési cooldown,
+    - legfeljebb `refresh_steps` lépésenként mindenképp (új legközelebbi célpont kiválasztása).
+
+Önállóan futtatva A/B mérést végez headless játékokon (pontszám-hatás, döntés/s):
+
+    python decision_scheduler.py --games 5 --seed 0
+"""
+
+import argparse
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pygame
+
+from helper import ALIGN_EPS, ALIGN_EPS_BASE, FAR_X, SIM_HZ, Action, game_ticks
+from timing import RateCounter
+
+
+def _band(dx: float, edges: Tuple[float, ...]) -> int:
+    """dx előjeles sávindexe: 0 a legbelső sáv, ±k a k-adik küszöbön túl."""
+    mag = abs(dx)
+    band = 0
+    for edge in edges:
+        if mag > edge:
+            band += 1
+    return band if dx >= 0 else -band
+
+
+class DecisionScheduler:
+    """Újrahasznosítja az utolsó AI akciót, amíg a döntési kulcs nem változik.
+
+    Attribútumok:
+        refresh_steps (int): Ennyi újrahasznosított lépés után kötelező az újraszámolás.
+        computed (int): Ténylegesen kiszámolt döntések száma.
+        reused (int): Újrahasznosított (ki nem számolt) döntések száma.
+        rate (RateCounter): Kiszámolt döntések/másodperc.
+    """
+
+    def __init__(self, refresh_steps: int = 15) -> None:
+        """Inicializálja az ütemezőt.
+
+        Paraméterek:
+            refresh_steps (int): Legfeljebb ennyi lépésig használható újra ugyanaz az akció.
+        """
+        self.refresh_steps = refresh_steps
+        self.computed = 0
+        self.reused = 0
+        self.rate = RateCounter()
+        self._action: Optional[Action] = None
+        self._key: Optional[Tuple[Any, ...]] = None
+        self._since = 0
+        self._target: Optional[Dict[str, Any]] = None
+        self._star: Optional[pygame.sprite.Sprite] = None
+        self._first_enemy: Optional[Dict[str, Any]] = None
+
+    def reset(self) -> None:
+        """Elfelejti az utolsó döntést (pl. módváltás vagy új játék után)."""
+        self._action = None
+        self._key = None
+
+    def _world_key(self, player_rect: pygame.Rect, enemies: List[Dict[str, Any]],
+                   powerups: pygame.sprite.Group, shoot_ready: bool) -> Tuple[Any, ...]:
+        """O(1) kulcs a tárolt célpont(ok) alapján; változása újraszámolást kényszerít."""
+        first = enemies[0] if enemies else None
+        if self._star is not None:
+            dx = self._star.rect.centerx - player_rect.centerx
+            band = _band(dx, (5, ALIGN_EPS_BASE))
+        elif self._target is not None:
+            dx = self._target["rect"].centerx - player_rect.centerx
+            align_eps = max(ALIGN_EPS_BASE, self._target["rect"].width // 3)
+            band = _band(dx, (align_eps, ALIGN_EPS, FAR_X))
+        else:
+            band = 0
+        return (len(enemies), first is self._first_enemy, len(powerups), shoot_ready, band)
+
+    def _select_targets(self, player_rect: pygame.Rect, enemies: List[Dict[str, Any]],
+                        powerups: pygame.sprite.Group) -> None:
+        """A döntéssel azonos módon kiválasztja a figyelt célpontot (csillag vagy legközelebbi ellenség)."""
+        stars = [p for p in powerups if getattr(p, "type", None) == "star"]
+        self._star = min(stars, key=lambda p: abs(p.rect.centerx - player_rect.centerx)) if stars else None
+        self._target = min(
+            enemies,
+            key=lambda e: ((e["rect"].centerx - player_rect.centerx) ** 2 +
+                           (e["rect"].centery - player_rect.centery) ** 2)
+        ) if enemies else None
+        self._first_enemy = enemies[0] if enemies else None
+
+    def decide(self, player_rect: pygame.Rect, enemies: List[Dict[str, Any]],
+               powerups: pygame.sprite.Group, shoot_delay: int, last_shot_time: int,
+               compute: Callable[..., Action], *args: Any) -> Action:
+        """Visszaadja a tárolt akciót, vagy újraszámolja, ha a világ érdemben változott.
+
+        Paraméterek:
+            player_rect (pygame.Rect): Játékos helyzete.
+            enemies (List[Dict]): Ellenségek.
+            powerups (pygame.sprite.Group): Power-upok.
+            shoot_delay (int): Aktuális lövési késleltetés ms-ban.
+            last_shot_time (int): Utolsó lövés ideje (`game_ticks()` szerint).
+            compute (Callable[..., Action]): A tényleges (drága) döntés.
+            *args: A `compute`-nak átadott argumentumok.
+
+        Visszatérés:
+            Action: Az érvényes akció.
+        """
+        shoot_ready = game_ticks() - last_shot_time > shoot_delay
+        if self._action is not None and self._since < self.refresh_steps:
+            if self._world_key(player_rect, enemies, powerups, shoot_ready) == self._key:
+                self._since += 1
+                self.reused += 1
+                return self._action
+
+        self._action = compute(*args)
+        self._select_targets(player_rect, enemies, powerups)
+        self._key = self._world_key(player_rect, enemies, powerups, shoot_ready)
+        self._since = 0
+        self.computed += 1
+        self.rate.tick()
+        return self._action
+
+    def reuse_ratio(self) -> float:
+        """Az újrahasznosított döntések aránya (0..1)."""
+        total = self.computed + self.reused
+        return self.reused / total if total else 0.0
+
+    def summary(self) -> str:
+        """Egysoros összefoglaló."""
+        return (f"döntés-ütemező: {self.computed} számolt, {self.reused} újrahasznosított "
+                f"({self.reuse_ratio() * 100:.0f}%), {self.rate.rate:.0f} döntés/s")
+
+
+def make_scheduled_policy(base_policy: Callable[[Any], Optional[Action]],
+                          refresh_steps: int = 15) -> Callable[[Any], Optional[Action]]:
+    """Headless policy becsomagolása döntés-ütemezővel (játékonként új példány kell).
+
+    Paraméterek:
+        base_policy (Callable): `headless` policy (HeadlessGame -> Action).
+        refresh_steps (int): Lásd `DecisionScheduler`.
+
+    Visszatérés:
+        Callable: Ütemezett policy; a `scheduler` attribútumán érhetők el a számlálók.
+    """
+    scheduler = DecisionScheduler(refresh_steps)
+
+    def policy(game: Any) -> Optional[Action]:
+        return scheduler.decide(game.player_rect, game.enemies, game.powerups,
+                                game.shoot_delay(), game.level_data["last_shot_time"],
+                                lambda: base_policy(game))
+
+    policy.scheduler = scheduler  # type: ignore[attr-defined]
+    return policy
+
+
+def compare(games: int = 5, seed: int = 0, difficulty_index: int = 1,
+            policy_name: str = "hybrid", refresh_steps: int = 15,
+            max_steps: int = 180 * SIM_HZ) -> Dict[str, Any]:
+    """A/B mérés: ugyanazokon a magokon ütemezővel és anélkül futtatott headless játékok.
+
+    Paraméterek:
+        games (int): Játékok száma módonként.
+        seed (int): Első mag.
+        difficulty_index (int): Nehézség.
+        policy_name (str): Alap policy neve (lásd `headless.resolve_policy`).
+        refresh_steps (int): Ütemező frissítési korlátja.
+        max_steps (int): Lépéskorlát játékonként.
+
+    Visszatérés:
+        Dict[str,Any]: {"baseline": {...}, "scheduled": {...}, "score_delta_pct": float}
+    """
+    from headless import resolve_policy, run_timed_games
+
+    base = resolve_policy(policy_name)
+    out: Dict[str, Any] = {}
+    for label in ("baseline", "scheduled"):
+        scheduled = label == "scheduled"
+        res = run_timed_games(lambda: make_scheduled_policy(base, refresh_steps) if scheduled else base,
+                              games, seed, difficulty_index, max_steps)
+        scores = res["scores"]
+        decisions = (sum(p.scheduler.computed for p in res["policies"]) if scheduled else res["steps"])
+        game_seconds = res["game_seconds"]
+        out[label] = {"mean_score": sum(scores) / len(scores), "scores": scores,
+                      "decisions_per_game_second": decisions / game_seconds if game_seconds else 0.0,
+                      "ai_cpu_ms_per_game_second": (res["policy_seconds"] * 1000 / game_seconds
+                                                    if game_seconds else 0.0)}
+    base_score = out["baseline"]["mean_score"]
+    out["score_delta_pct"] = ((out["scheduled"]["mean_score"] - base_score) / base_score * 100
+                              if base_score else 0.0)
+    return out
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Parancssori belépési pont: A/B mérés kiírása."""
+    parser = argparse.ArgumentParser(description="Döntés-ütemező A/B mérése headless játékokon")
+    parser.add_argument("--games", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--difficulty", type=int, default=1, choices=(0, 1, 2))
+    parser.add_argument("--policy", default="hybrid")
+    parser.add_argument("--refresh-steps", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    res = compare(args.games, args.seed, args.difficulty, args.policy, args.refresh_steps)
+    for label in ("baseline", "scheduled"):
+        r = res[label]
+        print(f"{label:>9}: átlag pont {r['mean_score']:.0f} | "
+              f"{r['decisions_per_game_second']:.1f} döntés/játék-mp | "
+              f"AI CPU {r['ai_cpu_ms_per_game_second']:.2f} ms/játék-mp")
+    print(f"Pontszám-hatás: {res['score_delta_pct']:+.1f}%")
+
+
+if __name__ == "__main__":
+    main()
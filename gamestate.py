@@ -0,0 +1,252 @@
+"""Tömör, olcsón másolható játékállapot előretekintő kereséshez.
+
+A játék állapota eddig laza tuple (`initialize_game` eredménye) és modulglobálisok
+(játékóra, `helper.last_move_direction`) voltak. A `GameState` ezeket egy objektumba
+fogja, és frame-enként több száz ág klónozását / visszaállítását teszi lehetővé:
+
+    - ami sosem módosul helyben (sprite-képek, `PowerUp` objektumok, pozíció-tuple-ök),
+      az közös marad (copy-on-write: a játék ezeket mindig lecseréli, nem írja felül);
+    - ami módosul (rect-ek, ellenség-dict-ek, lövedékek, időzítő-kupac, power-up halmaz),
+      az laposan másolódik;
+    - a véletlengenerátor állapotát csak akkor bontjuk ki új Generatorrá, ha az ágat
+      tényleg léptetjük; `restore` pedig a cél saját generátorát állítja át (~3 µs).
+
+Tipikus használat egy tervezőben:
+
+    root = GameState.capture(...)            # az élő játékból
+    scratch = root.clone()
+    for action in candidates:
+        scratch.restore(root)
+        for _ in range(horizon):
+            scratch.step(action)
+        ... scratch.score, scratch.lives ...
+
+A `step` menti és visszaállítja a modulglobálisokat, így az élő játékot nem zavarja.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pygame
+
+import helper
+from helper import Action
+
+
+class PowerUpList(list):
+    """`pygame.sprite.Group` helyett használt power-up tároló a klónokban.
+
+    A `Group.add` visszahivatkozást ír a sprite-ba, így minden klón-csoport addig élne,
+    amíg a (közös) `PowerUp` él. Ez a lista a játéklogika által használt felületet
+    (len, bejárás, `add`, `remove(*sprites)`) adja, hivatkozás-mellékhatás nélkül.
+    """
+
+    def add(self, *sprites: pygame.sprite.Sprite) -> None:
+        for sprite in sprites:
+            if sprite not in self:
+                self.append(sprite)
+
+    def remove(self, *sprites: pygame.sprite.Sprite) -> None:  # type: ignore[override]
+        for sprite in sprites:
+            if sprite in self:
+                list.remove(self, sprite)
+
+    def sprites(self) -> List[pygame.sprite.Sprite]:
+        return list(self)
+
+
+def _copy_enemies(enemies: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Ellenségek másolata: új dict és rect, a kép (Surface) közös."""
+    return [{**e, "rect": e["rect"].copy()} for e in enemies]
+
+
+class GameState:
+    """Egy játékpéldány teljes, léptethető állapota.
+
+    Attribútumok:
+        player_rect, enemies, bullets, all_positions, level_data, powerups,
+        player_powerups, score, lives: mint `main.initialize_game` eredményében
+            (a `powerups` itt `PowerUpList`).
+        time_ms (float): A játékóra értéke ebben az állapotban.
+        move_direction (str): `helper.last_move_direction` értéke (a szabály-alapú AI használja).
+    """
+
+    __slots__ = ("player_rect", "enemies", "bullets", "all_positions", "level_data",
+                 "powerups", "player_powerups", "score", "lives", "time_ms",
+                 "move_direction", "_rng", "_rng_state")
+
+    def __init__(self, player_rect: pygame.Rect, enemies: List[Dict[str, Any]],
+                 bullets: List[List[int]], all_positions: List[Tuple[int, int]],
+                 level_data: Dict[str, Any], powerups: Iterable[pygame.sprite.Sprite],
+                 player_powerups: Dict[str, int], score: int, lives: int,
+                 time_ms: float, move_direction: str = "right") -> None:
+        """Közvetlen konstruktor: a kapott objektumokat NEM másolja (lásd `capture`)."""
+        self.player_rect = player_rect
+        self.enemies = enemies
+        self.bullets = bullets
+        self.all_positions = all_positions
+        self.level_data = level_data
+        self.powerups = powerups if isinstance(powerups, PowerUpList) else PowerUpList(powerups)
+        self.player_powerups = player_powerups
+        self.score = score
+        self.lives = lives
+        self.time_ms = time_ms
+        self.move_direction = move_direction
+        self._rng: Optional[np.random.Generator] = None  # saját (klón) generátor; az átvett marad level_data-ban
+        self._rng_state: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def capture(cls, player_rect: pygame.Rect, enemies: List[Dict[str, Any]],
+                bullets: List[List[int]], all_positions: List[Tuple[int, int]],
+                level_data: Dict[str, Any], powerups: Iterable[pygame.sprite.Sprite],
+                player_powerups: Dict[str, int], score: int, lives: int,
+                time_ms: Optional[float] = None) -> "GameState":
+        """Pillanatkép az élő játék objektumaiból (azokat nem módosítja, nem hivatkozza).
+
+        A pillanatképben a sprite-színezés ki van kapcsolva ("recolor"=False): a klónokat
+        nem rajzoljuk ki, a színezés viszont egy lépés költségének nagy része.
+
+        Paraméterek:
+            player_rect ... lives: Az élő játék állapota (`initialize_game` sorrendjében).
+            time_ms (Optional[float]): Játékidő; None esetén az aktuális játékóra.
+
+        Visszatérés:
+            GameState: Független, léptethető másolat.
+        """
+        if time_ms is None:
+            current = helper.get_game_time()
+            time_ms = float(helper.game_ticks()) if current is None else current
+        live = cls(player_rect, enemies, bullets, all_positions, level_data, list(powerups),
+                   player_powerups, score, lives, time_ms, helper.last_move_direction)
+        snap = live.clone()
+        snap.level_data["recolor"] = False
+        return snap
+
+    def clone(self) -> "GameState":
+        """Független másolat (a generátor állapota csak léptetéskor bomlik ki)."""
+        other = GameState.__new__(GameState)
+        other._rng = None
+        other._rng_state = None
+        other.restore(self)
+        return other
+
+    def restore(self, src: "GameState") -> None:
+        """Ezt az állapotot `src` másolatára állítja; a saját generátort újrahasznosítja.
+
+        Paraméterek:
+            src (GameState): A forrásállapot (nem módosul).
+        """
+        self.player_rect = src.player_rect.copy()
+        self.enemies = _copy_enemies(src.enemies)
+        self.bullets = [b[:] for b in src.bullets]
+        self.all_positions = src.all_positions[:]
+        level_data = dict(src.level_data)
+        timers = level_data.get("timers")
+        if timers is not None:
+            level_data["timers"] = timers.copy()
+        self._rng_state = src._current_rng_state()
+        if self._rng_state is not None:
+            level_data["rng"] = None  # `_ensure_rng` tölti ki léptetés előtt
+        self.level_data = level_data
+        self.powerups = PowerUpList(src.powerups)
+        self.player_powerups = dict(src.player_powerups)
+        self.score = src.score
+        self.lives = src.lives
+        self.time_ms = src.time_ms
+        self.move_direction = src.move_direction
+
+    def _current_rng_state(self) -> Optional[Dict[str, Any]]:
+        if self._rng_state is not None:
+            return self._rng_state
+        rng = self.level_data.get("rng")
+        return rng.bit_generator.state if rng is not None else None
+
+    def _ensure_rng(self) -> None:
+        """A halasztott generátor-állapot kibontása (a saját Generator újrahasznosításával)."""
+        if self._rng_state is None:
+            return
+        if self._rng is None:
+            self._rng = np.random.Generator(np.random.PCG64(0))
+        self._rng.bit_generator.state = self._rng_state
+        self.level_data["rng"] = self._rng
+        self._rng_state = None
+
+    @property
+    def game_over(self) -> bool:
+        """True, ha elfogytak az életek."""
+        return self.lives <= 0
+
+    def step(self, action: Optional[Action]) -> bool:
+        """Egy szimulációs lépés (ugyanazok a szabályok, mint `headless.HeadlessGame.step`).
+
+        A modulglobálisokat (játékóra, `last_move_direction`) a lépés idejére erre az
+        állapotra állítja, utána visszaállítja, így élő játék közben is hívható.
+
+        Paraméterek:
+            action (Optional[Action]): AI akció; None esetén `helper.decide_action` dönt.
+
+        Visszatérés:
+            bool: True, ha a lépés után vége a játéknak.
+        """
+        if self.lives <= 0:
+            return True
+        self._ensure_rng()
+        saved_time = helper.get_game_time()
+        saved_direction = helper.last_move_direction
+        helper.set_game_time(self.time_ms)
+        helper.last_move_direction = self.move_direction
+        try:
+            prev_lives = self.lives
+            self.lives, game_over, self.score = helper.update_game_state(
+                None, self.player_rect, self.bullets, self.enemies, self.all_positions,
+                self.level_data, self.lives, self.score, self.powerups, self.player_powerups,
+                ai_mode=True, external_ai_action=action
+            )
+            if (not game_over and self.lives == prev_lives
+                    and helper.enemy_breached_player_row(self.player_rect, self.enemies)):
+                self.lives -= 1
+                if self.lives > 0:
+                    helper.reset_level(self.player_rect, self.bullets, self.enemies,
+                                       self.all_positions, self.level_data, same_level=True)
+        finally:
+            self.move_direction = helper.last_move_direction
+            helper.last_move_direction = saved_direction
+            helper.set_game_time(saved_time)
+        self.time_ms += helper.sim_step_ms(self.level_data)
+        return self.lives <= 0
+
+    def apply_to(self, player_rect: pygame.Rect, enemies: List[Dict[str, Any]],
+                 bullets: List[List[int]], all_positions: List[Tuple[int, int]],
+                 level_data: Dict[str, Any], powerups: pygame.sprite.Group,
+                 player_powerups: Dict[str, int]) -> Tuple[int, int]:
+        """Visszaállítás az élő játék objektumaiba (helyben), pl. visszajátszáshoz.
+
+        A játékórát és a `last_move_direction`-t is erre az állapotra állítja; az élő
+        játék "recolor" és "recolor_frozen" beállítása megmarad.
+
+        Visszatérés:
+            Tuple[int,int]: (score, lives) – ezek értékként élnek a játékkörben.
+        """
+        snap = self.clone()
+        snap._ensure_rng()
+        player_rect.update(snap.player_rect)
+        enemies[:] = snap.enemies
+        bullets[:] = snap.bullets
+        all_positions[:] = snap.all_positions
+        live_rng = level_data.get("rng")
+        recolor = level_data.get("recolor", True)
+        frozen = level_data.get("recolor_frozen", False)
+        level_data.clear()
+        level_data.update(snap.level_data)
+        level_data["recolor"] = recolor
+        level_data["recolor_frozen"] = frozen
+        if live_rng is not None and snap._rng is not None:
+            live_rng.bit_generator.state = snap._rng.bit_generator.state
+            level_data["rng"] = live_rng
+        powerups.empty()
+        powerups.add(*snap.powerups)
+        player_powerups.clear()
+        player_powerups.update(snap.player_powerups)
+        helper.set_game_time(snap.time_ms)
+        helper.last_move_direction = snap.move_direction
+        return snap.score, snap.lives
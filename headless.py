@@ -0,0 +1,281 @@
+"""Kirajzolás nélküli (headless) játékfuttatás AI-policykkel.
+
+A `HeadlessGame` ugyanazokkal a szabályokkal lép, mint a `main.game_loop` AI-ága
+(`update_game_state` + sorátlépés-ellenőrzés), de ablak, eseménykezelés és
+sprite-színezés nélkül, saját szimulációs órával. Önállóan is futtatható:
+
+    python headless.py --policy hybrid --games 4 --seed 1
+"""
+
+import argparse
+import importlib
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+import helper
+from gamestate import GameState
+from helper import Action
+
+HEADLESS_START_MS = 5000.0  # a szimulációs óra kezdőértéke (mintha a menüben töltöttünk volna időt)
+MAX_GAME_STEPS = 180 * helper.SIM_HZ  # alapértelmezett felső korlát: 3 perc játékidő
+
+Policy = Callable[["HeadlessGame"], Optional[Action]]
+
+
+def init_headless() -> None:
+    """Inicializálja a pygame-et láthatatlan (dummy) kijelzővel, hogy a sprite-ok betölthetők legyenek.
+
+    Többször is hívható; a második hívástól nem csinál semmit.
+    """
+    if pygame.display.get_init() and pygame.display.get_surface() is not None:
+        return
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+
+
+class HeadlessGame:
+    """Egy játékpéldány állapota és léptetése kirajzolás nélkül.
+
+    Attribútumok:
+        player_rect, enemies, bullets, all_positions, level_data, powerups,
+        player_powerups, score, lives: ugyanaz, mint `main.initialize_game` eredménye.
+        steps (int): Eddig lefutott szimulációs lépések száma (összevont lépésnél a hívások száma).
+        game_over (bool): True, ha elfogytak az életek.
+        time_ms (float): A példány saját játékideje ms-ban.
+    """
+
+    def __init__(self, difficulty_index: int = 1, seed: Optional[int] = None,
+                 recolor: bool = False, grid: Optional[Tuple[int, int]] = None,
+                 enemy_count: Optional[int] = None, step_scale: int = 1) -> None:
+        """Új játékot indít a megadott nehézséggel és maggal.
+
+        Paraméterek:
+            difficulty_index (int): 0=Könnyű, 1=Normál, 2=Nehéz.
+            seed (Optional[int]): A játékpéldány véletlengenerátorának magja.
+            recolor (bool): Ha True, a sprite-ok színezése is fut (pl. kirajzolt visszajátszáshoz).
+            grid (Optional[Tuple[int,int]]): Formációs rács (sorok, oszlopok); lásd `initialize_game`.
+            enemy_count (Optional[int]): Kezdő ellenségszám a nehézség szerinti helyett.
+            step_scale (int): Ennyi alaplépést szimulál egy `step` (durvább időlépés, kevesebb
+                CPU játék-másodpercenként). A lövedék és a játékos ütközése a bejárt úton
+                vizsgált, az ellenségek viszont csak a lépés végi helyzetükben (közelítés,
+                lásd `helper.check_player_collision`).
+
+        Kivétel dobása:
+            ValueError: Ha `step_scale` < 1.
+
+            pygame.error / FileNotFoundError: Sprite-ok betöltésekor.
+        """
+        from main import initialize_game  # késleltetett import: a main modul betölti a modellt
+
+        if step_scale < 1:
+            raise ValueError("a step_scale legalább 1 kell legyen")
+        init_headless()
+        self.difficulty_index = difficulty_index
+        self.seed = seed
+        self.time_ms = HEADLESS_START_MS
+        helper.set_game_time(self.time_ms)
+        (_player_img, self.player_rect, self.enemies, self.bullets, self.all_positions,
+         self.level_data, _heart_img, self.powerups, self.player_powerups,
+         self.score, self.lives) = initialize_game(difficulty_index, seed, recolor=recolor,
+                                                   grid=grid, enemy_count_override=enemy_count)
+        self.level_data["step_scale"] = step_scale
+        self.steps = 0
+        self.game_over = False
+
+    @property
+    def level(self) -> int:
+        """Aktuális szint."""
+        return self.level_data["level"]
+
+    def step(self, action: Optional[Action]) -> bool:
+        """Egy szimulációs lépés (összevont lépésnél `step_scale` alaplépés) a megadott AI akcióval.
+
+        Paraméterek:
+            action (Optional[Action]): {"move": ..., "shoot": ...}; None esetén a
+                `helper.decide_action` dönt (mint `update_game_state`-ben).
+
+        Visszatérés:
+            bool: True, ha a lépés után vége a játéknak.
+        """
+        if self.game_over:
+            return True
+        helper.set_game_time(self.time_ms)
+        prev_lives = self.lives
+        self.lives, game_over, self.score = helper.update_game_state(
+            None, self.player_rect, self.bullets, self.enemies, self.all_positions,
+            self.level_data, self.lives, self.score, self.powerups, self.player_powerups,
+            ai_mode=True, external_ai_action=action
+        )
+        # ugyanaz a külön sorátlépés-szabály, mint a main.game_loop AI-ágában
+        if (not game_over and self.lives == prev_lives
+                and helper.enemy_breached_player_row(self.player_rect, self.enemies)):
+            self.lives -= 1
+            if self.lives > 0:
+                helper.reset_level(self.player_rect, self.bullets, self.enemies,
+                                   self.all_positions, self.level_data, same_level=True)
+        self.time_ms += helper.sim_step_ms(self.level_data)
+        self.steps += 1
+        self.game_over = self.lives <= 0
+        return self.game_over
+
+    def snapshot(self) -> GameState:
+        """Független, léptethető másolat az aktuális állapotról (lásd `gamestate`)."""
+        return GameState.capture(self.player_rect, self.enemies, self.bullets, self.all_positions,
+                                 self.level_data, self.powerups, self.player_powerups,
+                                 self.score, self.lives, self.time_ms)
+
+    def restore(self, state: GameState) -> None:
+        """Visszaállítja a játékot egy korábbi `snapshot` állapotára (a lépésszámláló marad)."""
+        self.score, self.lives = state.apply_to(self.player_rect, self.enemies, self.bullets,
+                                                self.all_positions, self.level_data,
+                                                self.powerups, self.player_powerups)
+        self.time_ms = state.time_ms
+        self.game_over = self.lives <= 0
+
+    def shoot_delay(self) -> int:
+        """Az aktuális lövési késleltetés (a játékóra szerint)."""
+        helper.set_game_time(self.time_ms)
+        return helper.update_shoot_delay(self.player_powerups)
+
+
+# --- Beépített policyk ---
+
+def rule_policy(game: HeadlessGame) -> Optional[Action]:
+    """Tisztán szabály-alapú döntés (`helper.decide_action`)."""
+    return helper.decide_action(game.player_rect, game.enemies, game.powerups)
+
+
+def hybrid_policy(game: HeadlessGame) -> Optional[Action]:
+    """A játék AI-ága: `decide_action_ml`, fallbackként `decide_action`."""
+    from main import decide_action_ml
+
+    action = decide_action_ml(game.player_rect, game.enemies, game.powerups,
+                              game.shoot_delay(), game.level_data["last_shot_time"])
+    if action is None:
+        action = rule_policy(game)
+    return action
+
+
+POLICIES: Dict[str, Policy] = {
+    "rule": rule_policy,
+    "hybrid": hybrid_policy,
+}
+
+
+def resolve_policy(name: str) -> Policy:
+    """Policy feloldása név vagy "modul:függvény" útvonal alapján.
+
+    Paraméterek:
+        name (str): Beépített név (`POLICIES` kulcsa) vagy "modul:függvény".
+
+    Visszatérés:
+        Policy: Hívható, amely `HeadlessGame`-ből akciót ad.
+
+    Kivétel dobása:
+        ValueError: Ismeretlen név esetén.
+    """
+    if name in POLICIES:
+        return POLICIES[name]
+    if ":" in name:
+        module_name, func_name = name.split(":", 1)
+        return getattr(importlib.import_module(module_name), func_name)
+    raise ValueError(f"Ismeretlen policy: {name} (ismert: {', '.join(POLICIES)})")
+
+
+def run_game(policy: Policy, difficulty_index: int = 1, seed: Optional[int] = None,
+             max_steps: int = MAX_GAME_STEPS,
+             on_step: Optional[Callable[[HeadlessGame, Optional[Action]], None]] = None,
+             step_scale: int = 1) -> Dict[str, Any]:
+    """Lefuttat egy headless játékot a végéig (vagy `max_steps` lépésig).
+
+    Paraméterek:
+        policy (Policy): Döntéshozó függvény.
+        difficulty_index (int): Nehézség (0..2).
+        seed (Optional[int]): Mag.
+        max_steps (int): Lépéskorlát alaplépésben (azonos játékidő bármely `step_scale` mellett).
+        on_step (Optional[Callable]): Minden lépés ELŐTT hívódik a játékkal és a választott akcióval.
+        step_scale (int): Összevont alaplépések száma lépésenként (lásd `HeadlessGame`).
+
+    Visszatérés:
+        Dict[str,Any]: {"score","level","lives","steps","game_over","seconds","game_seconds"}.
+    """
+    game = HeadlessGame(difficulty_index, seed, step_scale=step_scale)
+    t0 = time.perf_counter()
+    while game.steps * step_scale < max_steps and not game.game_over:
+        action = policy(game)
+        if on_step is not None:
+            on_step(game, action)
+        game.step(action)
+    return {"score": game.score, "level": game.level, "lives": max(game.lives, 0),
+            "steps": game.steps, "game_over": game.game_over,
+            "seconds": time.perf_counter() - t0,
+            "game_seconds": game.steps * step_scale * helper.SIM_STEP_MS / 1000.0}
+
+
+def run_timed_games(make_policy: Callable[[], Policy], games: int, seed: int = 0,
+                    difficulty_index: int = 1, max_steps: int = MAX_GAME_STEPS) -> Dict[str, Any]:
+    """A/B mérések közös magja: `games` játék a `seed`, `seed + 1`, ... magokon, a policy
+    hívásainak (AI döntés) CPU-idejével.
+
+    Paraméterek:
+        make_policy (Callable[[],Policy]): Játékonként új policy-t ad (állapotos policykhez).
+        games (int): Játékok száma.
+        seed (int): Első mag.
+        difficulty_index (int): Nehézség.
+        max_steps (int): Lépéskorlát játékonként.
+
+    Visszatérés:
+        Dict[str,Any]: {"scores","policies" (a játékonkénti policyk, számlálóik miatt),
+            "steps","game_seconds","policy_seconds"}.
+    """
+    out: Dict[str, Any] = {"scores": [], "policies": [], "steps": 0, "game_seconds": 0.0,
+                           "policy_seconds": 0.0}
+    for i in range(games):
+        policy = make_policy()
+        spent = 0.0
+
+        def timed_policy(game: HeadlessGame) -> Optional[Action]:
+            nonlocal spent
+            t0 = time.perf_counter()
+            action = policy(game)
+            spent += time.perf_counter() - t0
+            return action
+
+        res = run_game(timed_policy, difficulty_index, seed + i, max_steps)
+        out["scores"].append(res["score"])
+        out["policies"].append(policy)
+        out["steps"] += res["steps"]
+        out["game_seconds"] += res["game_seconds"]
+        out["policy_seconds"] += spent
+    return out
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Parancssori belépési pont: néhány headless játék futtatása és összegzése."""
+    parser = argparse.ArgumentParser(description="Headless Space Invaders játékok futtatása")
+    parser.add_argument("--policy", default="hybrid", help="rule | hybrid | modul:függvény")
+    parser.add_argument("--games", type=int, default=3)
+    parser.add_argument("--difficulty", type=int, default=1, choices=(0, 1, 2))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-steps", type=int, default=MAX_GAME_STEPS)
+    parser.add_argument("--step-scale", type=int, default=1,
+                        help="ennyi alaplépés egy szimulációs lépésben (durvább, olcsóbb kiértékelés; "
+                             "az ellenségek mozgása nincs végigsöpörve, csak a lépés végi helyzetük számít)")
+    args = parser.parse_args(argv)
+
+    policy = resolve_policy(args.policy)
+    for i in range(args.games):
+        res = run_game(policy, args.difficulty, args.seed + i, args.max_steps, step_scale=args.step_scale)
+        print(f"seed={args.seed + i} | score={res['score']} | level={res['level']} | "
+              f"steps={res['steps']} | {res['steps'] / res['seconds']:.0f} lépés/s | "
+              f"{res['game_seconds'] / res['seconds']:.0f} játék-mp/CPU-mp")
+
+
+if __name__ == "__main__":
+    main()
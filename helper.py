@@ -1,9 +1,13 @@
 import pygame
-import random
 import csv
+import math
+import numpy as np
 from pathlib import Path
 from typing import Tuple, List, Dict, Optional, Any, TypedDict
 
+from collision import mask_for, segment_entry, sprites_overlap
+from timers import TimerHeap
+
 # --- Globális beállítások ---
 WIDTH, HEIGHT = 800, 600
 PLAYER_SPEED = 5
@@ -16,9 +20,37 @@ ENEMY_OFFSET_Y = 30
 COMBO_RADIUS = 50
 BASE_SHOOT_DELAY = 1000
 POWERUP_SHOOT_DELAY = 300
+POWERUP_FIELD_LIFETIME_MS = 4000  # ennyi ideig marad a pályán egy fel nem vett power-up
+# felvett power-upok hatásideje (ms) és lövési késleltetése típusonként
+POWERUP_DURATIONS: Dict[str, int] = {"star": 4000}
+POWERUP_SHOOT_DELAYS: Dict[str, int] = {"star": POWERUP_SHOOT_DELAY}
 BULLET_RADIUS = 5
 AIM_EXTRA = 3
 
+# Ellenség-mozgás (lépésenként)
+ENEMY_SPEED_X = 1.2
+ENEMY_SPEED_Y = 0.5
+ENEMY_JUMP_DISTANCE = 60
+ENEMY_CLOSE_DISTANCE = 70
+ENEMY_JUMP_CHANCE_FAR = 0.010
+ENEMY_JUMP_CHANCE_CLOSE = 0.15
+ENEMY_FOLLOW_THRESHOLD = 200
+
+# --- Hibrid célzási küszöbök ---
+ALIGN_EPS = 15      # ennyin belül „pont középen vagyunk” -> lőhetünk
+FAR_X = 120         # ezen túl csak vízszint mozgás, nem lövünk
+ALIGN_EPS_BASE = 12  # minimális „találati folyosó” fél-szélesség px-ben
+
+# Tanítóadat (examples.csv) oszlopai
+EXAMPLE_COLUMNS = ["dx", "dy", "action", "speed_multiplier", "enemy_count"]
+
+SIM_HZ = 60          # logikai szimulációs ütem (lépés/mp); a sebességek lépésenként értendők
+SIM_STEP_MS = 1000.0 / SIM_HZ
+# Összevont lépés (level_data["step_scale"] = k): egy hívás k alaplépésnyi időt szimulál – a
+# sebességek k-szorosak, a lépésenkénti esélyek 1-(1-p)^k-ra nőnek, a lövedék és a játékos
+# ütközése pedig a bejárt úton (nem csak a végponton) vizsgált. Headless kiértékeléshez.
+POWERUP_SPAWN_CHANCE = 0.001  # lépésenként, ha nincs power-up a pályán
+
 # Debug
 DEBUG = False
 LOG_EVERY_MS = 400
@@ -27,6 +59,13 @@ _last_action: Optional[Dict[str, Any]] = None
 
 # Állapot
 last_move_direction = "right"  # alap vízszintes irány
+_game_time_ms: Optional[float] = None  # szimulációs óra; None -> valós idő (get_ticks)
+_default_rng = np.random.default_rng()  # ha a hívó nem ad játékpéldányhoz kötött generátort
+
+# Sprite-gyorsítótárak (a képek megosztottak, senki nem módosítja őket)
+TINT_CACHE_LIMIT = 512  # (sprite, méret, szín) változatok felső korlátja
+_powerup_images: Dict[str, pygame.Surface] = {}  # képfájl -> betöltött, 32×32-es sprite
+_tinted: Dict[Tuple[int, Tuple[int, int], Tuple[int, int, int]], Tuple[pygame.Surface, pygame.Surface]] = {}
 
 
 class Action(TypedDict):
@@ -35,19 +74,80 @@ class Action(TypedDict):
     shoot: bool
 
 
+# --- Játékóra ---
+
+def game_ticks() -> int:
+    """Visszaadja az aktuális játékidőt ms-ban.
+
+    Ha a fix lépésközű ciklus (vagy egy headless futtatás) szimulációs órát állított be,
+    annak értékét adja; különben `pygame.time.get_ticks()`-et. Minden játéklogikai
+    időzítés (lövési késleltetés, power-up lejárat) ezt használja, így a játék ideje
+    a szimulációs lépésekkel halad, nem a falióra szerint.
+
+    Visszatérés:
+        int: Játékidő ezredmásodpercben.
+    """
+    if _game_time_ms is None:
+        return pygame.time.get_ticks()
+    return int(_game_time_ms)
+
+
+def get_game_time() -> Optional[float]:
+    """A szimulációs óra nyers (nem kerekített) értéke, vagy None, ha a valós idő az érvényes.
+
+    Mentéshez/visszaállításhoz (pl. előretekintő szimuláció), `set_game_time` párja.
+    """
+    return _game_time_ms
+
+
+def set_game_time(ms: Optional[float]) -> None:
+    """Beállítja (vagy None-nal kikapcsolja) a szimulációs órát.
+
+    Paraméterek:
+        ms (Optional[float]): Új játékidő ms-ban, vagy None a valós időre való visszaálláshoz.
+
+    Visszatérés:
+        None
+    """
+    global _game_time_ms
+    _game_time_ms = None if ms is None else float(ms)
+
+
+def sim_step_ms(level_data: Dict[str, Any]) -> float:
+    """Egy `update_game_state` hívás által szimulált idő ms-ban (a "step_scale" szerint)."""
+    return SIM_STEP_MS * level_data.get("step_scale", 1)
+
+
+def _scaled_chance(p: float, scale: int) -> float:
+    """Lépésenkénti `p` esély `scale` összevont lépésre: legalább egyszer bekövetkezik."""
+    return p if scale == 1 else 1.0 - (1.0 - p) ** scale
+
+
+def advance_game_time(ms: float = SIM_STEP_MS) -> None:
+    """Előrelépteti a szimulációs órát `ms` ezredmásodperccel (alapértelmezett: egy lépés).
+
+    Kivétel dobása:
+        RuntimeError: Ha nincs beállított szimulációs óra (`set_game_time`).
+    """
+    global _game_time_ms
+    if _game_time_ms is None:
+        raise RuntimeError("Nincs beállított szimulációs óra (set_game_time)")
+    _game_time_ms += ms
+
+
 # --- Segédosztályok és segédfüggvények ---
 
 class PowerUp(pygame.sprite.Sprite):
     """Egy játékbeli power-up objektum.
 
-    A példány a létrejöttekor betölti és 32×32-re méretezi a képet, majd
-    középre igazítva (`center=position`) állítja be az ütköződobozt.
+    A képet fájlonként egyszer tölti be és méretezi 32×32-re (a példányok osztoznak
+    rajta), majd középre igazítva (`center=position`) állítja be az ütköződobozt.
 
     Attribútumok:
         image (pygame.Surface): A méretezett, átlátszóságot támogató sprite-kép.
         rect (pygame.Rect): Az ütköződoboz, közepe a `position` koordinátán.
         type (str): A power-up típusa, pl. "rapid_fire", "shield", "double_points".
-        spawn_time (int): Létrejövetel időbélyege `pygame.time.get_ticks()`-ből.
+        spawn_time (int): Létrejövetel időbélyege `game_ticks()`-ből.
         duration (int): Aktív idő ms-ban. Ennyi ideig számít érvényesnek.
 
     Megjegyzés:
@@ -73,11 +173,14 @@ class PowerUp(pygame.sprite.Sprite):
             ValueError: Ha `duration_ms` < 0 vagy a `position` nem 2 elemű egészpár.
         """
         super().__init__()
-        self.image = pygame.image.load(image_path).convert_alpha()
-        self.image = pygame.transform.smoothscale(self.image, (32, 32))
+        image = _powerup_images.get(image_path)
+        if image is None:
+            image = pygame.transform.smoothscale(pygame.image.load(image_path).convert_alpha(), (32, 32))
+            _powerup_images[image_path] = image
+        self.image = image
         self.rect = self.image.get_rect(center=position)
         self.type = type
-        self.spawn_time = pygame.time.get_ticks()
+        self.spawn_time = game_ticks()
         self.duration = duration_ms
 
     def is_active(self) -> bool:
@@ -93,9 +196,9 @@ class PowerUp(pygame.sprite.Sprite):
             bool: True, ha a power-up még aktív. Különben False.
 
         Megjegyzés:
-            Az időzítés a kliens gép `pygame.time.get_ticks()` értékétől függ.
+            Az időzítés a játékórától (`game_ticks()`) függ.
         """
-        return pygame.time.get_ticks() - self.spawn_time < self.duration
+        return game_ticks() - self.spawn_time < self.duration
 
 
 def tint_image(image: pygame.Surface, tint_color: Tuple[int, int, int]) -> pygame.Surface:
@@ -109,7 +212,7 @@ def tint_image(image: pygame.Surface, tint_color: Tuple[int, int, int]) -> pygam
         pygame.Surface: Új, megszínezett felület.
 
     Teljesítmény:
-        O(w*h) pixelen iterál. Nagy sprite-oknál drága. Gyártás előtt érdemes cache-elni.
+        O(w*h) pixelen iterál. Nagy sprite-oknál drága. Ismétlődő változatokhoz lásd `tinted_sprite`.
 
     Kivétel dobása:
         ValueError: Ha `tint_color` bármely komponense 0..255 tartományon kívül esik.
@@ -125,19 +228,53 @@ def tint_image(image: pygame.Surface, tint_color: Tuple[int, int, int]) -> pygam
     return tinted_image
 
 
-def generate_enemy_positions() -> List[Tuple[int, int]]:
+def tinted_sprite(image: pygame.Surface, size: Tuple[int, int],
+                  tint_color: Tuple[int, int, int]) -> pygame.Surface:
+    """A `image` `size` méretű, `tint_color` színű változata gyorsítótárból.
+
+    Ugyanaz a kép, mint `tint_image(smoothscale(image, size), tint_color)`, de változatonként
+    egyszer készül; a távolság szerinti színezés így nem gyárt frame-enként új Surface-eket.
+    A forrás-Surface-t is megtartjuk, így az `id` nem hasznosulhat újra, amíg a bejegyzés él.
+    """
+    key = (id(image), (int(size[0]), int(size[1])), tint_color)
+    entry = _tinted.get(key)
+    if entry is None:
+        if len(_tinted) >= TINT_CACHE_LIMIT:
+            del _tinted[next(iter(_tinted))]  # a legrégebbi bejegyzés (beszúrási sorrend)
+        entry = _tinted[key] = (image, tint_image(pygame.transform.smoothscale(image, key[1]), tint_color))
+    return entry[1]
+
+
+def generate_enemy_positions(rows: int = ROWS, cols: int = COLS) -> List[Tuple[int, int]]:
     """Legenerálja az ellenségek kezdőpozícióit rács alapján.
 
     Paraméterek:
-        Nincs. A pozíciók a globális ROWS, COLS, OFFSET és PADDING értékekből számolódnak.
+        rows (int): Sorok száma (alapértelmezett: ROWS).
+        cols (int): Oszlopok száma (alapértelmezett: COLS).
 
     Visszatérés:
         List[Tuple[int,int]]: Bal-felső sarok koordináták listája pixelben.
+
+    Megjegyzés:
+        A rács az OFFSET és PADDING értékekkel készül; ha így nem férne el (nagy,
+        stressz-teszt rácsok), a lépésköz összenyomódik, hogy a formáció a képernyő
+        felső felében maradjon. Az alap 4×5-ös rács változatlan.
+
+    Kivétel dobása:
+        ValueError: Ha `rows` vagy `cols` nem pozitív.
     """
+    if rows <= 0 or cols <= 0:
+        raise ValueError("rows és cols pozitív kell legyen")
+    step_x: float = 20 + ENEMY_PADDING_X
+    step_y: float = 20 + ENEMY_PADDING_Y
+    if cols > 1:
+        step_x = min(step_x, (WIDTH - ENEMY_OFFSET_X - 40) / (cols - 1))
+    if rows > 1:
+        step_y = min(step_y, (HEIGHT // 2 - ENEMY_OFFSET_Y) / (rows - 1))
     return [
-        (ENEMY_OFFSET_X + col * (20 + ENEMY_PADDING_X),
-         ENEMY_OFFSET_Y + row * (20 + ENEMY_PADDING_Y))
-        for row in range(ROWS) for col in range(COLS)
+        (ENEMY_OFFSET_X + int(col * step_x),
+         ENEMY_OFFSET_Y + int(row * step_y))
+        for row in range(rows) for col in range(cols)
     ]
 
 
@@ -192,7 +329,7 @@ def load_heart() -> pygame.Surface:
     return pygame.transform.smoothscale(img, (32, 32))
 
 
-def move_player(rect: pygame.Rect, keys: Any, ai_action: Optional[Action] = None) -> None:
+def move_player(rect: pygame.Rect, keys: Any, ai_action: Optional[Action] = None, scale: int = 1) -> None:
     """Mozgatja a játékost billentyűzettel vagy AI utasítással.
 
     Paraméterek:
@@ -200,6 +337,7 @@ def move_player(rect: pygame.Rect, keys: Any, ai_action: Optional[Action] = None
         keys (obj): `pygame.key.get_pressed()` eredménye vagy azzal kompatibilis.
         ai_action (Optional[Action]): AI döntés. Ha meg van adva és tartalmaz `move`-ot,
             felülírja a billentyűzetet.
+        scale (int): Összevont alaplépések száma (a megtett út ennyiszeres).
 
     Visszatérés:
         None
@@ -207,19 +345,20 @@ def move_player(rect: pygame.Rect, keys: Any, ai_action: Optional[Action] = None
     Mellékhatás:
         A `rect` koordinátái és a globális képernyőhatárokhoz igazítás.
     """
+    speed = PLAYER_SPEED * scale
     if ai_action and ai_action["move"]:
         mv = ai_action["move"]
         if mv in ("left", "right"):
-            rect.x += PLAYER_SPEED * (-1 if mv == "left" else 1)
+            rect.x += speed * (-1 if mv == "left" else 1)
         elif mv in ("down", "retreat"):
-            rect.y += PLAYER_SPEED
+            rect.y += speed
     else:
         if keys and keys[pygame.K_LEFT]:
-            rect.x -= PLAYER_SPEED
+            rect.x -= speed
         if keys and keys[pygame.K_RIGHT]:
-            rect.x += PLAYER_SPEED
+            rect.x += speed
         if keys and keys[pygame.K_DOWN]:
-            rect.y += PLAYER_SPEED
+            rect.y += speed
 
     rect.left = max(rect.left, 0)
     rect.right = min(rect.right, WIDTH)
@@ -227,29 +366,41 @@ def move_player(rect: pygame.Rect, keys: Any, ai_action: Optional[Action] = None
     rect.bottom = min(rect.bottom, HEIGHT)
 
 
-def move_bullets(bullets: List[List[int]]) -> None:
+def move_bullets(bullets: List[List[int]], scale: int = 1) -> None:
     """Felfelé mozgatja a játékos lövedékeit és kilistázza a képernyőn kívülieket.
 
     Paraméterek:
         bullets (List[List[int]]): [x, y] párok listája. Helyben módosul.
+        scale (int): Összevont alaplépések száma (a megtett út ennyiszeres).
 
     Visszatérés:
         None
+
+    Megjegyzés:
+        Az a lövedék marad meg, amelynek az ebben a lépésben bejárt útja még a képernyőre
+        esik: a felső szélen átlépő lövedék is eltalálhatja a legfelső ellenséget. A
+        `handle_bullet_collisions` a találatvizsgálat után törli (még ugyanebben a lépésben).
     """
+    travel = BULLET_SPEED * scale
     for b in bullets:
-        b[1] -= BULLET_SPEED
-    bullets[:] = [b for b in bullets if b[1] > 0]
+        b[1] -= travel
+    bullets[:] = [b for b in bullets if b[1] + travel > 0]
 
 
 def create_enemies(enemy_img: pygame.Surface, all_positions: List[Tuple[int, int]],
-                   count: int, speed_multiplier: float = 1.0) -> List[Dict[str, Any]]:
+                   count: int, speed_multiplier: float = 1.0,
+                   rng: Optional[np.random.Generator] = None,
+                   tint: bool = True) -> List[Dict[str, Any]]:
     """Létrehozza az ellenségek listáját véletlen mérettel és színnel.
 
     Paraméterek:
         enemy_img (pygame.Surface): Bázis sprite, amelyből méretezünk és színezünk.
-        all_positions (List[Tuple[int,int]]): Elérhető kezdőpozíciók.
+        all_positions (List[Tuple[int,int]]): Elérhető kezdőpozíciók. Helyben megkeveredik.
         count (int): Létrehozandó ellenségek száma.
         speed_multiplier (float): Sebességszorzó a szint nehezítéséhez.
+        rng (Optional[np.random.Generator]): A játékpéldány véletlengenerátora
+            (`level_data["rng"]`). None esetén a modul alapértelmezett generátora.
+        tint (bool): Ha False, a sprite nem színeződik (headless futás; a sorsolás ugyanaz).
 
     Visszatérés:
         List[Dict[str,Any]]: Minden elem kulcsai:
@@ -257,25 +408,29 @@ def create_enemies(enemy_img: pygame.Surface, all_positions: List[Tuple[int, int
             - "speed" (float): alap sebesség (nem minden ág használja)
             - "image" (pygame.Surface): aktuális, színezett sprite
             - "float_x" (float), "float_y" (float): subpixel pozíciók
+            - "mask" (pygame.mask.Mask): a (sprite, méret) változat gyorsítótárazott maszkja
+              (pixelpontos ütközéshez; a színezés nem változtat rajta)
 
     Megjegyzés:
         A színezés per-pixel történik. Cache-eléssel gyorsítható.
     """
-    random.shuffle(all_positions)
+    rng = _default_rng if rng is None else rng
+    all_positions[:] = [all_positions[i] for i in rng.permutation(len(all_positions))]
     enemies: List[Dict[str, Any]] = []
     for pos in all_positions[:count]:
-        size = random.randint(20, 40)
+        size = int(rng.integers(20, 41))
         scaled_img = pygame.transform.smoothscale(enemy_img, (size, size))
-        color = (random.randint(50, 255), random.randint(50, 255), random.randint(50, 255))
-        tinted_img = tint_image(scaled_img, color)
+        color = tuple(int(c) for c in rng.integers(50, 256, size=3))
+        tinted_img = tint_image(scaled_img, color) if tint else scaled_img
         rect = tinted_img.get_rect(topleft=pos)
-        speed = random.uniform(1.0, 2.0) * speed_multiplier
+        speed = float(rng.uniform(1.0, 2.0)) * speed_multiplier
         enemies.append({
             "rect": rect,
             "speed": speed,
             "image": tinted_img,
             "float_x": float(rect.x),
             "float_y": float(rect.y),
+            "mask": mask_for(enemy_img, (size, size)),
         })
     return enemies
 
@@ -291,7 +446,7 @@ def reset_level(player_rect: pygame.Rect, bullets: List[List[int]],
         enemies (List[Dict]): Ellenségek listája. Újragenerálódik.
         all_positions (List[Tuple[int,int]]): Potenciális ellenségpozíciók.
         level_data (Dict[str,Any]): Állapot: "level", "enemy_count", "speed_multiplier",
-            "enemy_img", "dx" stb. Helyben módosul.
+            "enemy_img", "dx", "rng", "recolor" stb. Helyben módosul.
         same_level (bool): Ha True, a szintszám és enemy_count nem nő.
 
     Visszatérés:
@@ -300,48 +455,139 @@ def reset_level(player_rect: pygame.Rect, bullets: List[List[int]],
     if not same_level:
         level_data["level"] += 1
         level_data["enemy_count"] += 2
-    enemies[:] = create_enemies(level_data["enemy_img"], all_positions, level_data["enemy_count"], level_data["speed_multiplier"])
+    enemies[:] = create_enemies(level_data["enemy_img"], all_positions, level_data["enemy_count"],
+                                level_data["speed_multiplier"], level_data.get("rng"),
+                                tint=level_data.get("recolor", True))
     bullets.clear()
     player_rect.midbottom = (WIDTH // 2, HEIGHT - 50)
     level_data["dx"] = 2 * level_data["speed_multiplier"]
 
 
-def spawn_powerup(powerups: pygame.sprite.Group) -> None:
+def spawn_powerup(powerups: pygame.sprite.Group, rng: Optional[np.random.Generator] = None,
+                  timers: Optional[TimerHeap] = None, scale: int = 1) -> None:
     """Véletlenszerűen új power-upot spawnol.
 
     Paraméterek:
         powerups (pygame.sprite.Group): Cél csoport, ide kerül az új power-up.
+        rng (Optional[np.random.Generator]): A játékpéldány véletlengenerátora.
+            None esetén a modul alapértelmezett generátora.
+        timers (Optional[TimerHeap]): Ha meg van adva, ide kerül a power-up eltűnésének
+            ("powerup_despawn") eseménye, így nem kell minden frame-ben lekérdezni.
+        scale (int): Összevont alaplépések száma (az esély ennyi lépésre vonatkozik).
 
     Visszatérés:
         None
 
     Logika:
-        Ha nincs aktív power-up és `random()<0.001`, akkor "star" típusú power-upot hoz létre.
+        Ha nincs aktív power-up és `random()<POWERUP_SPAWN_CHANCE`, akkor "star" típusú
+        power-upot hoz létre.
     """
-    if len(powerups) == 0 and random.random() < 0.001:
-        pos = (random.randint(50, WIDTH - 50), random.randint(50, HEIGHT - 150))
-        powerup = PowerUp("star.png", "star", pos, 4000)
+    if len(powerups) != 0:
+        return
+    rng = _default_rng if rng is None else rng
+    if rng.random() < _scaled_chance(POWERUP_SPAWN_CHANCE, scale):
+        pos = (int(rng.integers(50, WIDTH - 49)), int(rng.integers(50, HEIGHT - 149)))
+        powerup = PowerUp("star.png", "star", pos, POWERUP_FIELD_LIFETIME_MS)
         powerups.add(powerup)
+        if timers is not None:
+            timers.schedule(powerup.spawn_time + powerup.duration, "powerup_despawn", powerup)
 
 
 def update_shoot_delay(player_powerups: Dict[str, int]) -> int:
     """Visszaadja az aktuális lövési késleltetést a power-upok függvényében.
 
     Paraméterek:
-        player_powerups (Dict[str,int]): Power-up aktiválási idők `pygame.time.get_ticks()` alapján.
+        player_powerups (Dict[str,int]): Aktív power-upok aktiválási ideje `game_ticks()` alapján.
+            A lejárt bejegyzéseket az időzítő ("effect_expire" esemény) törli.
 
     Visszatérés:
-        int: Lövési késleltetés ms-ban.
+        int: Lövési késleltetés ms-ban (a legkedvezőbb aktív power-up szerint).
+    """
+    delay = BASE_SHOOT_DELAY
+    for kind in player_powerups:
+        delay = min(delay, POWERUP_SHOOT_DELAYS.get(kind, BASE_SHOOT_DELAY))
+    return delay
 
-    Mellékhatás:
-        Lejárt "star" bejegyzés törlődik a szótárból.
+
+def activate_powerup(kind: str, player_powerups: Dict[str, int], level_data: Dict[str, Any],
+                     now: int) -> None:
+    """Aktivál egy felvett/lelőtt power-upot és beütemezi a lejáratát.
+
+    Paraméterek:
+        kind (str): Power-up típus (pl. "star"); hatásideje `POWERUP_DURATIONS`-ből.
+        player_powerups (Dict[str,int]): Aktív power-upok. Bővül.
+        level_data (Dict[str,Any]): Tartalmazza a "timers" időzítőt.
+        now (int): Aktuális játékidő.
+
+    Visszatérés:
+        None
     """
-    if "star" in player_powerups:
-        if pygame.time.get_ticks() - player_powerups["star"] < 4000:
-            return POWERUP_SHOOT_DELAY
-        else:
-            del player_powerups["star"]
-    return BASE_SHOOT_DELAY
+    player_powerups[kind] = now
+    timers = level_data.setdefault("timers", TimerHeap())
+    duration = POWERUP_DURATIONS.get(kind, POWERUP_FIELD_LIFETIME_MS)
+    timers.schedule(now + duration, "effect_expire", (kind, now))
+    refresh_shot_cooldown(level_data, update_shoot_delay(player_powerups), now)
+
+
+def refresh_shot_cooldown(level_data: Dict[str, Any], shoot_delay: int, now: int) -> None:
+    """Újraszámolja a lövési készenlétet, és beütemezi a cooldown végét.
+
+    A régi szabály (`now - last_shot_time > shoot_delay`) pontos megfelelője: ha a
+    késleltetés menet közben változik (power-up be/ki), a készenlét is ehhez igazodik.
+    A korábban beütemezett cooldown-események a generációszám miatt érvénytelenné válnak.
+
+    Paraméterek:
+        level_data (Dict[str,Any]): "last_shot_time", "shot_ready", "shot_gen", "timers". Helyben módosul.
+        shoot_delay (int): Az érvényes lövési késleltetés ms-ban.
+        now (int): Aktuális játékidő.
+
+    Visszatérés:
+        None
+    """
+    level_data["shot_gen"] = level_data.get("shot_gen", 0) + 1
+    ready_at = level_data["last_shot_time"] + shoot_delay + 1
+    level_data["shot_ready"] = now >= ready_at
+    if not level_data["shot_ready"]:
+        level_data.setdefault("timers", TimerHeap()).schedule(ready_at, "shot_ready", level_data["shot_gen"])
+
+
+def process_timers(now: int, level_data: Dict[str, Any], powerups: pygame.sprite.Group,
+                   player_powerups: Dict[str, int]) -> List[PowerUp]:
+    """Lefuttatja az esedékes időzített eseményeket (csak azokat, a többit nem nézi).
+
+    Események:
+        "powerup_despawn" (PowerUp): a pályán hagyott power-up lejárt. Nem itt tűnik el,
+            hanem a visszaadott listából a hívó távolítja el az ütközésvizsgálat után
+            (így a lejárat lépésében a lövedékek még eltalálhatják).
+        "effect_expire" ((típus, aktiválás)): lejár a felvett power-up hatása, ha azóta
+            nem aktiválták újra; a lövési cooldown az új késleltetéshez igazodik.
+        "shot_ready" (generáció): véget ért a lövési cooldown (ha közben nem ütemeztük át).
+
+    Paraméterek:
+        now (int): Aktuális játékidő.
+        level_data (Dict[str,Any]): Tartalmazza a "timers" időzítőt.
+        powerups (pygame.sprite.Group): Pályán lévő power-upok.
+        player_powerups (Dict[str,int]): Aktív power-upok.
+
+    Visszatérés:
+        List[PowerUp]: A lejárt, még eltávolítandó power-upok.
+    """
+    timers = level_data.get("timers")
+    if timers is None:
+        return []
+    expired: List[PowerUp] = []
+    for kind, payload in timers.pop_due(now):
+        if kind == "powerup_despawn":
+            expired.append(payload)
+        elif kind == "effect_expire":
+            effect, activated_at = payload
+            if player_powerups.get(effect) == activated_at:
+                del player_powerups[effect]
+                refresh_shot_cooldown(level_data, update_shoot_delay(player_powerups), now)
+        elif kind == "shot_ready":
+            if payload == level_data.get("shot_gen"):
+                level_data["shot_ready"] = True
+    return expired
 
 
 def handle_shooting(keys: Any, bullets: List[List[int]], player_rect: pygame.Rect,
@@ -353,8 +599,9 @@ def handle_shooting(keys: Any, bullets: List[List[int]], player_rect: pygame.Rec
         keys: `pygame.key.get_pressed()` eredménye, vagy None AI módban.
         bullets (List[List[int]]): Lövedékek listája. Bővülhet.
         player_rect (pygame.Rect): Játékos rect. Felső élről indul a lövedék.
-        current_time (int): `pygame.time.get_ticks()`.
-        level_data (Dict[str,Any]): Tartalmazza a "last_shot_time" kulcsot.
+        current_time (int): `game_ticks()`.
+        level_data (Dict[str,Any]): Tartalmazza a "last_shot_time" és a "shot_ready" kulcsot.
+            Lövéskor a cooldown vége az időzítőbe kerül ("shot_ready" esemény).
         shoot_delay (int): Késleltetés ms-ban két lövés között.
         ai_action (Optional[Action]): AI döntés. Ha `shoot` True, az lövést kér.
 
@@ -370,16 +617,21 @@ def handle_shooting(keys: Any, bullets: List[List[int]], player_rect: pygame.Rec
     elif keys and keys[pygame.K_SPACE]:
         should_shoot = True
 
-    # Ha tényleg lőni kell és letelt a késleltetés
-    if should_shoot and current_time - level_data["last_shot_time"] > shoot_delay:
+    # Ha tényleg lőni kell és letelt a késleltetés (a készenlétet az időzítő állítja vissza)
+    if "shot_ready" in level_data:
+        ready = level_data["shot_ready"]
+    else:
+        ready = current_time - level_data["last_shot_time"] > shoot_delay
+    if should_shoot and ready:
         bullets.append([player_rect.centerx, player_rect.top])
         level_data["last_shot_time"] = current_time
+        refresh_shot_cooldown(level_data, shoot_delay, current_time)
 
 
 
 def handle_bullet_collisions(bullets: List[List[int]], enemies: List[Dict[str, Any]],
                              powerups: pygame.sprite.Group, score: int,
-                             player_powerups: Dict[str, int]) -> int:
+                             player_powerups: Dict[str, int], level_data: Dict[str, Any]) -> int:
     """Kezeli a lövedékek ütközéseit ellenségekkel és power-upokkal.
 
     Paraméterek:
@@ -388,57 +640,70 @@ def handle_bullet_collisions(bullets: List[List[int]], enemies: List[Dict[str, A
         powerups (pygame.sprite.Group): Power-up sprite-ok. Találat esetén felvétel.
         score (int): Aktuális pontszám.
         player_powerups (Dict[str,int]): Aktivált power-upok időbélyegei.
+        level_data (Dict[str,Any]): A lelőtt power-up lejárata az itteni időzítőbe kerül
+            (`activate_powerup`; enélkül a hatás sosem járna le). "pixel_collisions"=False esetén
+            az ellenség-találat csak rect-alapú; a "step_scale" a lövedék lépésenkénti útját adja.
 
     Visszatérés:
         int: Frissített pontszám (+10 ellenségenként).
+
+    Megjegyzés:
+        A lövedék a lépésben bejárt függőleges szakaszával ütközik (`collision.segment_entry`),
+        és a szakasz mentén elsőként (legalul) elért célpontot találja el; azonos ponton a
+        power-up az erősebb. Ellenségnél a sprite maszkja is dönt, így az átlátszó sarkok
+        nem adnak találatot. A vizsgálat után a felső szélen túljutott (y <= 0) lövedékek
+        törlődnek, így a képernyőn kívüli lövedék nem marad meg a következő lépésre.
     """
+    pixel = level_data.get("pixel_collisions", True)
+    travel = BULLET_SPEED * level_data.get("step_scale", 1)
+    if not bullets:
+        return score
+    enemy_rects = [enemy["rect"] for enemy in enemies]
     for bullet in bullets[:]:
+        x, y = bullet
+        first_y: Optional[int] = None
+        hit_powerup: Optional[PowerUp] = None
+        hit_enemy: Optional[int] = None
         for powerup in powerups:
-            if powerup.rect.collidepoint(bullet):
-                powerups.remove(powerup)
-                if bullet in bullets:
-                    bullets.remove(bullet)
-                player_powerups[powerup.type] = pygame.time.get_ticks()
-                break
-        else:
-            for enemy in enemies[:]:
-                if enemy["rect"].collidepoint(bullet):
-                    bullets.remove(bullet)
-                    enemies.remove(enemy)
-                    score += 10
-                    break
+            entry = segment_entry(powerup.rect, None, x, y, y + travel)
+            if entry is not None and (first_y is None or entry > first_y):
+                first_y, hit_powerup = entry, powerup
+        # előszűrés egyetlen C-hívással: a szakasz 1 px széles rect-je mely ellenségekkel fed át
+        for i in pygame.Rect(x, y, 1, travel + 1).collidelistall(enemy_rects):
+            enemy = enemies[i]
+            entry = segment_entry(enemy["rect"], enemy.get("mask") if pixel else None, x, y, y + travel)
+            if entry is not None and (first_y is None or entry > first_y):
+                first_y, hit_powerup, hit_enemy = entry, None, i
+        if hit_powerup is not None:
+            powerups.remove(hit_powerup)
+            bullets.remove(bullet)
+            activate_powerup(hit_powerup.type, player_powerups, level_data, game_ticks())
+        elif hit_enemy is not None:
+            bullets.remove(bullet)
+            del enemies[hit_enemy]
+            del enemy_rects[hit_enemy]
+            score += 10
+    bullets[:] = [b for b in bullets if b[1] > 0]
     return score
 
 
-def remove_expired_powerups(powerups: pygame.sprite.Group) -> None:
-    """Eltávolítja a lejárt power-upokat a sprite-csoportból.
-
-    Paraméterek:
-        powerups (pygame.sprite.Group): Forrás csoport.
-
-    Visszatérés:
-        None
-    """
-    for powerup in list(powerups):
-        if not powerup.is_active():
-            powerups.remove(powerup)
-
-
 def collect_powerups(player_rect: pygame.Rect, powerups: pygame.sprite.Group,
-                     player_powerups: Dict[str, int]) -> None:
+                     player_powerups: Dict[str, int], level_data: Dict[str, Any]) -> None:
     """Begyűjt minden power-upot, amellyel a játékos rect-je átfed.
 
     Paraméterek:
         player_rect (pygame.Rect): Játékos ütköződoboza.
         powerups (pygame.sprite.Group): Elérhető power-upok.
         player_powerups (Dict[str,int]): Aktivált power-upok időbélyegei. Bővülhet.
+        level_data (Dict[str,Any]): A lejárat az itteni időzítőbe kerül (`activate_powerup`;
+            enélkül a hatás sosem járna le).
 
     Visszatérés:
         None
     """
     for powerup in list(powerups):
         if player_rect.colliderect(powerup.rect):
-            player_powerups[powerup.type] = pygame.time.get_ticks()
+            activate_powerup(powerup.type, player_powerups, level_data, game_ticks())
             powerups.remove(powerup)
 
 
@@ -447,35 +712,48 @@ def move_enemies(enemies: List[Dict[str, Any]], level_data: Dict[str, Any], play
 
     Paraméterek:
         enemies (List[Dict]): Ellenség-állapotok listája. Elemek helyben módosulnak.
-        level_data (Dict[str,Any]): Tartalmazza az "enemy_img"-et az újraszínezéshez.
+        level_data (Dict[str,Any]): Tartalmazza az "enemy_img"-et az újraszínezéshez és a
+            játékpéldány "rng" generátorát (ha hiányzik, a modul alapértelmezettjét használjuk).
+            Ha "recolor" False (headless futás) vagy "recolor_frozen" True (a minőség-szabályozó
+            befagyasztotta), az újraszínezés kimarad. "step_scale" esetén
+            a sodródás k-szoros, az ugrás esélye k lépésre vonatkozik (legfeljebb egy ugrás).
         player_rect (pygame.Rect): Játékos helyzete.
 
     Visszatérés:
         None
 
     Megjegyzés:
+        Az összes ugrás/irány sorsolás egyetlen kötegelt `rng.random((n, 3))` hívásból
+        származik: [:, 0] az ugrás-döntés, [:, 1] és [:, 2] az x/y irány (< 0.5 -> negatív).
         A függvény minden lépésben újraszínezi a sprite-ot a távolság alapján
         (piros-közeli, sárga-közepes, zöld-távoli).
     """
-    enemy_speed_x = 1.2
-    enemy_speed_y = 0.5
-    jump_distance = 60
-    close_distance = 70
-    jump_chance_far = 0.010
-    jump_chance_close = 0.15
-    threshold = 200
+    scale = level_data.get("step_scale", 1)
+    enemy_speed_x = ENEMY_SPEED_X * scale
+    enemy_speed_y = ENEMY_SPEED_Y * scale
+    jump_distance = ENEMY_JUMP_DISTANCE
+    close_distance = ENEMY_CLOSE_DISTANCE
+    jump_chance_far = _scaled_chance(ENEMY_JUMP_CHANCE_FAR, scale)
+    jump_chance_close = _scaled_chance(ENEMY_JUMP_CHANCE_CLOSE, scale)
+    threshold = ENEMY_FOLLOW_THRESHOLD
 
-    for enemy in enemies:
+    if not enemies:
+        return
+    rng = level_data.get("rng", _default_rng)
+    recolor = level_data.get("recolor", True) and not level_data.get("recolor_frozen", False)
+    draws = rng.random((len(enemies), 3)).tolist()
+
+    for enemy, (jump_roll, dir_x, dir_y) in zip(enemies, draws):
         dx = player_rect.centerx - (enemy["float_x"] + enemy["rect"].width / 2)
         dy = player_rect.centery - (enemy["float_y"] + enemy["rect"].height / 2)
         distance = (dx ** 2 + dy ** 2) ** 0.5
 
         if distance < close_distance:
-            if random.random() < jump_chance_close:
-                enemy["float_x"] += random.choice([-jump_distance, jump_distance])
-                enemy["float_y"] += random.choice([-jump_distance, jump_distance])
-        elif random.random() < jump_chance_far:
-            if random.choice([True, False]):
+            if jump_roll < jump_chance_close:
+                enemy["float_x"] += -jump_distance if dir_x < 0.5 else jump_distance
+                enemy["float_y"] += -jump_distance if dir_y < 0.5 else jump_distance
+        elif jump_roll < jump_chance_far:
+            if dir_x < 0.5:
                 enemy["float_x"] -= jump_distance
             else:
                 enemy["float_x"] += jump_distance
@@ -496,6 +774,8 @@ def move_enemies(enemies: List[Dict[str, Any]], level_data: Dict[str, Any], play
         enemy["rect"].x = int(enemy["float_x"])
         enemy["rect"].y = int(enemy["float_y"])
 
+        if not recolor:
+            continue
         if distance < 100:
             color = (255, 0, 0)        # közeli
         elif distance <= 250:
@@ -503,21 +783,43 @@ def move_enemies(enemies: List[Dict[str, Any]], level_data: Dict[str, Any], play
         else:
             color = (0, 255, 0)        # távoli
 
-        base_img = pygame.transform.smoothscale(level_data["enemy_img"], (enemy_width, enemy_height))
-        enemy["image"] = tint_image(base_img, color)
+        enemy["image"] = tinted_sprite(level_data["enemy_img"], (enemy_width, enemy_height), color)
 
 
-def check_player_collision(player_rect: pygame.Rect, enemies: List[Dict[str, Any]]) -> bool:
+def check_player_collision(player_rect: pygame.Rect, enemies: List[Dict[str, Any]],
+                           player_mask: Optional[pygame.mask.Mask] = None,
+                           start: Optional[Tuple[int, int]] = None) -> bool:
     """Eldönti, hogy a játékos ütközik-e bármely ellenséggel.
 
     Paraméterek:
         player_rect (pygame.Rect): Játékos ütköződoboza.
         enemies (List[Dict]): Ellenségek listája.
+        player_mask (Optional[pygame.mask.Mask]): A játékos sprite maszkja. Ha meg van adva,
+            a rect-teszten átment párokat a maszkok átfedése dönti el (pixelpontos).
+        start (Optional[Tuple[int,int]]): A játékos bal felső sarka a lépés elején. Ha a
+            lépésben több mint `PLAYER_SPEED`-et mozdult (összevont lépés), a bejárt út
+            alaplépésenkénti köztes helyzetei is vizsgálódnak, így nem "ugorhat át" ellenséget.
+            Közelítés: az ellenségek csak a lépés végi helyzetükben szerepelnek (az ő
+            mozgásuk nincs végigsöpörve); összevont lépésnél a lépésen belül átsuhanó
+            ellenség–játékos érintkezés így kimaradhat.
 
     Visszatérés:
-        bool: True, ha bármely ellenség rect-je metszi a játékos rect-jét.
+        bool: True, ha bármely ellenség ütközik a játékossal.
     """
-    return any(enemy["rect"].colliderect(player_rect) for enemy in enemies)
+    rects = [player_rect]
+    if start is not None:
+        dx = player_rect.x - start[0]
+        dy = player_rect.y - start[1]
+        n = math.ceil(max(abs(dx), abs(dy)) / PLAYER_SPEED)
+        rects = [player_rect.move(-round(dx * (n - i) / n), -round(dy * (n - i) / n))
+                 for i in range(1, n)] + rects
+    # előszűrés egyetlen C-hívással: a bejárt út befoglaló rect-jével átfedő ellenségek
+    swept = player_rect.unionall(rects) if len(rects) > 1 else player_rect
+    near = [enemies[i] for i in swept.collidelistall([enemy["rect"] for enemy in enemies])]
+    if player_mask is None:
+        return any(enemy["rect"].collidelist(rects) >= 0 for enemy in near)
+    return any(sprites_overlap(rect, player_mask, enemy["rect"], enemy.get("mask"))
+               for enemy in near for rect in rects)
 
 
 def _log_throttled(msg: str, action: Action) -> None:
@@ -700,7 +1002,9 @@ def update_game_state(keys, player_rect, bullets, enemies, all_positions,
         enemies (List[Dict]): Ellenségek. Helyben módosulnak.
         all_positions (List[Tuple[int,int]]): Ellenség spawn helyek.
         level_data (Dict[str,Any]): Állapot (enemy_img, enemy_count, speed_multiplier,
-            last_shot_time, dx, level, stb.).
+            last_shot_time, shot_ready, timers, dx, level, rng stb.). A lejáratokat és a
+            lövési cooldownt a "timers" időzítő kezeli; frame-enként csak az esedékes
+            események futnak.
         lives (int): Játékos életeinek száma.
         score (int): Pontszám.
         powerups (pygame.sprite.Group): Power-up objektumok.
@@ -709,6 +1013,11 @@ def update_game_state(keys, player_rect, bullets, enemies, all_positions,
         external_ai_action (Optional[Action]): Külső AI döntés. Ha meg van adva,
             felülírja a belső `decide_action` logikát.
 
+    Megjegyzés:
+        A level_data "step_scale" kulcsa (alapból 1) összevont lépést kér: a hívás ennyi
+        alaplépésnyi időt szimulál, ugyanazzal az akcióval (lásd `POWERUP_SPAWN_CHANCE` fölött);
+        a hívó a játékórát `sim_step_ms(level_data)`-val léptesse.
+
     Visszatérés:
         Tuple[int, bool, int]: (lives, game_over, score)
             - lives (int): Frissített életek
@@ -718,30 +1027,37 @@ def update_game_state(keys, player_rect, bullets, enemies, all_positions,
     Mellékhatás:
         Listák és dict-ek helyben frissülnek. Szint resetelődhet.
     """
-    current_time = pygame.time.get_ticks()
+    current_time = game_ticks()
     ai_action = external_ai_action if ai_mode else None
     if ai_mode and ai_action is None:
         ai_action = decide_action(player_rect, enemies, powerups)
 
-    move_player(player_rect, keys, ai_action)
-    spawn_powerup(powerups)
+    timers = level_data.setdefault("timers", TimerHeap())
+    expired_powerups = process_timers(current_time, level_data, powerups, player_powerups)
+
+    scale = level_data.get("step_scale", 1)
+    start = player_rect.topleft
+    move_player(player_rect, keys, ai_action, scale)
+    spawn_powerup(powerups, level_data.get("rng"), timers, scale)
     shoot_delay = update_shoot_delay(player_powerups)
     handle_shooting(keys, bullets, player_rect, current_time, level_data, shoot_delay, ai_action)
-    move_bullets(bullets)
-    score = handle_bullet_collisions(bullets, enemies, powerups, score, player_powerups)
-    remove_expired_powerups(powerups)
-    collect_powerups(player_rect, powerups, player_powerups)
+    move_bullets(bullets, scale)
+    score = handle_bullet_collisions(bullets, enemies, powerups, score, player_powerups, level_data)
+    powerups.remove(*expired_powerups)
+    collect_powerups(player_rect, powerups, player_powerups, level_data)
     move_enemies(enemies, level_data, player_rect)
 
     SAFE_BASELINE = HEIGHT - 50
     if ai_mode and player_rect.bottom > SAFE_BASELINE:
-        player_rect.y -= 1
+        player_rect.y -= scale
 
     # ÚJ: ha az ellenfél elérte a játékos sorát, azonnal életvesztés és reset
     if enemy_breached_player_row(player_rect, enemies):
         lives -= 1
         reset_level(player_rect, bullets, enemies, all_positions, level_data, same_level=True)
-    elif check_player_collision(player_rect, enemies):
+    elif check_player_collision(player_rect, enemies,
+                                level_data.get("player_mask") if level_data.get("pixel_collisions", True) else None,
+                                start):
         lives -= 1
         reset_level(player_rect, bullets, enemies, all_positions, level_data, same_level=True)
     elif not enemies:
@@ -792,7 +1108,7 @@ def log_example(dx: float, dy: float, action: int, speed_multiplier: float, enem
     with open(file_path, "a", newline="", encoding="utf-8") as f:
         w = csv.writer(f)
         if write_header:
-            w.writerow(["dx", "dy", "action", "speed_multiplier", "enemy_count"])
+            w.writerow(EXAMPLE_COLUMNS)
         w.writerow([dx, dy, action, speed_multiplier, enemy_count])
 
 def debug_print(*args, **kwargs) -> None:
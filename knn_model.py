@@ -0,0 +1,276 @@
+"""sklearn-mentes KNN következtetés: `.npz` modellformátum és tisztán NumPy-s, pontos prediktor.
+
+A pickle-lt `KNeighborsClassifier` betöltése a scikit-learn importjával jár (lassú), és
+eltérő sklearn verziók között eltörhet. A `train_player_ai` ezért a `.joblib` mellé egy
+`.npz` modellt is ír: tanítópontok, címkék (osztályindex), osztályok, k, szavazási súlyozás,
+mintasúlyok és a bemeneti skálázás (offset/scale). A `NumpyKNN` ebből jósol:
+
+    - a k legközelebbi pontot választjuk; a k-adik távolságnál fennálló holtversenyben
+      a kisebb indexű tanítópont nyer;
+    - "uniform" súlyozásnál szavazatszám, "distance"-nél 1/távolság (nulla távolságnál csak a
+      pontos egyezések szavaznak, mint az sklearn-nél), mintasúlyokkal szorozva;
+    - szavazat-holtversenyben a kisebb osztályindex nyer (`argmax`).
+
+A `train_player_ai` modellje (`WeightedKNeighborsClassifier`) ugyanezt a szabályt követi,
+így a jóslatok minden lekérdezésen azonosak. A gyári `KNeighborsClassifier` a k-adik
+távolság holtversenyében a keresőkupac belső sorrendje szerint választ, így az ilyen régi
+modell nem exportálható (újra kell tanítani). Exportkor az egyezést ellenőrizzük
+(`verify`) a tanítópontokon és véletlen lekérdezéseken; egyetlen eltérésnél sem készül `.npz`.
+
+    python knn_model.py export player_model.joblib [-o player_model.npz]
+    python knn_model.py info player_model.npz
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+FORMAT_VERSION = 1
+QUERY_CHUNK = 1024          # kötegelt jóslásnál legfeljebb ennyi lekérdezés egyszerre
+BLOCK_ELEMENTS = 1 << 21    # egy köteg (lekérdezés × tanítópont) távolságmátrixának felső korlátja (16 MB float64)
+DEFAULT_MODEL_BASE = "player_model"
+
+
+class NumpyKNN:
+    """Pontos KNN osztályozó NumPy-val (euklideszi távolság).
+
+    Attribútumok:
+        X (np.ndarray): (n, d) skálázott tanítópontok.
+        labels (np.ndarray): (n,) osztályindexek (`classes`-be).
+        classes (np.ndarray): Osztálycímkék, növekvő sorrendben.
+        k (int): Szomszédszám.
+        weights (str): "uniform" vagy "distance".
+        sample_weight (np.ndarray): (n,) mintasúlyok (összevont duplikátumoknál > 1).
+        offset, scale (np.ndarray): Bemeneti skálázás: (x - offset) / scale.
+    """
+
+    def __init__(self, X: Any, labels: Any, classes: Any, k: int, weights: str = "uniform",
+                 sample_weight: Optional[Any] = None, offset: Optional[Any] = None,
+                 scale: Optional[Any] = None) -> None:
+        """Inicializálja a prediktort (a tömböket nem skálázza; az `X` már skálázott).
+
+        Kivétel dobása:
+            ValueError: Ismeretlen súlyozás, érvénytelen k vagy eltérő hosszúságú tömbök esetén.
+        """
+        if weights not in ("uniform", "distance"):
+            raise ValueError(f"Nem támogatott súlyozás: {weights!r}")
+        self.X = np.ascontiguousarray(X, dtype=np.float64)
+        self.labels = np.asarray(labels, dtype=np.int64)
+        self.classes = np.asarray(classes)
+        if k <= 0 or k > len(self.X):
+            raise ValueError(f"k={k} nem lehet nagyobb a tanítópontok számánál ({len(self.X)})")
+        if len(self.labels) != len(self.X):
+            raise ValueError("X és labels hossza eltér")
+        self.k = int(k)
+        self.weights = weights
+        dim = self.X.shape[1]
+        self.sample_weight = (np.ones(len(self.X)) if sample_weight is None
+                              else np.asarray(sample_weight, dtype=np.float64))
+        self.offset = np.zeros(dim) if offset is None else np.asarray(offset, dtype=np.float64)
+        self.scale = np.ones(dim) if scale is None else np.asarray(scale, dtype=np.float64)
+        # osztályonkénti szavazómátrix: (n, osztályok), a mintasúllyal
+        self._votes = np.zeros((len(self.X), len(self.classes)))
+        self._votes[np.arange(len(self.X)), self.labels] = self.sample_weight
+
+    @classmethod
+    def from_sklearn(cls, model: Any) -> "NumpyKNN":
+        """Illesztett `KNeighborsClassifier` (vagy `WeightedKNeighborsClassifier`) átvétele.
+
+        Kivétel dobása:
+            ValueError: Nem euklideszi metrika vagy hívható súlyfüggvény esetén.
+        """
+        metric, p = model.effective_metric_, model.get_params().get("p", 2)
+        if metric not in ("euclidean", "l2") and not (metric == "minkowski" and p == 2):
+            raise ValueError(f"Csak euklideszi metrika exportálható (kapott: {metric}, p={p})")
+        if not isinstance(model.weights, str):
+            raise ValueError("Hívható súlyfüggvény nem exportálható")
+        X = np.asarray(model._fit_X, dtype=np.float64)
+        labels = np.asarray(model._y).reshape(-1)
+        return cls(X, labels, model.classes_, model.n_neighbors, model.weights,
+                   getattr(model, "sample_weight_", None))
+
+    def save(self, path: str) -> None:
+        """Mentés `.npz`-be (pickle nélkül betölthető)."""
+        np.savez(path, X=self.X, labels=self.labels, classes=self.classes, k=np.int64(self.k),
+                 weights=np.array(self.weights), sample_weight=self.sample_weight,
+                 offset=self.offset, scale=self.scale, version=np.int64(FORMAT_VERSION))
+
+    @classmethod
+    def load(cls, path: str) -> "NumpyKNN":
+        """Betöltés `.npz`-ből.
+
+        Kivétel dobása:
+            FileNotFoundError: Ha a fájl nem létezik.
+            ValueError: Ismeretlen vagy újabb formátumverzió esetén.
+        """
+        with np.load(path, allow_pickle=False) as data:
+            version = int(data["version"]) if "version" in data.files else 0
+            if version < 1 or version > FORMAT_VERSION:
+                raise ValueError(f"Ismeretlen modellformátum-verzió: {version} ({path})")
+            return cls(data["X"], data["labels"], data["classes"], int(data["k"]), str(data["weights"]),
+                       data["sample_weight"], data["offset"], data["scale"])
+
+    @property
+    def chunk(self) -> int:
+        """Kötegméret: legfeljebb `QUERY_CHUNK`, és a (köteg × n) mátrix `BLOCK_ELEMENTS` alatt marad."""
+        return max(1, min(QUERY_CHUNK, BLOCK_ELEMENTS // len(self.X)))
+
+    def _sq_dists(self, Q: np.ndarray) -> np.ndarray:
+        """(q, n) négyzetes távolságok, dimenziónként összegezve.
+
+        Nincs (q, n, d) közbülső tömb, és a ‖q‖² − 2q·x + ‖x‖² kifejtéssel szemben az
+        eredmény pontos (a különbségek négyzetösszege), így a holtversenyek nem függnek
+        kerekítéstől.
+        """
+        d2 = np.subtract.outer(Q[:, 0], self.X[:, 0])
+        np.square(d2, out=d2)
+        diff = np.empty_like(d2)
+        for j in range(1, self.X.shape[1]):
+            np.subtract.outer(Q[:, j], self.X[:, j], out=diff)
+            np.square(diff, out=diff)
+            d2 += diff
+        return d2
+
+    def _scores(self, Q: np.ndarray) -> np.ndarray:
+        """(q, osztályok) szavazatösszegek egy lekérdezés-kötegre."""
+        d2 = self._sq_dists(Q)
+        k = self.k
+        kth = np.partition(d2, k - 1, axis=1)[:, k - 1:k]
+        closer = d2 < kth
+        tied = d2 == kth
+        # a k-adik távolság holtversenyében a kisebb indexek töltik fel a k helyet
+        need = k - closer.sum(axis=1, keepdims=True)
+        chosen = closer | (tied & (np.cumsum(tied, axis=1) <= need))
+        if self.weights == "uniform":
+            return chosen.astype(np.float64) @ self._votes
+        exact = chosen & (d2 == 0)
+        has_exact = exact.any(axis=1, keepdims=True)
+        with np.errstate(divide="ignore"):
+            inv = np.where(chosen, 1.0 / np.sqrt(d2), 0.0)
+        w = np.where(has_exact, exact.astype(np.float64), inv)
+        return w @ self._votes
+
+    def tied_at_k(self, X: Any) -> np.ndarray:
+        """(n,) bool: True, ahol a k-adik és a (k+1)-edik szomszéd egyenlő távolságra van."""
+        if self.k >= len(self.X):
+            return np.zeros(len(X), dtype=bool)
+        Q = (np.asarray(X, dtype=np.float64).reshape(-1, self.X.shape[1]) - self.offset) / self.scale
+        out = []
+        chunk = self.chunk
+        for i in range(0, len(Q), chunk):
+            d2 = np.partition(self._sq_dists(Q[i:i + chunk]), (self.k - 1, self.k), axis=1)
+            out.append(d2[:, self.k - 1] == d2[:, self.k])
+        return np.concatenate(out) if out else np.zeros(0, dtype=bool)
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        """Osztályvalószínűségek (a szavazatok normalizálva), kötegelve."""
+        scores = self._batched_scores(X)
+        return scores / scores.sum(axis=1, keepdims=True)
+
+    def predict(self, X: Any) -> np.ndarray:
+        """Jóslat (n, d) lekérdezésekre; tetszőleges méretű köteg (`chunk`-onként)."""
+        return self.classes[np.argmax(self._batched_scores(X), axis=1)]
+
+    def predict_one(self, *features: float) -> Any:
+        """Egyetlen lekérdezés (pl. `predict_one(dx, dy)`) → osztálycímke."""
+        return self.predict(np.array([features], dtype=np.float64))[0]
+
+    def _batched_scores(self, X: Any) -> np.ndarray:
+        Q = (np.asarray(X, dtype=np.float64).reshape(-1, self.X.shape[1]) - self.offset) / self.scale
+        chunk = self.chunk
+        if len(Q) <= chunk:
+            return self._scores(Q)
+        return np.concatenate([self._scores(Q[i:i + chunk]) for i in range(0, len(Q), chunk)])
+
+    def size_bytes(self) -> int:
+        """A modelltömbök mérete bájtban."""
+        return int(self.X.nbytes + self.labels.nbytes + self.sample_weight.nbytes)
+
+
+def verify(model: Any, knn: NumpyKNN, extra_queries: int = 2000, seed: int = 0) -> Dict[str, int]:
+    """Az sklearn modell és a NumPy prediktor jóslatainak összevetése.
+
+    A lekérdezések: minden tanítópont, plusz `extra_queries` egyenletes véletlen pont a
+    tanítóadat befoglaló téglalapjában (egész koordinátákon is, ahol a holtversenyek gyakoriak).
+
+    Visszatérés:
+        Dict[str,int]: {"queries", "mismatches", "tie_mismatches"} – az utóbbi az eltérések
+            azon része, ahol a k-adik távolságnál holtverseny van (lásd a modul leírását).
+    """
+    X = knn.X * knn.scale + knn.offset
+    rng = np.random.default_rng(seed)
+    lo, hi = X.min(axis=0) - 10, X.max(axis=0) + 10
+    random_q = rng.uniform(lo, hi, size=(extra_queries, X.shape[1]))
+    queries = np.concatenate([X, random_q, np.round(random_q)])
+    ours = knn.predict(queries)
+    theirs = np.asarray(model.predict(queries))
+    differ = ours != theirs
+    ties = int(knn.tied_at_k(queries[differ]).sum()) if differ.any() else 0
+    return {"queries": len(queries), "mismatches": int(differ.sum()), "tie_mismatches": ties}
+
+
+def load_player_model(base: str = DEFAULT_MODEL_BASE) -> Any:
+    """A játék modelljének betöltése: `<base>.npz` (NumPy), ha van, különben `<base>.joblib`.
+
+    Visszatérés:
+        Any: `NumpyKNN` vagy sklearn modell (mindkettőnek van `predict`-je).
+
+    Kivétel dobása:
+        FileNotFoundError: Ha egyik fájl sincs meg.
+    """
+    npz = Path(base + ".npz")
+    if npz.exists():
+        return NumpyKNN.load(str(npz))
+    import joblib  # csak a régi formátumhoz kell (és ez húzza be az sklearn-t)
+    return joblib.load(base + ".joblib")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Parancssori belépési pont. A visszatérési érték a folyamat kilépési kódja."""
+    parser = argparse.ArgumentParser(description="KNN modell exportja sklearn-mentes .npz formátumba")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("export", help=".joblib -> .npz, egyezés-ellenőrzéssel")
+    p.add_argument("model", nargs="?", default=DEFAULT_MODEL_BASE + ".joblib")
+    p.add_argument("-o", "--output", default=None, help="alapértelmezés: a modell neve .npz-vel")
+    p = sub.add_parser("info", help="egy .npz modell adatai és betöltési/jóslási ideje")
+    p.add_argument("model", nargs="?", default=DEFAULT_MODEL_BASE + ".npz")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "export":
+        import joblib
+        t0 = time.perf_counter()
+        model = joblib.load(args.model)
+        sk_load_ms = (time.perf_counter() - t0) * 1000
+        knn = NumpyKNN.from_sklearn(model)
+        result = verify(model, knn)
+        if result["mismatches"]:
+            print(f"Hiba: {result['mismatches']}/{result['queries']} eltérő jóslat (ebből "
+                  f"{result['tie_mismatches']} k-adik távolságú holtverseny), az export elmarad; "
+                  f"tanítsd újra WeightedKNeighborsClassifier-rel (train_player_ai.py)")
+            return 1
+        output = args.output or str(Path(args.model).with_suffix(".npz"))
+        knn.save(output)
+        t0 = time.perf_counter()
+        NumpyKNN.load(output)
+        print(f"Mentve: {output} | {len(knn.X)} pont, k={knn.k}, {knn.weights} | "
+              f"egyezés: {result['queries']} lekérdezés, eltérés nélkül | "
+              f"betöltés: {sk_load_ms:.0f} ms (joblib) -> {(time.perf_counter() - t0) * 1000:.1f} ms (npz)")
+        return 0
+    t0 = time.perf_counter()
+    knn = NumpyKNN.load(args.model)
+    load_ms = (time.perf_counter() - t0) * 1000
+    t0 = time.perf_counter()
+    for _ in range(200):
+        knn.predict_one(0.0, -300.0)
+    per_call_us = (time.perf_counter() - t0) / 200 * 1e6
+    print(f"{args.model}: {len(knn.X)} pont, k={knn.k}, {knn.weights}, osztályok {knn.classes.tolist()} | "
+          f"{knn.size_bytes() / 1024:.1f} KiB | betöltés {load_ms:.1f} ms | jóslás {per_call_us:.0f} µs/döntés")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
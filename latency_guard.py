@@ -0,0 +1,167 @@
+"""Döntésenkénti késleltetés-őr az AI-hoz, automatikus szabály-alapú fallbackkel.
+
+Minden AI döntést (pl. `decide_action_ml`) megmér egy konfigurálható keret (budget)
+ellen. Ha a döntés túllépi a keretet, az adott frame-ben a szabály-alapú policy
+(`helper.decide_action`) eredményét használjuk. Ha több egymást követő döntés is
+túllépi, a modellt egy ideig ki sem hívjuk ("megszakító"), hogy ne fizessük
+újra és újra a késést. A mérésekből késleltetés-hisztogram és fallback-számlálók
+exportálhatók, hogy eldönthető legyen, biztonságos-e egy modellt élesíteni.
+"""
+
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from helper import Action
+
+# hisztogram vödrök felső határai ms-ban (Prometheus-szerű "le" határok)
+DEFAULT_BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0)
+
+
+class DecisionLatencyGuard:
+    """Az AI döntések időmérője és kerettúllépés esetén fallback-kapcsolója.
+
+    Attribútumok:
+        budget_ms (float): Egy döntés megengedett ideje ms-ban.
+        bucket_bounds_ms (Sequence[float]): Hisztogram vödrök felső határai.
+        bucket_counts (List[int]): Vödrönkénti darabszám (utolsó elem: +Inf).
+        decisions (int): Mért (ténylegesen lefutott) elsődleges döntések száma.
+        fallbacks (Dict[str,int]): Fallbackek oka szerint:
+            "over_budget" (túllépés), "no_decision" (a modell None-t adott),
+            "breaker" (a megszakító miatt a modell ki sem hívódott).
+    """
+
+    def __init__(self, budget_ms: float = 2.0,
+                 bucket_bounds_ms: Sequence[float] = DEFAULT_BUCKETS_MS,
+                 trip_after: int = 3, cooldown_decisions: int = 60) -> None:
+        """Inicializálja az őrt a kerettel és a megszakító beállításaival.
+
+        Paraméterek:
+            budget_ms (float): Döntésenkénti keret ms-ban.
+            bucket_bounds_ms (Sequence[float]): Növekvő vödörhatárok ms-ban.
+            trip_after (int): Ennyi egymást követő túllépés után nyit a megszakító.
+            cooldown_decisions (int): Nyitott megszakítónál ennyi döntésig csak a
+                fallback fut, utána újra próbálkozunk a modellel.
+
+        Kivétel dobása:
+            ValueError: Ha `budget_ms` nem pozitív.
+        """
+        if budget_ms <= 0:
+            raise ValueError("budget_ms-nek pozitívnak kell lennie")
+        self.budget_ms = budget_ms
+        self.bucket_bounds_ms = tuple(bucket_bounds_ms)
+        self.bucket_counts: List[int] = [0] * (len(self.bucket_bounds_ms) + 1)
+        self.trip_after = trip_after
+        self.cooldown_decisions = cooldown_decisions
+        self.decisions = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.fallbacks: Dict[str, int] = {"over_budget": 0, "no_decision": 0, "breaker": 0}
+        self._consecutive_over = 0
+        self._breaker_left = 0
+
+    def decide(self, primary: Callable[..., Optional[Action]],
+               fallback: Callable[[], Action], *args: Any) -> Action:
+        """Lefuttatja és megméri az elsődleges döntést; szükség esetén a fallbacket adja.
+
+        Paraméterek:
+            primary (Callable[..., Optional[Action]]): A mért döntés (pl. ML-alapú).
+            fallback (Callable[[], Action]): Szabály-alapú döntés.
+            *args: A `primary`-nak átadott argumentumok (így nem kell lépésenként új lezárást építeni).
+
+        Visszatérés:
+            Action: Az elsődleges döntés, ha időben elkészült és nem None; különben a fallback.
+        """
+        if self._breaker_left > 0:
+            self._breaker_left -= 1
+            self.fallbacks["breaker"] += 1
+            return fallback()
+
+        t0 = time.perf_counter()
+        action = primary(*args)
+        elapsed_ms = (time.perf_counter() - t0) * 1000.0
+        self.record(elapsed_ms)
+
+        if elapsed_ms > self.budget_ms:
+            self.fallbacks["over_budget"] += 1
+            self._consecutive_over += 1
+            if self._consecutive_over >= self.trip_after:
+                self._breaker_left = self.cooldown_decisions
+                self._consecutive_over = 0
+            return fallback()
+        self._consecutive_over = 0
+
+        if action is None:
+            self.fallbacks["no_decision"] += 1
+            return fallback()
+        return action
+
+    def record(self, elapsed_ms: float) -> None:
+        """Egy mért döntés idejének rögzítése a hisztogramba."""
+        self.decisions += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        for i, bound in enumerate(self.bucket_bounds_ms):
+            if elapsed_ms <= bound:
+                self.bucket_counts[i] += 1
+                return
+        self.bucket_counts[-1] += 1
+
+    def percentile_ms(self, q: float) -> float:
+        """A `q` kvantilis (0..1) becslése a hisztogramból (a vödör felső határa)."""
+        if self.decisions == 0:
+            return 0.0
+        target = q * self.decisions
+        seen = 0
+        for bound, count in zip(self.bucket_bounds_ms, self.bucket_counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return self.max_ms
+
+    def report(self) -> Dict[str, Any]:
+        """Összesítés: hisztogram, kvantilisek, fallback-számok és élesíthetőségi ítélet.
+
+        Visszatérés:
+            Dict[str,Any]: JSON-szerializálható riport. A "safe_to_ship" akkor True, ha a
+            p99 a kereten belül van és a túllépések aránya 1% alatti.
+        """
+        over_rate = self.fallbacks["over_budget"] / self.decisions if self.decisions else 0.0
+        p99 = self.percentile_ms(0.99)
+        cumulative = 0
+        histogram = []
+        for bound, count in zip(list(self.bucket_bounds_ms) + ["+Inf"], self.bucket_counts):
+            cumulative += count
+            histogram.append({"le": bound, "count": cumulative})
+        return {
+            "budget_ms": self.budget_ms,
+            "decisions": self.decisions,
+            "mean_ms": self.total_ms / self.decisions if self.decisions else 0.0,
+            "p50_ms": self.percentile_ms(0.50),
+            "p95_ms": self.percentile_ms(0.95),
+            "p99_ms": p99,
+            "max_ms": self.max_ms,
+            "fallbacks": dict(self.fallbacks),
+            "over_budget_rate": over_rate,
+            "histogram": histogram,
+            "safe_to_ship": self.decisions > 0 and p99 <= self.budget_ms and over_rate < 0.01,
+        }
+
+    def summary(self) -> str:
+        """Egysoros, konzolra szánt összefoglaló."""
+        r = self.report()
+        return (f"AI döntés: n={r['decisions']} | átlag {r['mean_ms']:.3f} ms | "
+                f"p95 ≤{r['p95_ms']} ms | p99 ≤{r['p99_ms']} ms | max {r['max_ms']:.2f} ms | "
+                f"fallback: {r['fallbacks']} | élesíthető: {'igen' if r['safe_to_ship'] else 'nem'}")
+
+    def export(self, path: str) -> None:
+        """A riport kiírása JSON fájlba.
+
+        Paraméterek:
+            path (str): Célfájl elérési útja.
+
+        Kivétel dobása:
+            OSError: Ha a fájl nem írható.
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
@@ -4,15 +4,39 @@
 # Ha abs(dx) <= 20 , elsőbbség a lövésé.
 # Mérd össze a pontszámot: hibrid vs tiszta ML módban (3–3 perc).
 
+import sqlite3
 import sys
+import argparse
+import random
+import time
 from typing import Tuple, List, Dict, Any, Optional
+import numpy as np
 import pygame
 from helper import *
-import joblib
-
-# --- ML modell betöltése (globálisan egyszer) ---
+import helper
+from timing import CpuMeter, FixedTimestep
+from collision import mask_for
+from latency_guard import DecisionLatencyGuard
+from decision_scheduler import DecisionScheduler
+from timers import TimerHeap
+from stress import StressMonitor, auto_grid, parse_grid
+from profiler import DEFAULT_PROFILE_DIR, PROFILE_MODES, SessionProfiler
+from gamestate import GameState
+from planner import LookaheadPlanner
+from capture import DEFAULT_QUEUE_SIZE, FrameRecorder
+from metrics import MetricsExporter, parse_address
+from results import DEFAULT_DB, ResultStore, SegmentTracker, git_revision
+from memprof import DEFAULT_INTERVAL_S, DEFAULT_LOG, MemoryProfiler
+from quality import AI_HOLD_LEVEL, QUALITY_MODES, QualityGovernor
+from tracing import DEFAULT_CAPACITY, DEFAULT_TRACE_PATH, Tracer, instrument
+from observation import DEFAULT_FACTOR, DEFAULT_STACK, PixelObserver, resolve_hook
+from knn_model import load_player_model
+import render
+
+# --- ML modell betöltése (globálisan egyszer; player_model.npz, ha van, különben .joblib) ---
+# Megjegyzés: a `decide_action_ml` döntése jelenleg nem hívja a modell `predict`-jét.
 try:
-    model = joblib.load("player_model.joblib")
+    model = load_player_model()
     model_loaded = True
     print("ML modell sikeresen betöltve.")
 except Exception as e:
@@ -20,10 +44,38 @@ except Exception as e:
     model = None
     model_loaded = False
 
-# --- Hibrid célzási küszöbök ---
-ALIGN_EPS = 15      # ennyin belül „pont középen vagyunk” -> lőhetünk
-FAR_X = 120         # ezen túl csak vízszint mozgás, nem lövünk
-ALIGN_EPS_BASE = 12  # minimális „találati folyosó” fél-szélesség px-ben
+# --- Kirajzolás ---
+MAX_RENDER_FPS = 240  # a kirajzolás felső korlátja (0 = korlátlan); a szimuláció ettől független SIM_HZ-n fut
+
+# --- Tétlenség / fókusz ---
+MENU_IDLE_TIMEOUT_MS = 1000     # a menü ennyi ideig blokkol eseményre várva (újrarajzolás csak inputra)
+GAME_OVER_HOLD_MS = 3000        # a GAME OVER képernyő ideje (billentyűvel átugorható)
+PAUSE_POLL_MS = 250             # szünetben ennyi ms-onként ébredünk eseményre várva
+UNFOCUSED_RENDER_FPS = 10       # "throttle" módban ennyi FPS-sel rajzolunk fókusz nélkül
+FOCUS_LOST_EVENTS = (pygame.WINDOWFOCUSLOST, pygame.WINDOWMINIMIZED)
+FOCUS_GAINED_EVENTS = (pygame.WINDOWFOCUSGAINED, pygame.WINDOWRESTORED)
+
+cpu_meter = CpuMeter()  # folyamat-CPU állapotonként (menü / játék / szünet / game over)
+_session_open = False   # fut-e játék, amelynek `_finish_session`-je kiírja a CPU-összesítést
+
+# --- AI módok ---
+# hybrid/ml: egy frame-es döntés (decide_action_ml + fallback); plan: előretekintő tervező (planner)
+AI_MODES = ("hybrid", "ml", "plan")
+
+# --- Profilozás ---
+PROFILE_HOTKEY = pygame.K_F9            # mérési ablak indítása/leállítása (--profile mellett)
+TRACE_HOTKEY = pygame.K_F10             # eseménynapló azonnali mentése (--trace mellett)
+DIFFICULTY_TAGS = ("easy", "normal", "hard")  # profil-címkék a nehézségi indexhez
+# Nehézségi szintenként: kezdő életek, kezdő ellenségszám, ellenség-sebességszorzó
+# (a `balance.py` paraméter-sweep ezeket írja felül)
+DIFFICULTY_SETTINGS: Tuple[Dict[str, Any], ...] = (
+    {"lives": 5, "enemy_count": 6, "speed_multiplier": 0.8},
+    {"lives": 3, "enemy_count": 8, "speed_multiplier": 1.0},
+    {"lives": 2, "enemy_count": 10, "speed_multiplier": 1.3},
+)
+
+# A hibrid célzási küszöbök (ALIGN_EPS, FAR_X, ALIGN_EPS_BASE) a helper modulban vannak,
+# mert a döntés-ütemező (decision_scheduler) is ezekhez igazodik.
 
 
 def decide_action_ml(player_rect: pygame.Rect,
@@ -47,7 +99,7 @@ def decide_action_ml(player_rect: pygame.Rect,
         enemies (List[Dict[str,Any]]): Ellenségek listája („rect”, „image” kulcsokkal).
         powerups (pygame.sprite.Group): Aktív power-up objektumok (pl. 'star').
         shoot_delay (int): Lövési késleltetés ms-ban (power-upokkal korrigálva).
-        last_shot_time (int): Az utolsó lövés ideje `pygame.time.get_ticks()`-ben.
+        last_shot_time (int): Az utolsó lövés ideje `game_ticks()`-ben.
 
     Visszatérés:
         Optional[Dict[str,Any]]: Akciószótár {"move": Optional[str], "shoot": bool}
@@ -68,7 +120,7 @@ def decide_action_ml(player_rect: pygame.Rect,
             action["move"] = "left"
         elif dx_star > 5:
             action["move"] = "right"
-        if abs(dx_star) <= align_eps_star and pygame.time.get_ticks() - last_shot_time > shoot_delay:
+        if abs(dx_star) <= align_eps_star and game_ticks() - last_shot_time > shoot_delay:
             action["shoot"] = True
         return action
 
@@ -98,7 +150,7 @@ def decide_action_ml(player_rect: pygame.Rect,
         return action
 
     # Itt már nagyjából középen vagyunk -> lövés, ha letelt a késleltetés
-    if pygame.time.get_ticks() - last_shot_time > shoot_delay:
+    if game_ticks() - last_shot_time > shoot_delay:
         action["shoot"] = True
         return action
 
@@ -129,15 +181,13 @@ def draw_ui(screen: pygame.Surface,
     Kivétel dobása:
         Nincs.
     """
-    font = pygame.font.SysFont(None, 36)
-    screen.blit(font.render(f"Level {level}", True, (255, 255, 255)), (10, 10))
-    screen.blit(font.render(f"Score: {score}", True, (255, 255, 255)), (WIDTH - 150, 10))
+    # a betűtípus és a (ritkán változó) feliratok gyorsítótárból jönnek
+    render.blit(screen, render.label(f"Level {level}", 36, (255, 255, 255)), (10, 10))
+    render.blit(screen, render.label(f"Score: {score}", 36, (255, 255, 255)), (WIDTH - 150, 10))
     mode_text = "AI Mód" if ai_mode else "Játékos Mód"
     mode_color = (0, 255, 0) if ai_mode else (255, 255, 0)
-    mode_surface = font.render(f"{mode_text} (M = váltás)", True, mode_color)
-    screen.blit(mode_surface, (10, HEIGHT - 40))
-    for i in range(lives):
-        screen.blit(heart_img, (10 + i * 34, 50))
+    render.blit(screen, render.label(f"{mode_text} (M = váltás)", 36, mode_color), (10, HEIGHT - 40))
+    render.blit_batch(screen, [(heart_img, (10 + i * 34, 50)) for i in range(lives)])
 
 
 def draw_game(screen: pygame.Surface,
@@ -153,6 +203,8 @@ def draw_game(screen: pygame.Surface,
               ai_mode: bool) -> None:
     """Kirajzolja a teljes jelenetet (háttér, lövedékek, ellenségek, power-upok, játékos, UI).
 
+    Rétegenként egy `blits` köteg megy ki (lásd `render`); a lövedék előre renderelt sprite.
+
     Paraméterek:
         screen (pygame.Surface): Célfelület.
         player_img (pygame.Surface): Játékos sprite.
@@ -172,13 +224,11 @@ def draw_game(screen: pygame.Surface,
     Kivétel dobása:
         Nincs.
     """
-    screen.fill((0, 0, 0))
-    for b in bullets:
-        pygame.draw.circle(screen, (255, 255, 255), b, 5)
-    for e in enemies:
-        screen.blit(e["image"], e["rect"])
-    powerups.draw(screen)
-    screen.blit(player_img, player_rect)
+    render.begin_frame(screen)
+    render.draw_bullets(screen, bullets)
+    render.draw_enemies(screen, enemies)
+    render.draw_group(screen, powerups)
+    render.blit(screen, player_img, player_rect)
     draw_ui(screen, level, lives, heart_img, score, ai_mode)
     pygame.display.flip()
 
@@ -195,13 +245,83 @@ def draw_game_over(screen: pygame.Surface) -> None:
         Nincs.
     """
     screen.fill((0, 0, 0))
-    font = pygame.font.SysFont(None, 72)
-    text = font.render("GAME OVER", True, (255, 0, 0))
+    text = render.label("GAME OVER", 72, (255, 0, 0))
     screen.blit(text, ((WIDTH - text.get_width()) // 2, HEIGHT // 2 - 40))
     pygame.display.flip()
 
 
-def initialize_game(difficulty_index: int
+def show_game_over(screen: pygame.Surface, hold_ms: int = GAME_OVER_HOLD_MS) -> None:
+    """GAME OVER képernyő `hold_ms` ideig, eseményvezérelten (nem `pygame.time.wait`).
+
+    Egyszer rajzol, utána eseményre vár: ablakbezárásra kilép, billentyűre azonnal visszatér.
+
+    Paraméterek:
+        screen (pygame.Surface): Célfelület.
+        hold_ms (int): Legfeljebb ennyi ideig marad kint a felirat.
+
+    Visszatérés:
+        None
+    """
+    cpu_meter.switch("game_over")
+    draw_game_over(screen)
+    deadline = pygame.time.get_ticks() + hold_ms
+    while True:
+        remaining = deadline - pygame.time.get_ticks()
+        if remaining <= 0:
+            return
+        event = pygame.event.wait(remaining)
+        if event.type == pygame.QUIT:
+            _quit()
+        elif event.type == pygame.KEYDOWN:
+            return
+
+
+def wait_for_focus(screen: pygame.Surface) -> bool:
+    """Szünet, amíg az ablak vissza nem kapja a fókuszt (alacsony CPU: blokkoló várakozás).
+
+    A képernyőre egyszer "SZÜNET" felirat kerül; közben sem szimuláció, sem kirajzolás nem fut.
+
+    Paraméterek:
+        screen (pygame.Surface): Célfelület (az utolsó kép marad alatta).
+
+    Visszatérés:
+        bool: True, ha a játékból ki kell lépni (ESC), különben False.
+    """
+    cpu_meter.switch("paused")
+    overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+    overlay.fill((0, 0, 0, 160))
+    screen.blit(overlay, (0, 0))
+    text = render.label("SZÜNET", 64, (255, 255, 255))
+    screen.blit(text, ((WIDTH - text.get_width()) // 2, HEIGHT // 2 - 32))
+    pygame.display.flip()
+    try:
+        while True:
+            event = pygame.event.wait(PAUSE_POLL_MS)
+            if event.type == pygame.QUIT:
+                _quit()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                return True
+            elif event.type in FOCUS_GAINED_EVENTS or (
+                    event.type == pygame.NOEVENT and pygame.key.get_focused()):
+                return False
+    finally:
+        cpu_meter.switch("game")
+
+
+def _quit() -> None:
+    """Kilépés a programból a CPU-összesítés kiírásával.
+
+    Játék közben (`_session_open`) az összesítést a `game_loop` `finally` ágában futó
+    `_finish_session` írja ki, itt csak a menüből/játékon kívülről kilépve.
+    """
+    if not _session_open:
+        print(cpu_meter.summary())
+    pygame.quit()
+    sys.exit()
+
+
+def initialize_game(difficulty_index: int, seed: Optional[int] = None, recolor: bool = True,
+                    grid: Optional[Tuple[int, int]] = None, enemy_count_override: Optional[int] = None
                     ) -> Tuple[pygame.Surface, pygame.Rect, List[Dict[str, Any]],
                                List[List[int]], List[Tuple[int, int]], Dict[str, Any],
                                pygame.Surface, pygame.sprite.Group, Dict[str, int],
@@ -210,6 +330,12 @@ def initialize_game(difficulty_index: int
 
     Paraméterek:
         difficulty_index (int): 0=Könnyű, 1=Normál, 2=Nehéz.
+        seed (Optional[int]): A játékpéldány véletlengenerátorának magja. Azonos mag
+            azonos ellenségkiosztást, -mozgást és power-up spawnolást ad (reprodukálható futás).
+        recolor (bool): False esetén az ellenség-sprite-ok nem színeződnek (headless futás).
+        grid (Optional[Tuple[int,int]]): Formációs rács (sorok, oszlopok); None esetén ROWS×COLS.
+        enemy_count_override (Optional[int]): Kezdő ellenségszám; None esetén a nehézség szerinti érték.
+            Legfeljebb sorok×oszlopok ellenség fér el.
 
     Visszatérés:
         Tuple:
@@ -218,7 +344,9 @@ def initialize_game(difficulty_index: int
             enemies (List[Dict])
             bullets (List[List[int]])
             all_positions (List[Tuple[int,int]])
-            level_data (Dict[str,Any]): {"level","enemy_count","last_shot_time","dx","enemy_img","speed_multiplier"}
+            level_data (Dict[str,Any]): {"level","enemy_count","last_shot_time","dx","enemy_img",
+                "speed_multiplier","rng","seed","recolor","recolor_frozen","timers","shot_ready","shot_gen",
+                "player_mask","pixel_collisions"}
             heart_img (Surface)
             powerups (pygame.sprite.Group)
             player_powerups (Dict[str,int]): aktiválási idők
@@ -231,25 +359,36 @@ def initialize_game(difficulty_index: int
     player_img, player_rect = load_player()
     enemy_img = load_enemy()
     heart_img = load_heart()
-    all_positions = generate_enemy_positions()
+    all_positions = generate_enemy_positions(*grid) if grid else generate_enemy_positions()
 
-    if difficulty_index == 0:
-        lives = 5; enemy_count = 6; speed_multiplier = 0.8
-    elif difficulty_index == 1:
-        lives = 3; enemy_count = 8; speed_multiplier = 1.0
-    else:
-        lives = 2; enemy_count = 10; speed_multiplier = 1.3
+    settings = DIFFICULTY_SETTINGS[min(difficulty_index, len(DIFFICULTY_SETTINGS) - 1)]
+    lives = settings["lives"]
+    enemy_count = settings["enemy_count"]
+    speed_multiplier = settings["speed_multiplier"]
+    if enemy_count_override is not None:
+        enemy_count = enemy_count_override
 
+    rng = np.random.default_rng(seed)
     level_data: Dict[str, Any] = {
         "level": 1,
         "enemy_count": enemy_count,
         "last_shot_time": 0,
         "dx": 2 * speed_multiplier,
         "enemy_img": enemy_img,
-        "speed_multiplier": speed_multiplier
+        "speed_multiplier": speed_multiplier,
+        "rng": rng,
+        "seed": seed,
+        "recolor": recolor,
+        "recolor_frozen": False,           # a minőség-szabályozó állítja (lásd `quality`)
+        "timers": TimerHeap(),
+        "player_mask": mask_for(player_img),   # pixelpontos ütközés (collision.py)
+        "pixel_collisions": True,
     }
+    # lövési készenlét: innentől a cooldown végét az időzítő jelzi
+    refresh_shot_cooldown(level_data, BASE_SHOOT_DELAY, game_ticks())
 
-    enemies = create_enemies(enemy_img, all_positions.copy(), enemy_count, speed_multiplier)
+    enemies = create_enemies(enemy_img, all_positions.copy(), enemy_count, speed_multiplier, rng,
+                             tint=recolor)
     bullets: List[List[int]] = []
     powerups = pygame.sprite.Group()
     player_powerups: Dict[str, int] = {}
@@ -261,13 +400,21 @@ def initialize_game(difficulty_index: int
 
 def game_loop(screen: pygame.Surface,
               clock: pygame.time.Clock,
-              difficulty_index: int) -> None:
+              difficulty_index: int,
+              opts: Optional[argparse.Namespace] = None) -> None:
     """Fő játékkör (game loop): eseménykezelés, AI/manuális vezérlés, frissítés, kirajzolás.
 
+    A szimuláció fix `SIM_HZ` ütemben lép (akkumulátoros ciklus), a kirajzolás
+    legfeljebb `MAX_RENDER_FPS`-sel fut. Ha egy frame lassú, több szimulációs lépés
+    fut le a következő kirajzolás előtt, így a játék nem lassul le. A szimulációs
+    és kirajzolási ráta az ablak címsorában látszik.
+
     Paraméterek:
         screen (pygame.Surface): Az alkalmazás fő kirajzolási felülete.
-        clock (pygame.time.Clock): FPS vezérléséhez szükséges óra.
+        clock (pygame.time.Clock): A valós frame-idő méréséhez és a kirajzolás korlátozásához.
         difficulty_index (int): Választott nehézség indexe (0..2).
+        opts (Optional[argparse.Namespace]): Parancssori beállítások (`parse_args`).
+            None esetén az alapértelmezések.
 
     Visszatérés:
         None
@@ -275,139 +422,438 @@ def game_loop(screen: pygame.Surface,
     Kivétel dobása:
         Nincs. Kilépéskor a függvény visszatér a hívóhoz.
     """
+    global _session_open
+    opts = opts if opts is not None else parse_args([])
+    # egy mag játékonként: ha nincs megadva, sorsolunk egyet és kiírjuk, hogy a futás megismételhető legyen
+    seed = opts.seed if opts.seed is not None else random.randrange(2 ** 32)
+    print(f"Játék magja (seed): {seed}")
+
+    # szimulációs óra: a valós időről indul, utána lépésenként halad
+    set_game_time(pygame.time.get_ticks())
+    stepper = FixedTimestep(SIM_HZ)
+    last_caption_update = 0
+    latency_guard = DecisionLatencyGuard(opts.ai_budget_ms)
+    scheduler = None if opts.no_decision_reuse else DecisionScheduler()
+    # formáció (stressz-mód): rács és kezdő ellenségszám a parancssorból
+    formation: Dict[str, Any] = {"enemy_count_override": opts.enemies}
+    if opts.grid is not None or opts.enemies is not None:
+        formation["grid"] = opts.grid or auto_grid(opts.enemies)
+    stress_monitor = StressMonitor() if opts.stress else None
+    # minőség-szabályozó: keret fölötti frame-eknél az elhagyható munka (színezés, HUD, AI) ritkul
+    quality = QualityGovernor(opts.frame_budget_ms, enabled=opts.quality == "auto",
+                              ai_hold=opts.quality_ai_hold)
+    frame_no = 0
+    last_action: Optional[Action] = None
+    held_steps = 0
+    profiler = None
+    if opts.profile:
+        profiler = SessionProfiler(opts.profile, opts.profile_dir,
+                                   tags={"difficulty": DIFFICULTY_TAGS[difficulty_index], "seed": seed})
+        if opts.profile_window:
+            print(f"Profilozás ({opts.profile}): F9 indítja/leállítja a mérési ablakot")
+        else:
+            profiler.start()
+
     (player_img, player_rect, enemies, bullets, all_positions, level_data, heart_img,
-     powerups, player_powerups, score, lives) = initialize_game(difficulty_index)
+     powerups, player_powerups, score, lives) = initialize_game(difficulty_index, seed, **formation)
+    hud = (level_data["level"], lives, score)   # a kijelzett értékek (`hud_every` frame-enként frissülnek)
 
     # --- mérőblokk inicializálása ---
-    use_hybrid = True                 # induljon hibridben
-    mode_timer_start = pygame.time.get_ticks()
-    scores = {"hybrid": None, "ml": None}
+    ai_modes: List[str] = opts.ai_modes   # 3 percenként ebben a sorrendben váltunk (alapból hibrid -> ML)
+    mode_index = 0
+    mode_timer_start = game_ticks()
+    scores: Dict[str, Optional[int]] = {m: None for m in ai_modes}
+    planner = LookaheadPlanner(opts.plan_budget_ms)
+    # képkocka-rögzítés: a kirajzolást a felvétel ütemére korlátozzuk, hogy a videó valós idejű legyen
+    recorder = None
+    render_fps = MAX_RENDER_FPS
+    if opts.capture:
+        recorder = FrameRecorder(opts.capture, opts.capture_every, opts.capture_fps, opts.capture_queue)
+        render_fps = min(MAX_RENDER_FPS, int(opts.capture_fps * opts.capture_every))
+        print(f"Felvétel ({recorder.mode}): {recorder.path}")
+    # eseménynapló: a helper fázisai csak bekapcsolva vannak becsomagolva
+    tracer = untrace = None
+    if opts.trace:
+        tracer = Tracer(opts.trace_capacity)
+        untrace = instrument(tracer, (helper, sys.modules[__name__]), detail=opts.trace_detail)
+        tr_tick, tr_step, tr_draw, tr_frame = (tracer.name_id(n) for n in ("clock.tick", "sim_step", "draw", "frame"))
+        print(f"Eseménynapló: {opts.trace} (F10: mentés most)")
+    memprof = None
+    if opts.memprof:
+        memprof = MemoryProfiler(opts.memprof, opts.memprof_interval)
+        memprof.start()
+        print(f"Memóriaprofil: {opts.memprof}")
+    metrics = None
+    if opts.metrics:
+        metrics = MetricsExporter(opts.metrics)
+        try:
+            print(f"Metrikák: {metrics.start()}")
+        except OSError as exc:
+            print(f"Figyelem: a metrika-végpont nem indult el ({exc}); metrikák nélkül folytatjuk")
+            metrics = None
+    # pixel-megfigyelés képről tanuló ágenseknek: a kirajzolt képernyő kicsinyített szürke nézete
+    observer = None
+    if opts.observe:
+        observer = PixelObserver(screen.get_size(), opts.observe_factor, opts.observe_stack,
+                                 resolve_hook(opts.observe_hook) if opts.observe_hook else None)
+        print(f"Pixel-megfigyelés: {observer.shape[1]}×{observer.shape[0]}, halmozás {observer.stack}")
+
+    # tartós eredménytár: minden lezárt AI szakasz (letelt idő / game over) bekerül
+    segment = SegmentTracker()
+    git_rev = None if opts.no_results else git_revision()
 
     ai_mode = False
     m_key_pressed = False
+    focused = True
 
     def _mode_key() -> str:
-        return "hybrid" if use_hybrid else "ml"
+        return ai_modes[mode_index]
 
-    while True:
-        # --- eseménykezelés ---
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
-            elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                return
-            elif event.type == pygame.KEYDOWN and ai_mode is False:
-                # billentyűnaplózás tanításhoz
-                debug_print(f"Key pressed: {event.key}, enemies count: {len(enemies)}")
-                center = closest_enemy_center(player_rect, enemies)
-                debug_print(f"Closest enemy center: {center}")
-                if center is not None:
-                    cx, cy = center
-                    dx = cx - player_rect.centerx
-                    dy = cy - player_rect.centery
-                    speed_multiplier = level_data["speed_multiplier"]
-                    enemy_count = len(enemies)
-                    if event.key == pygame.K_LEFT:
-                        debug_print("Logging LEFT action")
-                        log_example(dx, dy, 0, speed_multiplier, enemy_count)
-                    elif event.key == pygame.K_RIGHT:
-                        debug_print("Logging RIGHT action")
-                        log_example(dx, dy, 1, speed_multiplier, enemy_count)
-                    elif event.key == pygame.K_SPACE:
-                        debug_print("Logging SPACE action")
-                        log_example(dx, dy, 2, speed_multiplier, enemy_count)
-                else:
-                    debug_print("No enemies, skipping log_example")
-
-        # --- AI mód váltás (kézzel) ---
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_m] and not m_key_pressed:
-            ai_mode = not ai_mode
-            m_key_pressed = True
-            mode_timer_start = pygame.time.get_ticks()  # mérőóra nullázása
-            print(f"AI mode toggled: {ai_mode} | mód: {_mode_key()}")
-        elif not keys[pygame.K_m]:
-            m_key_pressed = False
-
-        # --- AI vezérlés vagy manuális ---
-        if ai_mode:
-            shoot_delay = update_shoot_delay(player_powerups)
-            ext_action = decide_action_ml(
-                player_rect, enemies, powerups,
-                shoot_delay,
-                level_data["last_shot_time"]
-            )
-            if ext_action is None:
-                # fallback a szabály-alapú logikára (helper.decide_action)
-                ext_action = decide_action(player_rect, enemies, powerups)
-
-            prev_lives = lives
-            lives, game_over, score = update_game_state(
-                None, player_rect, bullets, enemies, all_positions,
-                level_data, lives, score, powerups, player_powerups,
-                ai_mode=True, external_ai_action=ext_action
-            )
-
-            # Sorátlépés (enemy breach) külön ellenőrzése – ha még nem vettünk el életet
-            if not game_over and lives == prev_lives and enemy_breached_player_row(player_rect, enemies):
-                lives -= 1
-                if lives <= 0:
-                    # 3 perc előtt vége -> aktuális mód eredményének eltárolása és kiírása
-                    scores[_mode_key()] = score
-                    print("Végső eredmények (idő előtt):", scores)
-                    draw_game_over(screen); pygame.time.wait(3000); return
-                reset_level(player_rect, bullets, enemies, all_positions, level_data, same_level=True)
-
-            # --- 3 perces automatikus módváltás + teljes újrakezdés ---
-            elapsed = (pygame.time.get_ticks() - mode_timer_start) / 1000
-            if elapsed >= 180:
-                # elért pont mentése az aktuális módhoz
-                scores[_mode_key()] = score
-                print("Eddigi eredmények:", scores)
-
-                # következő módra váltunk (hibrid <-> tiszta ML) ÉS teljes reset a játék elejére
-                use_hybrid = not use_hybrid
-                mode_timer_start = pygame.time.get_ticks()
-                (player_img, player_rect, enemies, bullets, all_positions, level_data, heart_img,
-                 powerups, player_powerups, score, lives) = initialize_game(difficulty_index)
-                print(f"[Mérés] Új szakasz indul: mód = {_mode_key()} (játék teljesen újraindítva)")
+    def _record_segment(ended: str) -> None:
+        if git_rev is None or not ai_mode:
+            return
+        run = segment.finish(score, level_data["level"], stepper.sim.total, latency_guard, planner, ended)
+        if run["quality_max"] >= AI_HOLD_LEVEL:
+            # ritkított AI döntéssel mért szakasz nem vethető össze a többivel
+            print(f"[Mérés] A szakasz nem kerül mentésre: az AI döntés ritkítva volt ({_mode_key()})")
+            return
+        try:
+            store = ResultStore(opts.results_db)
+            try:
+                store.record(run, git_rev, DIFFICULTY_TAGS[difficulty_index], seed)
+            finally:
+                store.close()
+        except sqlite3.Error as exc:
+            print(f"Figyelem: a mérés nem menthető ({opts.results_db}): {exc}")
+
+    # AI döntés: egyszer definiálva, a lépésenkénti `shoot_delay` argumentumként érkezik
+    # (az állapotot hívásonként az aktuális változókból olvassák, új játék indítása után is)
+    def ml_decision(shoot_delay: int) -> Optional[Action]:
+        return decide_action_ml(player_rect, enemies, powerups, shoot_delay, level_data["last_shot_time"])
+
+    def rule_decision() -> Action:
+        return decide_action(player_rect, enemies, powerups)
+
+    def decide(shoot_delay: int) -> Action:
+        # mért döntés; kerettúllépés vagy None esetén szabály-alapú fallback (helper.decide_action)
+        return latency_guard.decide(ml_decision, rule_decision, shoot_delay)
+
+    _session_open = True
+    cpu_meter.switch("game")
+    clock.tick()  # a menüben eltelt idő ne kerüljön az akkumulátorba
+    try:
+        while True:
+            # --- eseménykezelés ---
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    _quit()
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    return
+                elif event.type in FOCUS_LOST_EVENTS:
+                    focused = False
+                elif event.type in FOCUS_GAINED_EVENTS:
+                    focused = True
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_p and ai_mode:
+                    # AI policy váltása kézzel (a 3 perces mérőóra újraindul)
+                    mode_index = (mode_index + 1) % len(ai_modes)
+                    scores.setdefault(_mode_key(), None)
+                    mode_timer_start = game_ticks()
+                    planner.reset()
+                    print(f"AI policy: {_mode_key()}")
+                elif event.type == pygame.KEYDOWN and event.key == TRACE_HOTKEY and tracer is not None:
+                    n = tracer.export_chrome(opts.trace, {"seed": seed, "level": level_data["level"]})
+                    print(f"Eseménynapló mentve: {opts.trace} ({n} esemény)")
+                elif event.type == pygame.KEYDOWN and event.key == PROFILE_HOTKEY and profiler is not None:
+                    saved = profiler.toggle()
+                    print(f"Profil mentve: {saved}.*" if saved else "Profilozás elindítva")
+                elif event.type == pygame.KEYDOWN and ai_mode is False:
+                    # billentyűnaplózás tanításhoz
+                    debug_print(f"Key pressed: {event.key}, enemies count: {len(enemies)}")
+                    center = closest_enemy_center(player_rect, enemies)
+                    debug_print(f"Closest enemy center: {center}")
+                    if center is not None:
+                        cx, cy = center
+                        dx = cx - player_rect.centerx
+                        dy = cy - player_rect.centery
+                        speed_multiplier = level_data["speed_multiplier"]
+                        enemy_count = len(enemies)
+                        if event.key == pygame.K_LEFT:
+                            debug_print("Logging LEFT action")
+                            log_example(dx, dy, 0, speed_multiplier, enemy_count)
+                        elif event.key == pygame.K_RIGHT:
+                            debug_print("Logging RIGHT action")
+                            log_example(dx, dy, 1, speed_multiplier, enemy_count)
+                        elif event.key == pygame.K_SPACE:
+                            debug_print("Logging SPACE action")
+                            log_example(dx, dy, 2, speed_multiplier, enemy_count)
+                    else:
+                        debug_print("No enemies, skipping log_example")
+
+            # --- fókuszvesztés: szünet (blokkoló várakozás) vagy visszafogott kirajzolás ---
+            if not focused and opts.unfocused == "pause":
+                if wait_for_focus(screen):
+                    return
+                focused = True
+                clock.tick()  # a szünet ideje ne kerüljön az akkumulátorba
+                continue
+
+            # --- AI mód váltás (kézzel) ---
+            keys = pygame.key.get_pressed()
+            if keys[pygame.K_m] and not m_key_pressed:
+                ai_mode = not ai_mode
+                m_key_pressed = True
+                mode_timer_start = game_ticks()  # mérőóra nullázása
+                segment.start(_mode_key(), stepper.sim.total, latency_guard, planner)
+                print(f"AI mode toggled: {ai_mode} | mód: {_mode_key()}")
+            elif not keys[pygame.K_m]:
+                m_key_pressed = False
+
+            # --- fix lépésközű szimuláció: annyi lépés, amennyi a valós időbe belefér ---
+            throttled = not focused and opts.unfocused == "throttle"
+            if tracer is not None:
+                t_tick = tracer.now()
+            frame_ms = clock.tick(min(render_fps, UNFOCUSED_RENDER_FPS) if throttled else render_fps)
+            work_start = time.perf_counter()
+            if tracer is not None:
+                tracer.span(tr_tick, t_tick)
+                t_frame = tracer.now()
+            q = quality.settings
+            # csak a lépésenkénti újraszínezés fagy be; az új szint ellenségei színezve születnek
+            level_data["recolor_frozen"] = not q.recolor
+            steps = stepper.begin_frame(frame_ms)
+            for _ in range(steps):
+                if tracer is not None:
+                    t_step = tracer.now()
+                # --- AI vezérlés vagy manuális ---
+                if ai_mode:
+                    shoot_delay = update_shoot_delay(player_powerups)
+                    if tracer is not None:
+                        t_decide = tracer.now()
+                    # túlterhelésnél az előző akció marad (ritkább döntés; a tervező saját keretet tart).
+                    # Csak --quality-ai-hold mellett; az így mért szakasz nem kerül az eredménytárba.
+                    hold = (q.ai_hold and last_action is not None and held_steps < q.ai_hold
+                            and _mode_key() != "plan")
+                    if hold:
+                        ext_action = last_action
+                        held_steps += 1
+                    elif _mode_key() == "plan":
+                        # előretekintő tervező: saját CPU-kerete és döntési pontjai vannak
+                        ext_action = planner.decide(
+                            player_rect, enemies, powerups, level_data["last_shot_time"], shoot_delay,
+                            lambda: GameState.capture(player_rect, enemies, bullets, all_positions,
+                                                      level_data, powerups, player_powerups, score, lives),
+                            get_game_time())
+                    elif scheduler is not None:
+                        # az előző akció marad, amíg a célpont/sáv/cooldown nem változik
+                        ext_action = scheduler.decide(player_rect, enemies, powerups, shoot_delay,
+                                                      level_data["last_shot_time"], decide, shoot_delay)
+                    else:
+                        ext_action = decide(shoot_delay)
+                    if not hold:
+                        last_action, held_steps = ext_action, 0
+                    if tracer is not None:
+                        tracer.span(tracer.name_id("ai." + _mode_key()), t_decide)
+
+                    prev_lives = lives
+                    lives, game_over, score = update_game_state(
+                        None, player_rect, bullets, enemies, all_positions,
+                        level_data, lives, score, powerups, player_powerups,
+                        ai_mode=True, external_ai_action=ext_action
+                    )
+
+                    # Sorátlépés (enemy breach) külön ellenőrzése – ha még nem vettünk el életet
+                    if not game_over and lives == prev_lives and enemy_breached_player_row(player_rect, enemies):
+                        lives -= 1
+                        if lives <= 0:
+                            # 3 perc előtt vége -> aktuális mód eredményének eltárolása és kiírása
+                            scores[_mode_key()] = score
+                            print("Végső eredmények (idő előtt):", scores)
+                            _record_segment("game_over")
+                            show_game_over(screen); return
+                        reset_level(player_rect, bullets, enemies, all_positions, level_data, same_level=True)
+
+                    # --- 3 perces automatikus módváltás + teljes újrakezdés ---
+                    elapsed = (game_ticks() - mode_timer_start) / 1000
+                    if elapsed >= 180:
+                        # elért pont mentése az aktuális módhoz
+                        scores[_mode_key()] = score
+                        print("Eddigi eredmények:", scores)
+                        _record_segment("timer")
+
+                        # következő módra váltunk (ai_modes sorrendjében) ÉS teljes reset a játék elejére
+                        mode_index = (mode_index + 1) % len(ai_modes)
+                        mode_timer_start = game_ticks()
+                        (player_img, player_rect, enemies, bullets, all_positions, level_data, heart_img,
+                         powerups, player_powerups, score, lives) = initialize_game(difficulty_index, seed, **formation)
+                        if scheduler is not None:
+                            scheduler.reset()
+                        planner.reset()
+                        segment.start(_mode_key(), stepper.sim.total, latency_guard, planner)
+                        print(f"[Mérés] Új szakasz indul: mód = {_mode_key()} (játék teljesen újraindítva)")
 
-        else:
-            # kézi irányítás
-            prev_lives = lives
-            lives, game_over, score = update_game_state(
-                keys, player_rect, bullets, enemies, all_positions,
-                level_data, lives, score, powerups, player_powerups, ai_mode=False
-            )
-            # Manuális módban is őrizzük meg a klasszikus „sorátlépés” szabályt
-            if not game_over and lives == prev_lives and enemy_breached_player_row(player_rect, enemies):
-                lives -= 1
+                else:
+                    # kézi irányítás
+                    prev_lives = lives
+                    lives, game_over, score = update_game_state(
+                        keys, player_rect, bullets, enemies, all_positions,
+                        level_data, lives, score, powerups, player_powerups, ai_mode=False
+                    )
+                    # Manuális módban is őrizzük meg a klasszikus „sorátlépés” szabályt
+                    if not game_over and lives == prev_lives and enemy_breached_player_row(player_rect, enemies):
+                        lives -= 1
+                        if lives <= 0:
+                            show_game_over(screen); return
+                        reset_level(player_rect, bullets, enemies, all_positions, level_data, same_level=True)
+
+                # --- Game Over kezelése (általános) ---
                 if lives <= 0:
-                    draw_game_over(screen); pygame.time.wait(3000); return
-                reset_level(player_rect, bullets, enemies, all_positions, level_data, same_level=True)
-
-        # --- Game Over kezelése (általános) ---
-        if lives <= 0:
+                    if ai_mode:
+                        # 3 perc előtt is rögzítjük az aktuális mód eredményét
+                        scores[_mode_key()] = score
+                        print("Végső eredmények:", scores)
+                        _record_segment("game_over")
+                    show_game_over(screen)
+                    return
+
+                advance_game_time(stepper.step_ms)
+                stepper.step_done()
+                if tracer is not None:
+                    tracer.span(tr_step, t_step)
+            if not steps:
+                # nem futott lépés (a render gyorsabb a szimulációnál): az állapot változatlan, és
+                # nincs interpoláció, így az újrarajzolás ugyanazt a képet adná -> kimarad
+                # (a megfigyelő sem kap ismételt kockát, a minőségvezérlő sem üres keretet).
+                # A felvétel viszont a render ütemére számol: a változatlan képet kapja.
+                if recorder is not None:
+                    recorder.capture(screen)
+                continue
+
+            # --- Kirajzolás (lépésenként legfeljebb egyszer; terhelés alatt kimaradhat) ---
+            if tracer is not None:
+                t_draw = tracer.now()
+            if frame_no % q.hud_every == 0:
+                hud = (level_data["level"], lives, score)
+            frame_no += 1
+            draw_game(screen, player_img, player_rect, enemies, bullets, powerups,
+                      hud[0], hud[1], heart_img, hud[2], ai_mode)
+            if tracer is not None:
+                tracer.span(tr_draw, t_draw)
+            stepper.frame_rendered()
+            if observer is not None:
+                observer.observe(screen)
+            if recorder is not None:
+                recorder.capture(screen)
+            if profiler is not None:
+                profiler.observe(level_data["level"], _mode_key() if ai_mode else "manual")
+            if memprof is not None:
+                memprof.observe(level_data["level"])
+            if metrics is not None:
+                metrics.observe_frame(frame_ms)
+                metrics.publish(
+                    latency_guard.decisions + latency_guard.fallbacks["breaker"] + planner.plans,
+                    latency_guard.fallbacks, _mode_key() if ai_mode else "manual",
+                    fps=stepper.render.rate, sim_steps_per_second=stepper.sim.rate,
+                    enemies_alive=len(enemies), bullets_alive=len(bullets), level=level_data["level"],
+                    score=score, lives=lives, ai_enabled=int(ai_mode), quality_level=quality.level,
+                    quality_transitions_total=sum(quality.transitions.values()))
+            work_ms = (time.perf_counter() - work_start) * 1000.0
+            if tracer is not None:
+                tracer.span(tr_frame, t_frame, len(enemies))
+            quality.frame(work_ms)
             if ai_mode:
-                # 3 perc előtt is rögzítjük az aktuális mód eredményét
-                scores[_mode_key()] = score
-                print("Végső eredmények:", scores)
-            draw_game_over(screen)
-            pygame.time.wait(3000)
-            return
+                segment.frame(work_ms, quality.level)
+            if stress_monitor is not None:
+                stress_monitor.frame(work_ms)
+                stress_monitor.maybe_report(len(enemies), stepper.sim.rate)
+
+            now = pygame.time.get_ticks()
+            if now - last_caption_update >= 1000:
+                caption = f"Space Invaders – {stepper.summary()} | CPU {cpu_meter.sample():.0f}%"
+                if quality.level:
+                    caption += f" | minőség: {quality.settings.name}"
+                if ai_mode and _mode_key() == "plan":
+                    per_frame = planner.rollout_rate.rate / stepper.render.rate if stepper.render.rate else 0.0
+                    caption += f" | terv {per_frame:.2f} rollout/frame"
+                elif ai_mode and scheduler is not None:
+                    caption += f" | AI {scheduler.rate.rate:.0f} döntés/s"
+                pygame.display.set_caption(caption)
+                last_caption_update = now
+    finally:
+        if untrace is not None:
+            untrace()
+        if tracer is not None:
+            n = tracer.export_chrome(opts.trace, {"seed": seed, "level": level_data["level"]})
+            print(f"Eseménynapló mentve: {opts.trace} ({n} esemény, {tracer.written} rögzítve)")
+        _finish_session(latency_guard, scheduler, opts, profiler, planner, recorder, metrics, memprof, quality,
+                        observer)
+
+
+def _finish_session(latency_guard: DecisionLatencyGuard,
+                    scheduler: Optional[DecisionScheduler],
+                    opts: argparse.Namespace,
+                    profiler: Optional[SessionProfiler] = None,
+                    planner: Optional[LookaheadPlanner] = None,
+                    recorder: Optional[FrameRecorder] = None,
+                    metrics: Optional[MetricsExporter] = None,
+                    memprof: Optional[MemoryProfiler] = None,
+                    quality: Optional[QualityGovernor] = None,
+                    observer: Optional[PixelObserver] = None) -> None:
+    """Játék végi összesítések kiírása/exportja (bármilyen kilépési úton).
+
+    Paraméterek:
+        latency_guard (DecisionLatencyGuard): Az AI döntések időmérője.
+        scheduler (Optional[DecisionScheduler]): Döntés-ütemező (None, ha ki van kapcsolva).
+        opts (argparse.Namespace): Beállítások (`latency_report` útvonal).
+        profiler (Optional[SessionProfiler]): Futó mérési ablak esetén lezárjuk és mentjük.
+        planner (Optional[LookaheadPlanner]): Előretekintő tervező (ha tervezett, összesítjük).
+        recorder (Optional[FrameRecorder]): Képkocka-rögzítő; megvárjuk a kódolás végét.
+        metrics (Optional[MetricsExporter]): Metrika-végpont; leállítjuk.
+        memprof (Optional[MemoryProfiler]): Memóriaprofil; záró pillanatkép és összesítés.
+        quality (Optional[QualityGovernor]): Minőség-szabályozó (ha váltott szintet, összesítjük).
+        observer (Optional[PixelObserver]): Pixel-megfigyelő (megfigyelésszám és átlagidő).
 
-        # --- Kirajzolás ---
-        draw_game(screen, player_img, player_rect, enemies, bullets, powerups,
-                  level_data["level"], lives, heart_img, score, ai_mode)
-        clock.tick(60)
+    Visszatérés:
+        None
+    """
+    global _session_open
+    _session_open = False
+    cpu_meter.switch("menu")
+    print(cpu_meter.summary())
+    if recorder is not None:
+        recorder.close()
+        print(recorder.summary())
+    if metrics is not None:
+        metrics.close()
+    if memprof is not None:
+        print(memprof.stop())
+    if profiler is not None:
+        saved = profiler.stop()
+        if saved:
+            print(f"Profil mentve: {saved}.pstats / .collapsed / .json")
+    if observer is not None:
+        print(observer.summary())
+    if quality is not None and quality.level + quality.transitions["down"]:
+        print(quality.summary())
+    if scheduler is not None and scheduler.computed:
+        print(scheduler.summary())
+    if planner is not None and planner.plans:
+        print(planner.summary())
+    if latency_guard.decisions or any(latency_guard.fallbacks.values()):
+        print(latency_guard.summary())
+        if opts.latency_report:
+            latency_guard.export(opts.latency_report)
+            print(f"Késleltetés-riport mentve: {opts.latency_report}")
 
 
 def menu_loop(screen: pygame.Surface, clock: pygame.time.Clock) -> int:
     """Főmenü ciklus: elemválasztás és nehézség állítása.
 
+    Eseményvezérelt: csak bemenetre (vagy ablak-újrarajzolási eseményre) rajzol újra,
+    a feliratokat egyszer rendereli, tétlenül `pygame.event.wait`-ben alszik.
+
     Paraméterek:
         screen (pygame.Surface): Kijelző felülete.
-        clock (pygame.time.Clock): FPS kontroll.
+        clock (pygame.time.Clock): FPS kontroll (a menü nem használja, a hívó felülete miatt marad).
 
     Visszatérés:
         int: Kiválasztott nehézség indexe (0..2).
@@ -415,24 +861,35 @@ def menu_loop(screen: pygame.Surface, clock: pygame.time.Clock) -> int:
     Kivétel dobása:
         Nincs. Ablak bezárásakor a program kiléphet.
     """
+    cpu_meter.switch("menu")
     font = pygame.font.SysFont(None, 48)
     options = ["Indítás", "Nehézség: Normál", "Kilépés"]
     selected = 0
     difficulties = ["Könnyű", "Normál", "Nehéz"]
     difficulty_index = 1
+    labels: Dict[Tuple[str, Tuple[int, int, int]], pygame.Surface] = {}  # renderelt feliratok
+    dirty = True
 
     while True:
-        screen.fill((0, 0, 0))
-        for i, text in enumerate(options):
-            color = (255, 255, 0) if i == selected else (255, 255, 255)
-            label = font.render(text, True, color)
-            screen.blit(label, ((WIDTH - label.get_width()) // 2, 200 + i * 60))
-        pygame.display.flip()
-
-        for event in pygame.event.get():
+        if dirty:
+            screen.fill((0, 0, 0))
+            for i, text in enumerate(options):
+                color = (255, 255, 0) if i == selected else (255, 255, 255)
+                label = labels.get((text, color))
+                if label is None:
+                    label = labels[(text, color)] = font.render(text, True, color)
+                screen.blit(label, ((WIDTH - label.get_width()) // 2, 200 + i * 60))
+            pygame.display.flip()
+            dirty = False
+
+        # eseményre várunk (időkorláttal), nem pörgetjük a ciklust 60 FPS-sel
+        for event in [pygame.event.wait(MENU_IDLE_TIMEOUT_MS)] + pygame.event.get():
             if event.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
+                _quit()
+            elif event.type in (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED):
+                dirty = True
             elif event.type == pygame.KEYDOWN:
+                dirty = True
                 if event.key == pygame.K_DOWN:
                     selected = (selected + 1) % len(options)
                 elif event.key == pygame.K_UP:
@@ -444,17 +901,122 @@ def menu_loop(screen: pygame.Surface, clock: pygame.time.Clock) -> int:
                         difficulty_index = (difficulty_index + 1) % len(difficulties)
                         options[1] = f"Nehézség: {difficulties[difficulty_index]}"
                     elif selected == 2:
-                        pygame.quit(); sys.exit()
+                        _quit()
                 elif event.key == pygame.K_ESCAPE:
-                    pygame.quit(); sys.exit()
-        clock.tick(60)
+                    _quit()
+
+
+def _parse_metrics_address(text: str) -> str:
+    """A `--metrics` cím ellenőrzése (`metrics.parse_address`); a szöveget adja vissza."""
+    try:
+        parse_address(text)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc))
+    return text
+
+
+def _parse_ai_modes(text: str) -> List[str]:
+    """Vesszővel elválasztott AI mód lista ellenőrzése (`AI_MODES` elemei)."""
+    modes = [m.strip() for m in text.split(",") if m.strip()]
+    unknown = [m for m in modes if m not in AI_MODES]
+    if not modes or unknown:
+        raise argparse.ArgumentTypeError(f"ismeretlen AI mód: {', '.join(unknown) or text!r} "
+                                         f"(ismert: {', '.join(AI_MODES)})")
+    return modes
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Feldolgozza a parancssori kapcsolókat.
+
+    Paraméterek:
+        argv (Optional[List[str]]): Argumentumlista; None esetén `sys.argv[1:]`.
+
+    Visszatérés:
+        argparse.Namespace: A beállítások (pl. `seed`).
+    """
+    parser = argparse.ArgumentParser(description="Space Invaders – Pygame + Hibrid/ML AI")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="a játékpéldány véletlengenerátorának magja (reprodukálható futás)")
+    parser.add_argument("--ai-budget-ms", type=float, default=2.0,
+                        help="AI döntésenkénti időkeret ms-ban; túllépéskor szabály-alapú fallback")
+    parser.add_argument("--latency-report", default=None, metavar="PATH",
+                        help="játék végén ide menti a döntési késleltetés-hisztogramot (JSON)")
+    parser.add_argument("--no-decision-reuse", action="store_true",
+                        help="minden lépésben új AI döntés (a döntés-ütemező kikapcsolása)")
+    parser.add_argument("--ai-modes", type=_parse_ai_modes, default=["hybrid", "ml"],
+                        metavar="MÓD[,MÓD...]",
+                        help=f"AI policyk a 3 perces összevetéshez, sorrendben ({', '.join(AI_MODES)}); "
+                             "AI módban a P gomb vált köztük")
+    parser.add_argument("--plan-budget-ms", type=float, default=4.0,
+                        help="az előretekintő tervező CPU-kerete tervezésenként ms-ban")
+    parser.add_argument("--results-db", default=DEFAULT_DB, metavar="PATH",
+                        help="SQLite eredménytár az AI mérési szakaszokhoz (riport: python results.py report)")
+    parser.add_argument("--no-results", action="store_true",
+                        help="a mérési szakaszok ne kerüljenek az eredménytárba")
+    parser.add_argument("--stress", action="store_true",
+                        help="stressz-mód: másodpercenként frame-idő, lépés/s és memória riport")
+    parser.add_argument("--grid", type=parse_grid, default=None, metavar="SORxOSZLOP",
+                        help="ellenség-formáció rácsa (pl. 20x40); alapból 4x5, --enemies mellett automatikus")
+    parser.add_argument("--enemies", type=int, default=None,
+                        help="kezdő ellenségszám (akár több ezer; a rácsba kell férnie)")
+    parser.add_argument("--unfocused", choices=("pause", "throttle", "run"), default="pause",
+                        help="fókuszvesztéskor: szünet (alapértelmezett), visszafogott kirajzolás "
+                             f"({UNFOCUSED_RENDER_FPS} FPS, a szimuláció fut), vagy változatlan futás")
+    parser.add_argument("--capture", default=None, metavar="PATH",
+                        help="képkocka-rögzítés: videófájl (.mp4/.mkv/..., ffmpeg kell) vagy könyvtár (PNG-sorozat)")
+    parser.add_argument("--capture-every", type=int, default=1, metavar="N",
+                        help="csak minden N-edik kirajzolt frame rögzítése")
+    parser.add_argument("--capture-fps", type=float, default=30.0,
+                        help="a felvétel képkockasebessége (a kirajzolás erre × N-re korlátozódik)")
+    parser.add_argument("--capture-queue", type=int, default=DEFAULT_QUEUE_SIZE, metavar="N",
+                        help="a kódolásra váró kockák sorának mérete; teli sornál a kocka eldobódik")
+    parser.add_argument("--metrics", type=_parse_metrics_address, default=None, metavar="CÍM",
+                        help="Prometheus metrika-végpont: PORT, HOST:PORT vagy unix:ÚTVONAL "
+                             "(alapból csak 127.0.0.1-en)")
+    parser.add_argument("--profile", nargs="?", const="cprofile", default=None, choices=PROFILE_MODES,
+                        help="játékmenet profilozása: cprofile (alapértelmezett) vagy sample (mintavételező)")
+    parser.add_argument("--profile-window", action="store_true",
+                        help="a profilozás csak F9-re indul/áll le (több ablak is menthető)")
+    parser.add_argument("--profile-dir", default=DEFAULT_PROFILE_DIR,
+                        help="a .pstats / .collapsed / .json kimenetek könyvtára")
+    parser.add_argument("--trace", nargs="?", const=DEFAULT_TRACE_PATH, default=None, metavar="PATH",
+                        help="eseménynapló (szakaszok és események gyűrűpufferben) Chrome trace JSON-ba; "
+                             f"F10-re és kilépéskor ment (alapértelmezett: {DEFAULT_TRACE_PATH})")
+    parser.add_argument("--trace-capacity", type=int, default=DEFAULT_CAPACITY, metavar="N",
+                        help="a gyűrűpuffer mérete rekordokban (a legrégebbiek felülíródnak)")
+    parser.add_argument("--trace-detail", action="store_true",
+                        help="az olcsó fázisok (időzítők, játékos- és lövedékmozgás, power-up "
+                             "megjelenés) is a naplóba kerülnek (nagyobb overhead)")
+    parser.add_argument("--quality", choices=QUALITY_MODES, default="auto",
+                        help="adaptív minőség: keret fölötti frame-eknél a színezés és a HUD ritkul "
+                             "(off: mindig teljes minőség; az AI döntéshez lásd --quality-ai-hold)")
+    parser.add_argument("--frame-budget-ms", type=float, default=SIM_STEP_MS, metavar="MS",
+                        help="a minőség-szabályozó frame-kerete (várakozás nélküli munkaidő)")
+    parser.add_argument("--quality-ai-hold", action="store_true",
+                        help="a minőség-szabályozó legalsó szintje az AI döntést is ritkítja; az ilyen "
+                             "mérési szakaszok nem kerülnek az eredménytárba")
+    parser.add_argument("--memprof", nargs="?", const=DEFAULT_LOG, default=None, metavar="PATH",
+                        help="memóriaprofil (tracemalloc): pillanatkép szintváltáskor és időközönként, "
+                             f"allokációs hot-spotok ide (alapértelmezett: {DEFAULT_LOG})")
+    parser.add_argument("--memprof-interval", type=float, default=DEFAULT_INTERVAL_S, metavar="SEC",
+                        help="időközi memória-pillanatképek távolsága (0 = csak szintváltáskor)")
+    parser.add_argument("--observe", action="store_true",
+                        help="pixel-megfigyelés: minden kirajzolt frame kicsinyített szürkeárnyalatos "
+                             "NumPy nézete (másolat nélkül), képhalmozással")
+    parser.add_argument("--observe-factor", type=int, default=DEFAULT_FACTOR, metavar="F",
+                        help="mintavételi lépésköz (800×600 / F)")
+    parser.add_argument("--observe-stack", type=int, default=DEFAULT_STACK, metavar="K",
+                        help="halmozott kockák száma (gyűrűpuffer)")
+    parser.add_argument("--observe-hook", default=None, metavar="MODUL:FÜGGVÉNY",
+                        help="fogyasztó, amely minden megfigyeléskor megkapja a (K, sor, oszlop) uint8 tömböt")
+    return parser.parse_args(argv)
 
 
 def main() -> None:
     """Belépési pont: Pygame inicializálása, főmenü és játék indítása.
 
     Paraméterek:
-        Nincs.
+        Nincs. A kapcsolókat lásd: `parse_args`.
 
     Visszatérés:
         None
@@ -462,6 +1024,7 @@ def main() -> None:
     Kivétel dobása:
         Nincs. A függvény a program fő ciklusát futtatja, amíg a felhasználó ki nem lép.
     """
+    opts = parse_args()
     pygame.init()
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Space Invaders")
@@ -469,7 +1032,7 @@ def main() -> None:
 
     while True:
         difficulty_index = menu_loop(screen, clock)
-        game_loop(screen, clock, difficulty_index)
+        game_loop(screen, clock, difficulty_index, opts)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,265 @@
+"""Memória-profilozás: `tracemalloc` pillanatképek szintváltáskor és időközönként, allokációs hot-spotokkal.
+
+Hosszú AI futásoknál lassan kúszó memóriahasználat felderítésére. Két használat:
+
+    python main.py --memprof [memprof.log] [--memprof-interval 60]
+        A játék minden szintváltáskor és `--memprof-interval` másodpercenként pillanatképet
+        vesz; a naplóba az előző pillanatképhez képesti legnagyobb növekedésű allokációs
+        helyek, a Python-heap és az RSS szintenkénti csúcsa kerül.
+
+    python memprof.py --steps 50000 --max-growth-mb 4 [--recolor] [--log memprof.log]
+        Headless "soak" teszt szabály-alapú AI-jal (játék vége után új játék indul). A
+        bemelegítés (`--warmup-steps`, gyorsítótárak feltöltése) utáni növekedés, ha
+        meghaladja a küszöböt, 1-es kilépési kóddal hibát jelez.
+
+A `tracemalloc` csak a Python-allokációkat követi; a pygame Surface-ek pixelpuffere SDL-ben
+van. Ezért minden pillanatkép egy Surface-összeírást is tartalmaz (élő Surface-ek száma és
+pixelmemóriája). A `tracemalloc` a futást érezhetően lassítja, ezért csak kérésre fut.
+"""
+
+import argparse
+import gc
+import linecache
+import os
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional, TextIO, Tuple
+
+import pygame
+
+from helper import SIM_STEP_MS
+from stress import current_rss_mb
+
+DEFAULT_LOG = "memprof.log"
+DEFAULT_INTERVAL_S = 60.0
+TOP_SITES = 15             # ennyi allokációs helyet naplózunk pillanatképenként
+TRACE_FRAMES = 1           # a `tracemalloc` ennyi keretet tárol allokációnként (több = lassabb)
+RSS_SAMPLE_S = 0.25        # az RSS mintavételezési ideje (a szintenkénti csúcshoz)
+
+# a profilozó saját és az importrendszer allokációi nem érdekesek
+_IGNORED = (tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, linecache.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            tracemalloc.Filter(False, "<unknown>"))
+
+
+def surface_census() -> Tuple[int, int]:
+    """Élő pygame Surface-ek száma és pixelmemóriája bájtban.
+
+    A Surface-eket a szemétgyűjtő nem követi (és a csak ilyeneket tartalmazó dicteket,
+    pl. az ellenség-szótárakat sem), ezért a követett objektumokból kiindulva a nem követett
+    tárolókba is lemegyünk. Csak pillanatképkor hívjuk (tized-másodperc nagyságrend).
+    """
+    seen: Dict[int, int] = {}
+    visited = set()
+    layer = gc.get_objects()
+    while layer:
+        nested = []
+        for obj in gc.get_referents(*layer):
+            kind = type(obj)
+            if kind is dict or kind is list or kind is tuple:
+                if not gc.is_tracked(obj) and id(obj) not in visited:
+                    visited.add(id(obj))
+                    nested.append(obj)
+            elif isinstance(obj, pygame.Surface) and id(obj) not in seen:
+                seen[id(obj)] = obj.get_pitch() * obj.get_height()
+        layer = nested
+    return len(seen), sum(seen.values())
+
+
+class MemoryProfiler:
+    """Pillanatkép-alapú memórianapló szintenkénti csúcsokkal.
+
+    Attribútumok:
+        path (str): A napló fájl.
+        interval_s (float): Időközi pillanatképek távolsága (másodperc; 0 = csak szintváltáskor).
+        checkpoints (int): Eddig vett pillanatképek.
+        level_peaks (Dict[int,Dict[str,float]]): Szintenként {"rss_mb", "heap_mb"} csúcs.
+    """
+
+    def __init__(self, path: str = DEFAULT_LOG, interval_s: float = DEFAULT_INTERVAL_S,
+                 top: int = TOP_SITES, frames: int = TRACE_FRAMES) -> None:
+        self.path = path
+        self.interval_s = interval_s
+        self.top = top
+        self.frames = frames
+        self.checkpoints = 0
+        self.level_peaks: Dict[int, Dict[str, float]] = {}
+        self._log: Optional[TextIO] = None
+        self._previous: Optional[tracemalloc.Snapshot] = None
+        self._baseline_bytes: Optional[int] = None
+        self._level: Optional[int] = None
+        self._last_checkpoint = 0.0
+        self._last_rss_sample = 0.0
+        self._started_tracing = False
+
+    def start(self, now: Optional[float] = None) -> None:
+        """A követés indítása és a napló megnyitása (a fájl felülíródik)."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        self._log = open(self.path, "w", encoding="utf-8")
+        self._log.write(f"# memóriaprofil | pid {os.getpid()} | időköz {self.interval_s:g} s | "
+                        f"top {self.top} | {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        self._last_checkpoint = time.perf_counter() if now is None else now
+
+    def observe(self, level: int, now: Optional[float] = None) -> None:
+        """Frame-enkénti (vagy lépésenkénti) hívás: szintváltáskor és időközönként pillanatkép.
+
+        Paraméterek:
+            level (int): Aktuális szint.
+            now (Optional[float]): Idő másodpercben (None: valós idő); headless futásnál a
+                játékidő adható meg, így az időközök determinisztikusak.
+        """
+        now = time.perf_counter() if now is None else now
+        if level != self._level:
+            self.checkpoint(level, "szintváltás" if self._level is not None else "kezdés", now)
+        elif self.interval_s and now - self._last_checkpoint >= self.interval_s:
+            self.checkpoint(level, "időköz", now)
+        elif now - self._last_rss_sample >= RSS_SAMPLE_S:
+            self._sample_peaks(level, now)
+
+    def _sample_peaks(self, level: int, now: float) -> None:
+        self._last_rss_sample = now
+        peaks = self.level_peaks.setdefault(level, {"rss_mb": 0.0, "heap_mb": 0.0})
+        peaks["rss_mb"] = max(peaks["rss_mb"], current_rss_mb())
+        peaks["heap_mb"] = max(peaks["heap_mb"], tracemalloc.get_traced_memory()[1] / 2 ** 20)
+
+    def checkpoint(self, level: int, reason: str, now: Optional[float] = None) -> None:
+        """Pillanatkép, diff az előzőhöz, napló-bejegyzés.
+
+        Paraméterek:
+            level (int): Aktuális szint.
+            reason (str): A bejegyzés oka ("szintváltás", "időköz", ...).
+            now (Optional[float]): Idő másodpercben (lásd `observe`).
+        """
+        now = time.perf_counter() if now is None else now
+        # a lezáruló szint csúcsa a pillanatkép előtt (a heap-csúcsot szintenként nullázzuk)
+        self._sample_peaks(self._level if self._level is not None else level, now)
+        snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+        current = sum(stat.size for stat in snapshot.statistics("filename"))
+        if self._baseline_bytes is None:
+            self._baseline_bytes = current
+        surfaces, surface_bytes = surface_census()
+        lines = [f"\n== #{self.checkpoints} {reason} | szint {level} | heap {current / 2 ** 20:.2f} MB "
+                 f"({(current - self._baseline_bytes) / 2 ** 20:+.2f} MB az alaphoz) | "
+                 f"Surface {surfaces} db, {surface_bytes / 2 ** 20:.2f} MB | RSS {current_rss_mb():.1f} MB"]
+        if self._previous is not None:
+            diff = [s for s in snapshot.compare_to(self._previous, "lineno") if s.size_diff]
+            diff.sort(key=lambda s: s.size_diff, reverse=True)
+            lines += [f"  {s.size_diff / 1024:+10.1f} KiB {s.count_diff:+7d} blokk  {s.traceback.format()[0].strip()}"
+                      for s in diff[:self.top]]
+        if reason == "szintváltás" and self._level in self.level_peaks:
+            peaks = self.level_peaks[self._level]
+            lines.append(f"  szint {self._level} csúcs: RSS {peaks['rss_mb']:.1f} MB, heap {peaks['heap_mb']:.2f} MB")
+        if self._log is not None:
+            self._log.write("\n".join(lines) + "\n")
+            self._log.flush()
+        tracemalloc.reset_peak()
+        self._previous = snapshot
+        self._level = level
+        self._last_checkpoint = now
+        self.checkpoints += 1
+
+    def rebase(self) -> None:
+        """A növekedés alapjának áthelyezése a következő pillanatképre (pl. bemelegítés után)."""
+        self._baseline_bytes = None
+
+    def growth_mb(self) -> float:
+        """A legutóbbi pillanatkép heap-mérete az alaphoz képest, MB-ban."""
+        if self._previous is None or self._baseline_bytes is None:
+            return 0.0
+        current = sum(stat.size for stat in self._previous.statistics("filename"))
+        return (current - self._baseline_bytes) / 2 ** 20
+
+    def summary(self) -> str:
+        """Szintenkénti csúcsok és a teljes növekedés egy sorban."""
+        levels = ", ".join(f"{lvl}: {p['rss_mb']:.0f} MB" for lvl, p in sorted(self.level_peaks.items()))
+        return (f"Memóriaprofil: {self.checkpoints} pillanatkép, heap-növekedés {self.growth_mb():+.2f} MB | "
+                f"RSS-csúcs szintenként: {levels or '-'} | napló: {self.path}")
+
+    def stop(self) -> str:
+        """Záró pillanatkép, összesítés a naplóba; a követés leáll (ha mi indítottuk)."""
+        if self._log is None:
+            return self.summary()
+        self.checkpoint(self._level if self._level is not None else 0, "vége")
+        text = self.summary()
+        self._log.write(f"\n# {text}\n")
+        self._log.close()
+        self._log = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        return text
+
+
+def soak(steps: int, warmup_steps: int, interval_s: float, log_path: str, recolor: bool = False,
+         seed: int = 0, difficulty_index: int = 1) -> MemoryProfiler:
+    """Headless soak-futás a szabály-alapú AI-jal, memóriaprofillal.
+
+    Játék vége után azonos nehézséggel, következő maggal új játék indul, így a futás
+    sok szintváltáson és újraindításon megy át. Az időközök játékidőben értendők.
+
+    Paraméterek:
+        steps (int): Mért szimulációs lépések (a bemelegítésen felül).
+        warmup_steps (int): Bemelegítő lépések; utánuk áll be a növekedés alapja.
+        interval_s (float): Időközi pillanatképek távolsága játékidőben.
+        log_path (str): Napló fájl.
+        recolor (bool): Sprite-színezés (a kirajzolt játék allokációi).
+        seed (int): Az első játék magja.
+        difficulty_index (int): Nehézség.
+
+    Visszatérés:
+        MemoryProfiler: A lezárt profilozó (`growth_mb`, `level_peaks`).
+    """
+    from headless import HeadlessGame, rule_policy
+
+    profiler = MemoryProfiler(log_path, interval_s)
+    game = HeadlessGame(difficulty_index, seed, recolor=recolor)
+    games = 1
+    clock_s = 0.0
+    profiler.start(clock_s)
+    for i in range(warmup_steps + steps):
+        if i == warmup_steps:
+            profiler.rebase()
+            profiler.checkpoint(game.level_data["level"], "bemelegítés vége", clock_s)
+        if game.step(rule_policy(game)):
+            game = HeadlessGame(difficulty_index, seed + games, recolor=recolor)
+            games += 1
+        clock_s += SIM_STEP_MS / 1000.0
+        profiler.observe(game.level_data["level"], clock_s)
+    profiler.stop()
+    print(f"{games} játék, {warmup_steps} + {steps} lépés")
+    return profiler
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Parancssori belépési pont. A visszatérési érték a folyamat kilépési kódja."""
+    parser = argparse.ArgumentParser(description="Headless memória soak-teszt tracemalloc-kal")
+    parser.add_argument("--steps", type=int, default=50000, help="mért lépések (bemelegítésen felül)")
+    parser.add_argument("--warmup-steps", type=int, default=3000)
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL_S,
+                        help="időközi pillanatkép játékidő-másodpercenként (0 = csak szintváltáskor)")
+    parser.add_argument("--max-growth-mb", type=float, default=4.0,
+                        help="ennél nagyobb heap-növekedés a bemelegítés után hibának számít")
+    parser.add_argument("--recolor", action="store_true", help="sprite-színezés bekapcsolva")
+    parser.add_argument("--log", default=DEFAULT_LOG)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--difficulty", type=int, choices=(0, 1, 2), default=1)
+    args = parser.parse_args(argv)
+
+    profiler = soak(args.steps, args.warmup_steps, args.interval, args.log, args.recolor,
+                    args.seed, args.difficulty)
+    print(profiler.summary())
+    growth = profiler.growth_mb()
+    if growth > args.max_growth_mb:
+        print(f"HIBA: a heap {growth:.2f} MB-tal nőtt (küszöb: {args.max_growth_mb:g} MB)")
+        return 1
+    print(f"OK: heap-növekedés {growth:+.2f} MB (küszöb: {args.max_growth_mb:g} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
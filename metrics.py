@@ -0,0 +1,237 @@
+"""Helyi metrika-végpont (Prometheus szöveges formátum) hosszan futó AI példányokhoz.
+
+    python main.py --metrics 9464                # http://127.0.0.1:9464/metrics
+    python main.py --metrics 0.0.0.0:9464        # minden interfészen
+    python main.py --metrics unix:/tmp/si.sock   # Unix socket (curl --unix-socket ...)
+
+A játékkör frame-enként csak egy előre összerakott pillanatképet tesz közzé (egyetlen
+attribútum-értékadás, zár nélkül); a szöveges kimenetet a háttérben futó HTTP-szerver
+szála állítja elő lekérdezéskor. Így egy lassú vagy beragadt scraper sem lassítja a
+kirajzolást.
+
+Exportált értékek: FPS, szimulációs lépés/s, frame-idő hisztogram, AI döntés/s és
+összesen, fallbackek oka szerint, élő ellenségek és lövedékek, szint, pont, életek, AI mód.
+"""
+
+import os
+import stat
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from timing import RateCounter
+
+DEFAULT_HOST = "127.0.0.1"
+# frame-idő vödrök felső határai ms-ban (60 FPS = 16.7 ms)
+FRAME_BUCKETS_MS = (2.0, 4.0, 8.0, 12.0, 16.7, 20.0, 25.0, 33.3, 50.0, 100.0, 250.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+PREFIX = "spaceinvaders_"
+
+# (név, típus, leírás) – a `publish` kulcsai; a sorrend a kimenet sorrendje
+_SCALARS: Tuple[Tuple[str, str, str], ...] = (
+    ("fps", "gauge", "Kirajzolt frame/s (utolsó 1 s ablak)."),
+    ("sim_steps_per_second", "gauge", "Szimulációs lépés/s (utolsó 1 s ablak)."),
+    ("ai_decisions_per_second", "gauge", "Ténylegesen kiszámolt AI döntés/s."),
+    ("ai_decisions_total", "counter", "Kiszámolt AI döntések összesen."),
+    ("enemies_alive", "gauge", "Élő ellenségek száma."),
+    ("bullets_alive", "gauge", "Repülő lövedékek száma."),
+    ("level", "gauge", "Aktuális szint."),
+    ("score", "gauge", "Aktuális pontszám."),
+    ("lives", "gauge", "Hátralévő életek."),
+    ("ai_enabled", "gauge", "1, ha az AI vezérel."),
+    ("quality_level", "gauge", "A minőség-szabályozó szintje (0: teljes minőség)."),
+    ("quality_transitions_total", "counter", "Minőségi szintváltások összesen."),
+)
+
+
+def parse_address(text: str) -> Tuple[str, Any]:
+    """A `--metrics` érték feldolgozása.
+
+    Paraméterek:
+        text (str): "PORT", "HOST:PORT" vagy "unix:ÚTVONAL".
+
+    Visszatérés:
+        Tuple[str,Any]: ("tcp", (host, port)) vagy ("unix", útvonal).
+
+    Kivétel dobása:
+        ValueError: Hibás formátum vagy port esetén.
+    """
+    if text.startswith("unix:"):
+        path = text[len("unix:"):]
+        if not path:
+            raise ValueError("hiányzó socket-útvonal (várt: unix:/út/a/sockethez)")
+        return "unix", path
+    host, _, port_text = text.rpartition(":")
+    try:
+        port = int(port_text)
+    except ValueError:
+        raise ValueError(f"hibás metrika-cím: {text!r} (várt: PORT, HOST:PORT vagy unix:ÚTVONAL)")
+    if not 0 <= port <= 65535:
+        raise ValueError(f"hibás port: {port}")
+    return "tcp", (host or DEFAULT_HOST, port)
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "SpaceInvadersMetrics/1.0"
+
+    def do_GET(self) -> None:  # noqa: N802 (http.server felület)
+        if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.server.exporter.render().encode("utf-8")  # type: ignore[attr-defined]
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass  # a scrape-ek ne szemeteljék a konzolt
+
+
+def _is_socket(path: str) -> bool:
+    """True, ha az útvonalon (szimbolikus link követése nélkül) socket van."""
+    try:
+        return stat.S_ISSOCK(os.lstat(path).st_mode)
+    except OSError:
+        return False
+
+
+class MetricsExporter:
+    """Pillanatkép-alapú metrika-közzététel háttérszálas HTTP-szerverrel.
+
+    A `observe_frame` és `publish` csak a játékkör szálából hívható; a szerver szála
+    kizárólag a legutóbb közzétett (változatlan) pillanatképet olvassa.
+
+    Attribútumok:
+        address (str): A megadott cím (`parse_address` formátum).
+        url (str): Emberi olvasásra szánt elérési út (indítás után).
+        scrapes (int): Kiszolgált lekérdezések száma.
+    """
+
+    def __init__(self, address: str, buckets_ms: Sequence[float] = FRAME_BUCKETS_MS) -> None:
+        """Inicializálja az exportert (a szervert `start` indítja).
+
+        Paraméterek:
+            address (str): "PORT", "HOST:PORT" vagy "unix:ÚTVONAL".
+            buckets_ms (Sequence[float]): Növekvő frame-idő vödörhatárok ms-ban.
+
+        Kivétel dobása:
+            ValueError: Hibás cím esetén.
+        """
+        self.address = address
+        self._kind, self._target = parse_address(address)
+        self.url = ""
+        self.scrapes = 0
+        self._bounds_ms = tuple(buckets_ms)
+        self._counts: List[int] = [0] * (len(self._bounds_ms) + 1)
+        self._sum_ms = 0.0
+        self._observed = 0
+        self._decision_rate = RateCounter()
+        self._last_decisions = 0
+        self._snapshot: Optional[Tuple[Dict[str, Any], Tuple[int, ...], float, int]] = None
+        self._server: Optional[socketserver.BaseServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> str:
+        """Elindítja a szervert egy démon szálon.
+
+        Visszatérés:
+            str: Az elérési út (pl. "http://127.0.0.1:9464/metrics").
+
+        Kivétel dobása:
+            OSError: Ha a cím foglalt vagy nem köthető, illetve ha a Unix socket útvonalán
+                nem socket (hanem pl. közönséges fájl) van.
+        """
+        if self._kind == "unix":
+            if os.path.lexists(self._target):
+                if not _is_socket(self._target):
+                    raise FileExistsError(f"a metrika-socket útvonalán nem socket van: {self._target}")
+                os.unlink(self._target)  # előző futás ottmaradt socketje
+            server: socketserver.BaseServer = _UnixHTTPServer(self._target, _Handler)
+            self.url = f"unix:{self._target} (/metrics)"
+        else:
+            server = ThreadingHTTPServer(self._target, _Handler)
+            host, port = server.server_address[:2]
+            self.url = f"http://{host}:{port}/metrics"
+        server.exporter = self  # type: ignore[attr-defined]
+        self._server = server
+        self._thread = threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True)
+        self._thread.start()
+        return self.url
+
+    def observe_frame(self, frame_ms: float) -> None:
+        """Egy frame idejének rögzítése a hisztogramba (játékkör szála)."""
+        self._sum_ms += frame_ms
+        self._observed += 1
+        for i, bound in enumerate(self._bounds_ms):
+            if frame_ms <= bound:
+                self._counts[i] += 1
+                return
+        self._counts[-1] += 1
+
+    def publish(self, ai_decisions_total: int, ai_fallbacks: Dict[str, int],
+                ai_mode: str, **values: float) -> None:
+        """Új pillanatkép közzététele (nem blokkol: egyetlen referencia-csere).
+
+        Paraméterek:
+            ai_decisions_total (int): Kiszámolt AI döntések összesen (a döntés/s ebből készül).
+            ai_fallbacks (Dict[str,int]): Fallbackek oka szerint (`DecisionLatencyGuard.fallbacks`).
+            ai_mode (str): Aktuális vezérlés ("manual" vagy AI mód neve).
+            **values (float): A `_SCALARS` többi kulcsa (fps, enemies_alive, score, ...).
+        """
+        self._decision_rate.tick(max(0, ai_decisions_total - self._last_decisions))
+        self._last_decisions = ai_decisions_total
+        values["ai_decisions_total"] = ai_decisions_total
+        values["ai_decisions_per_second"] = self._decision_rate.rate
+        values["ai_fallbacks"] = dict(ai_fallbacks)
+        values["ai_mode"] = ai_mode
+        self._snapshot = (values, tuple(self._counts), self._sum_ms, self._observed)
+
+    def render(self) -> str:
+        """A legutóbbi pillanatkép Prometheus szöveges formátumban (szerver szála)."""
+        self.scrapes += 1
+        snapshot = self._snapshot
+        if snapshot is None:
+            return ""
+        values, counts, sum_ms, observed = snapshot
+        lines: List[str] = []
+        for name, kind, help_text in _SCALARS:
+            if name in values:
+                lines += [f"# HELP {PREFIX}{name} {help_text}", f"# TYPE {PREFIX}{name} {kind}",
+                          f"{PREFIX}{name} {values[name]:g}"]
+        lines += [f"# HELP {PREFIX}ai_fallbacks_total Szabály-alapú fallbackek oka szerint.",
+                  f"# TYPE {PREFIX}ai_fallbacks_total counter"]
+        lines += [f'{PREFIX}ai_fallbacks_total{{reason="{reason}"}} {count}'
+                  for reason, count in sorted(values["ai_fallbacks"].items())]
+        lines += [f"# HELP {PREFIX}ai_mode Aktuális vezérlés (az aktív címke értéke 1).",
+                  f"# TYPE {PREFIX}ai_mode gauge",
+                  f'{PREFIX}ai_mode{{mode="{values["ai_mode"]}"}} 1']
+        name = f"{PREFIX}frame_seconds"
+        lines += [f"# HELP {name} Frame-idő (két kirajzolás között eltelt valós idő).",
+                  f"# TYPE {name} histogram"]
+        cumulative = 0
+        for bound, count in zip(self._bounds_ms, counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{le="{bound / 1000.0:g}"}} {cumulative}')
+        lines += [f'{name}_bucket{{le="+Inf"}} {observed}',
+                  f"{name}_sum {sum_ms / 1000.0:.6f}", f"{name}_count {observed}"]
+        return "\n".join(lines) + "\n"
+
+    def close(self) -> None:
+        """A szerver leállítása (Unix socketnél a fájlt is töröljük)."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+        if self._kind == "unix" and _is_socket(self._target):
+            os.unlink(self._target)
+        self._server = None
+        self._thread = None
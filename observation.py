@@ -0,0 +1,159 @@
+"""Pixel-megfigyelés képről tanuló ágenseknek: lekicsinyített szürkeárnyalatos NumPy kép másolat nélkül.
+
+A `dx/dy` jellemzők helyett a kirajzolt képernyőből tanuló ágenseknek a teljes 800×600-as
+`screen` frame-enkénti lemásolása (`surfarray.array3d`: 1,4 MB, majd lebegőpontos
+szürkítés) drága. A `PixelObserver` a `draw_game` után a felület pixeleit a
+`pygame.surfarray.pixels3d` nézeten át olvassa (nincs teljes másolat), `factor`
+lépésközzel mintavételez (szintén nézet), és csak a kicsinyített képet számolja ki egész
+aritmetikával egy előre lefoglalt pufferbe (BT.601 súlyok /256).
+
+Képhalmozásnál (`stack` > 1) a kockák egy előre lefoglalt gyűrűpufferbe kerülnek, amely
+minden kockát kétszer tárol (i és i + stack helyen); így a legutóbbi `stack` kocka mindig
+egy folytonos szelet, és a visszaadott (stack, h, w) tömb is nézet, nem másolat.
+
+    python main.py --observe [--observe-factor 4] [--observe-stack 4] [--observe-hook modul:függvény]
+    python bench.py observe                  # megfigyelés/s: nézet vs. teljes másolat
+"""
+
+import importlib
+import time
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+import pygame
+
+from helper import HEIGHT, WIDTH
+
+DEFAULT_FACTOR = 4     # 800×600 -> 200×150; a lövedék (11 px) így is legalább 2 mintát kap
+DEFAULT_STACK = 4
+GRAY_WEIGHTS = (77, 150, 29)   # R, G, B súlyok /256 (ITU-R BT.601)
+
+ObservationHook = Callable[[np.ndarray], None]
+
+
+class PixelObserver:
+    """Lekicsinyített szürkeárnyalatos megfigyelés és képhalmozó gyűrűpuffer.
+
+    Attribútumok:
+        factor (int): Mintavételi lépésköz (mindkét irányban).
+        stack (int): Halmozott kockák száma.
+        shape (Tuple[int,int]): Egy kocka alakja (sor, oszlop).
+        count (int): Eddigi megfigyelések száma.
+        seconds (float): A megfigyelésekre fordított összes idő.
+        hook (Optional[ObservationHook]): Minden megfigyelés után hívódik a halmozott tömbbel.
+    """
+
+    def __init__(self, size: Tuple[int, int] = (WIDTH, HEIGHT), factor: int = DEFAULT_FACTOR,
+                 stack: int = 1, hook: Optional[ObservationHook] = None) -> None:
+        """Lefoglalja a puffereket.
+
+        Paraméterek:
+            size (Tuple[int,int]): A megfigyelt felület mérete (szélesség, magasság).
+            factor (int): Mintavételi lépésköz; 1 = teljes felbontás.
+            stack (int): Halmozott kockák száma (1 = nincs halmozás).
+            hook (Optional[ObservationHook]): Fogyasztó (pl. ágens), a halmozott tömböt kapja.
+
+        Kivétel dobása:
+            ValueError: Ha `factor` vagy `stack` kisebb 1-nél.
+        """
+        if factor < 1 or stack < 1:
+            raise ValueError("factor és stack legalább 1 kell legyen")
+        self.size = size
+        self.factor = factor
+        self.stack = stack
+        self.hook = hook
+        self.shape = (-(-size[1] // factor), -(-size[0] // factor))
+        self.count = 0
+        self.seconds = 0.0
+        # minden kocka kétszer: a legutóbbi `stack` kocka mindig a [pos, pos + stack) szelet
+        self._frames = np.zeros((2 * stack,) + self.shape, dtype=np.uint8)
+        self._acc = np.empty(self.shape, dtype=np.uint16)
+        self._tmp = np.empty(self.shape, dtype=np.uint16)
+        self._pos = 0
+
+    def observe(self, surface: pygame.Surface) -> np.ndarray:
+        """A kirajzolt felület megfigyelése és a halmozott tömb visszaadása.
+
+        A felület csak a hívás idejére zárolódik (a `pixels3d` nézet a végén felszabadul),
+        így utána a rajzolás zavartalanul folytatódhat.
+
+        Paraméterek:
+            surface (pygame.Surface): 24 vagy 32 bites felület (`size` méretű).
+
+        Visszatérés:
+            np.ndarray: (stack, sor, oszlop) uint8 nézet, a legrégebbi kockától a legújabbig;
+                csak olvasható, és a következő `observe` felülírja (ha meg kell tartani, másolandó).
+
+        Kivétel dobása:
+            ValueError: Ha a felület mérete eltér a `size`-tól.
+        """
+        t0 = time.perf_counter()
+        if surface.get_size() != self.size:
+            raise ValueError(f"a felület mérete {surface.get_size()}, várt {self.size}")
+        acc, tmp, f = self._acc, self._tmp, self.factor
+        pixels = pygame.surfarray.pixels3d(surface)   # (szélesség, magasság, 3) nézet, zárolja a felületet
+        try:
+            view = pixels.transpose(1, 0, 2)[::f, ::f]     # soronként bejárva: gyorsabb mintavétel
+            np.multiply(view[..., 0], GRAY_WEIGHTS[0], out=acc, dtype=np.uint16)
+            np.multiply(view[..., 1], GRAY_WEIGHTS[1], out=tmp, dtype=np.uint16)
+            np.add(acc, tmp, out=acc)
+            np.multiply(view[..., 2], GRAY_WEIGHTS[2], out=tmp, dtype=np.uint16)
+            np.add(acc, tmp, out=acc)
+        finally:
+            del pixels
+        pos = self._pos
+        np.right_shift(acc, 8, out=self._frames[pos], casting="unsafe")
+        if self.stack > 1:
+            self._frames[pos + self.stack] = self._frames[pos]
+            self._pos = (pos + 1) % self.stack
+        self.count += 1
+        obs = self.stacked()
+        self.seconds += time.perf_counter() - t0
+        if self.hook is not None:
+            self.hook(obs)
+        return obs
+
+    def stacked(self) -> np.ndarray:
+        """A legutóbbi `stack` kocka (stack, sor, oszlop) alakú, csak olvasható nézete."""
+        obs = self._frames[self._pos:self._pos + self.stack]
+        obs.flags.writeable = False
+        return obs
+
+    @property
+    def latest(self) -> np.ndarray:
+        """A legutóbbi kocka (sor, oszlop) nézete."""
+        return self.stacked()[-1]
+
+    def reset(self) -> None:
+        """Új epizód: a halmozott kockák nullázása."""
+        self._frames.fill(0)
+        self._pos = 0
+
+    def summary(self) -> str:
+        """Egysoros összefoglaló: megfigyelések száma és átlagideje."""
+        mean_us = self.seconds / self.count * 1e6 if self.count else 0.0
+        return (f"pixel-megfigyelés: {self.count} kocka, {self.shape[1]}×{self.shape[0]} "
+                f"(1/{self.factor}), halmozás {self.stack} | átlag {mean_us:.0f} µs/megfigyelés")
+
+
+def resolve_hook(spec: str) -> ObservationHook:
+    """"modul:függvény" alakú fogyasztó betöltése.
+
+    Kivétel dobása:
+        ValueError: Ha a megadás nem "modul:függvény" alakú.
+    """
+    if ":" not in spec:
+        raise ValueError(f"hibás hook: {spec} (várt: modul:függvény)")
+    module_name, func_name = spec.split(":", 1)
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def copy_observation(surface: pygame.Surface, factor: int = DEFAULT_FACTOR) -> np.ndarray:
+    """Összevetési alap: teljes másolat (`array3d`), szürkítés a teljes felbontáson, majd mintavétel.
+
+    A szürkítés uint16 egész aritmetikával, ugyanazokkal a súlyokkal fut, mint a
+    `PixelObserver`-ben, így pixelre ugyanazt adja, mint annak egy kockája.
+    """
+    rgb = pygame.surfarray.array3d(surface).astype(np.uint16)
+    gray = (rgb[..., 0] * GRAY_WEIGHTS[0] + rgb[..., 1] * GRAY_WEIGHTS[1] + rgb[..., 2] * GRAY_WEIGHTS[2]) >> 8
+    return gray.T[::factor, ::factor].astype(np.uint8)
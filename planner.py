@@ -0,0 +1,371 @@
+"""Előretekintő (lookahead) tervező AI a játék saját szimulációs lépésére építve.
+
+A két meglévő policy (`helper.decide_action`, `main.decide_action_ml`) egyetlen frame-re
+néző heurisztika. A `LookaheadPlanner` ehelyett a `GameState` klónjain lejátssza néhány
+jelölt akciósorozat következményét (`horizon` lépés, ugyanazokkal a szabályokkal, mint
+a játék), és a legjobbat követi:
+
+    - jelöltek: "üldözd ezt az ellenséget" zárt hurkú vezérlők (alá áll, igazodva lő)
+      néhány célpontra, csillag lelövése, plusz helyben állás lövéssel;
+    - értékelés: pontszám-nyereség, életvesztés büntetése, felvett power-up jutalma,
+      a horizont végén még repülő, célba tartó lövedékek, döntetlennél a célhoz mért távolság;
+    - anytime: a jelölteket ígéretességi sorrendben (vízszintes távolság) értékeli, és
+      `budget_ms` után leáll (a határidőt a rollout is figyeli, minden lépés előtt);
+      az addigi legjobb teljes rollout nyer;
+    - amortizáció: a nyertes vezérlő az élő játékban fut tovább, újratervezés csak
+      döntési pontokon (a következő lövés előtt, ill. ha a célpontot kilőtték).
+
+Önállóan futtatva headless játékokon méri a pontszámot és a pontszám / AI CPU-ms arányt:
+
+    python planner.py --policies rule,hybrid,plan --games 3
+"""
+
+import argparse
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import helper
+from gamestate import GameState
+from helper import Action
+from timing import RateCounter
+
+LIFE_PENALTY = 1000.0        # egy elvesztett élet "ára" pontban
+POWERUP_BONUS = 80.0         # aktivált power-up értéke (~4 s gyorsított lövés ≈ 8-9 extra találat)
+IN_FLIGHT_HIT_VALUE = 8.0    # horizont végén célpont alatt repülő lövedék várható értéke
+ALIGN_WEIGHT = 0.01          # pont/px: döntetlennél a célpont alá állás számít
+HOLD: Action = {"move": None, "shoot": True}
+
+Controller = Callable[[Any, List[Dict[str, Any]], Any], Action]  # (player_rect, enemies, powerups) -> Action
+STAR = -2   # jelölt: a pályán lévő csillag begyűjtése / lelövése
+HOLD_PICK = -1  # jelölt: helyben állás lövéssel
+
+
+def _nearest(player_rect: Any, enemies: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """A játékoshoz (euklideszi értelemben) legközelebbi ellenség."""
+    if not enemies:
+        return None
+    px, py = player_rect.centerx, player_rect.centery
+    return min(enemies, key=lambda e: (e["rect"].centerx - px) ** 2 + (e["rect"].centery - py) ** 2)
+
+
+def _alive(target: Dict[str, Any], enemies: List[Dict[str, Any]]) -> bool:
+    return any(e is target for e in enemies)
+
+
+def _hold(_player_rect: Any, _enemies: List[Dict[str, Any]], _powerups: Any) -> Action:
+    return HOLD
+
+
+def _align(player_rect: Any, target_rect: Any, eps: int) -> Action:
+    dx = target_rect.centerx - player_rect.centerx
+    if abs(dx) > eps:
+        return {"move": "left" if dx < 0 else "right", "shoot": False}
+    return HOLD
+
+
+def _chase_star(player_rect: Any, enemies: List[Dict[str, Any]], powerups: Any) -> Action:
+    """Vezérlő: a legközelebbi csillag alá áll és lelövi (mint a hibrid policy csillag-ága)."""
+    stars = [p for p in powerups if getattr(p, "type", None) == "star"]
+    if not stars:
+        return HOLD
+    star = min(stars, key=lambda p: abs(p.rect.centerx - player_rect.centerx))
+    return _align(player_rect, star.rect, helper.ALIGN_EPS_BASE)
+
+
+def _chase(target: Optional[Dict[str, Any]]) -> Controller:
+    """Zárt hurkú vezérlő: a megadott ellenség alá áll és lő; ha kilőtték, a legközelebbit üldözi."""
+    state_target = {"e": target}
+
+    def control(player_rect: Any, enemies: List[Dict[str, Any]], _powerups: Any) -> Action:
+        t = state_target["e"]
+        if t is None or not _alive(t, enemies):
+            t = state_target["e"] = _nearest(player_rect, enemies)
+            if t is None:
+                return HOLD
+        return _align(player_rect, t["rect"], max(helper.ALIGN_EPS_BASE, t["rect"].width // 3))
+
+    return control
+
+
+def _in_flight_value(state: GameState) -> float:
+    """A még repülő lövedékek becsült értéke: amelyik egy ellenség oszlopában, alatta halad."""
+    value = 0.0
+    for bx, by in state.bullets:
+        for e in state.enemies:
+            r = e["rect"]
+            if r.left <= bx <= r.right and r.bottom <= by:
+                value += IN_FLIGHT_HIT_VALUE
+                break
+    return value
+
+
+class LookaheadPlanner:
+    """Anytime, költségkeretes előretekintő tervező.
+
+    Jelöltek: zárt hurkú "üldözd az i-edik ellenséget" vezérlők (a vízszintesen legközelebbi
+    `max_targets` ellenség és a legalacsonyabban lévő), valamint helyben állás lövéssel.
+    Ha van csillag a pályán, annak lelövése is jelölt. Mindegyik `horizon` lépésig fut a
+    `GameState` klónján. A nyertes vezérlő az élő játékban fut tovább (lépésenként olcsó),
+    és csak döntési pontokon tervezünk újra (lásd `decide`). A lövési cooldown
+    (~1 lövés/s) miatt így másodpercenként csak egy-két tervezés fut.
+
+    Attribútumok:
+        budget_ms (float): Egy tervezés CPU-kerete ms-ban (anytime levágás).
+        horizon (int): Rollout hossza lépésekben.
+        max_targets (int): Ennyi célpont-jelölt (vízszintes távolság szerint).
+        lead_steps (int): Ennyi lépéssel a lövés elkészülte előtt választunk célpontot.
+        replan_every (int): Legfeljebb ennyi lépésig fut a nyertes vezérlő újratervezés nélkül.
+        plans (int): Tervezések száma.
+        rollouts (int): Lefuttatott teljes rolloutok száma összesen.
+        last_rollouts (int): Az utolsó tervezés teljes rolloutjai.
+        cutoffs (int): Hányszor állította le a keret a jelöltek értékelését.
+        cpu_ms (float): Tervezésre fordított összes idő ms-ban.
+        rollout_rate (RateCounter): Rollout/másodperc.
+    """
+
+    def __init__(self, budget_ms: float = 4.0, horizon: int = 70, max_targets: int = 3,
+                 lead_steps: int = 25, replan_every: int = 30) -> None:
+        """Inicializálja a tervezőt.
+
+        Kivétel dobása:
+            ValueError: Nem pozitív keret vagy horizont esetén.
+        """
+        if budget_ms <= 0 or horizon <= 0:
+            raise ValueError("budget_ms és horizon pozitív kell legyen")
+        self.budget_ms = budget_ms
+        self.horizon = horizon
+        self.max_targets = max_targets
+        self.lead_steps = lead_steps
+        self.replan_every = max(1, replan_every)
+        self.plans = 0
+        self.rollouts = 0
+        self.last_rollouts = 0
+        self.cutoffs = 0
+        self.cpu_ms = 0.0
+        self.rollout_rate = RateCounter()
+        self._control: Optional[Controller] = None
+        self._target: Optional[Dict[str, Any]] = None
+        self._since_plan = 0
+        self._planned_shot: Optional[int] = None
+        self._expected_ms: Optional[float] = None
+        self._scratch: Optional[GameState] = None
+
+    def reset(self) -> None:
+        """Eldobja a folyamatban lévő tervet (új játék vagy módváltás után)."""
+        self._control = None
+        self._target = None
+        self._expected_ms = None
+
+    def _candidates(self, scratch: GameState) -> List[int]:
+        """Jelölt vezérlők ígéretességi sorrendben (anytime: a fontosak előre kerülnek).
+
+        A `scratch` éppen a gyökérállapot friss másolata; a célpontok az ő ellenség-dict-jei,
+        ezért a jelöltek indexszel hivatkoznak rájuk, és minden rollout elején feloldódnak.
+        """
+        enemies = scratch.enemies
+        px = scratch.player_rect.centerx
+        order = sorted(range(len(enemies)), key=lambda i: abs(enemies[i]["rect"].centerx - px))
+        picks = order[:self.max_targets]
+        if enemies:
+            lowest = max(range(len(enemies)), key=lambda i: enemies[i]["rect"].bottom)
+            if lowest not in picks:
+                picks.append(lowest)
+        if any(getattr(p, "type", None) == "star" for p in scratch.powerups):
+            picks.insert(0, STAR)
+        return picks + [HOLD_PICK]
+
+    @staticmethod
+    def _controller(pick: int, enemies: List[Dict[str, Any]]) -> Controller:
+        if pick == STAR:
+            return _chase_star
+        if 0 <= pick < len(enemies):
+            return _chase(enemies[pick])
+        return _hold
+
+    def _rollout(self, root: GameState, scratch: GameState, pick: int,
+                 deadline: float = float("inf")) -> Tuple[float, bool]:
+        """Egy jelölt vezérlő lejátszása `horizon` lépésig és az eredmény értékelése.
+
+        A határidőt minden lépés előtt nézi (az óra olvasása elhanyagolható egy lépéshez
+        képest, nagy rajnál viszont egy lépés is ms-okig tart); ha lejárt, a rollout
+        megszakad, és a részleges állapot értékelődik.
+
+        Visszatérés:
+            Tuple[float,bool]: (érték, teljes-e a rollout).
+        """
+        scratch.restore(root)
+        control = self._controller(pick, scratch.enemies)
+        complete = True
+        for _ in range(self.horizon):
+            if time.perf_counter() >= deadline:
+                complete = False
+                break
+            if scratch.step(control(scratch.player_rect, scratch.enemies, scratch.powerups)):
+                break
+        value = float(scratch.score - root.score)
+        value -= LIFE_PENALTY * max(0, root.lives - scratch.lives)
+        value += POWERUP_BONUS * sum(1 for k, t in scratch.player_powerups.items()
+                                     if root.player_powerups.get(k) != t)
+        value += _in_flight_value(scratch)
+        nearest = _nearest(scratch.player_rect, scratch.enemies)
+        if nearest is not None:
+            value -= ALIGN_WEIGHT * abs(nearest["rect"].centerx - scratch.player_rect.centerx)
+        return value, complete
+
+    def plan(self, root: GameState) -> int:
+        """Célpont-választás a `root` állapotból a kereten belül (anytime).
+
+        A határidőn túlfutó rolloutot a `_rollout` megszakítja. Részleges (rövidebb
+        horizontú) érték csak akkor számít, ha még egyetlen teljes rollout sincs: a
+        különböző hosszú lejátszások értéke nem hasonlítható össze.
+
+        Visszatérés:
+            int: A nyertes ellenség indexe `root.enemies`-ben, `STAR` vagy `HOLD_PICK`.
+        """
+        t0 = time.perf_counter()
+        deadline = t0 + self.budget_ms / 1000.0
+        if self._scratch is None:
+            self._scratch = root.clone()
+        scratch = self._scratch
+        scratch.restore(root)
+        candidates = self._candidates(scratch)
+        best_value = float("-inf")
+        best = HOLD_PICK
+        done = 0
+        for pick in candidates:
+            value, complete = self._rollout(root, scratch, pick, deadline)
+            if not complete:
+                if not done:
+                    best = pick   # egyetlen teljes rollout sincs: a részleges is jobb a semminél
+                break
+            done += 1
+            if value > best_value:
+                best_value, best = value, pick
+            if time.perf_counter() >= deadline:
+                break
+        if done < len(candidates):
+            self.cutoffs += 1
+        self.plans += 1
+        self.rollouts += done
+        self.last_rollouts = done
+        self.rollout_rate.tick(done)
+        self.cpu_ms += (time.perf_counter() - t0) * 1000.0
+        return best
+
+    def decide(self, player_rect: Any, enemies: List[Dict[str, Any]], powerups: Any,
+               last_shot_time: int, shoot_delay: int, capture: Callable[[], GameState],
+               now_ms: float) -> Action:
+        """A követett vezérlő akciója; döntési ponton előbb újratervez.
+
+        Döntési pont: a következő lövés `lead_steps`-en belül kész (és erre a lövésre még
+        nem terveztünk), a célpontot kilőtték, vagy kész lövés mellett `replan_every` lépés
+        telt el. Közben a legközelebbi / kiválasztott célpont üldözése tervezés nélkül fut.
+
+        Paraméterek:
+            player_rect (pygame.Rect): Élő játékos-rect.
+            enemies (List[Dict]): Élő ellenséglista (a célpontot ebben követjük).
+            powerups (pygame.sprite.Group): Élő power-upok (csillag-célponthoz).
+            last_shot_time (int): Utolsó lövés ideje.
+            shoot_delay (int): Aktuális lövési késleltetés ms-ban.
+            capture (Callable[[], GameState]): Pillanatkép az élő játékról (csak tervezéskor hívódik).
+            now_ms (float): Aktuális játékidő; ha nem a várt következő lépés, a terv elévült.
+
+        Visszatérés:
+            Action: A végrehajtandó akció.
+        """
+        if self._expected_ms is not None and abs(now_ms - self._expected_ms) > 1e-6:
+            self.reset()
+        self._expected_ms = now_ms + helper.SIM_STEP_MS
+        self._since_plan += 1
+        if self._target is not None and not _alive(self._target, enemies):
+            self._control = None
+        ready_in = last_shot_time + shoot_delay + 1 - now_ms
+        near_shot = ready_in <= self.lead_steps * helper.SIM_STEP_MS
+        if near_shot and (self._planned_shot != last_shot_time or self._control is None
+                          or self._since_plan >= self.replan_every):
+            pick = self.plan(capture())
+            self._target = enemies[pick] if 0 <= pick < len(enemies) else None
+            self._control = self._controller(pick, enemies)
+            self._since_plan = 0
+            self._planned_shot = last_shot_time
+        elif self._control is None:
+            self._target = None
+            self._control = _chase(None)  # tervezés nélkül: a legközelebbi ellenség
+        return self._control(player_rect, enemies, powerups)
+
+    def rollouts_per_plan(self) -> float:
+        """Átlagos rollout-szám tervezésenként."""
+        return self.rollouts / self.plans if self.plans else 0.0
+
+    def summary(self) -> str:
+        """Egysoros összefoglaló."""
+        mean_ms = self.cpu_ms / self.plans if self.plans else 0.0
+        return (f"tervező: {self.plans} terv, {self.rollouts_per_plan():.1f} rollout/terv, "
+                f"átlag {mean_ms:.2f} ms/terv (keret {self.budget_ms} ms, "
+                f"keret miatti levágás: {self.cutoffs})")
+
+
+def make_plan_policy(**planner_kwargs: Any) -> Callable[[Any], Optional[Action]]:
+    """Headless policy a tervezővel (HeadlessGame -> Action); a `planner` attribútumon mérhető."""
+    planner = LookaheadPlanner(**planner_kwargs)
+
+    def policy(game: Any) -> Optional[Action]:
+        return planner.decide(game.player_rect, game.enemies, game.powerups,
+                              game.level_data["last_shot_time"], game.shoot_delay(),
+                              game.snapshot, game.time_ms)
+
+    policy.planner = planner  # type: ignore[attr-defined]
+    return policy
+
+
+def evaluate(policy_names: Sequence[str], games: int = 3, seed: int = 0,
+             difficulty_index: int = 1, max_steps: int = 180 * helper.SIM_HZ,
+             budget_ms: float = 3.0) -> Dict[str, Dict[str, float]]:
+    """Policyk összevetése ugyanazokon a magokon: pontszám és pontszám / AI CPU-ms.
+
+    Paraméterek:
+        policy_names (Sequence[str]): `headless.resolve_policy` nevek, vagy "plan".
+        games (int): Játékok száma policynként.
+        seed (int): Első mag.
+        difficulty_index (int): Nehézség.
+        max_steps (int): Lépéskorlát játékonként.
+        budget_ms (float): A tervező kerete ("plan" esetén).
+
+    Visszatérés:
+        Dict[str,Dict[str,float]]: policynként {"mean_score","ai_cpu_ms_per_game_second",
+            "score_per_cpu_ms"}.
+    """
+    from headless import resolve_policy, run_timed_games
+
+    out: Dict[str, Dict[str, float]] = {}
+    for name in policy_names:
+        res = run_timed_games(lambda: make_plan_policy(budget_ms=budget_ms) if name == "plan"
+                              else resolve_policy(name), games, seed, difficulty_index, max_steps)
+        scores, game_seconds, cpu_s = res["scores"], res["game_seconds"], res["policy_seconds"]
+        mean_score = sum(scores) / len(scores)
+        cpu_per_s = cpu_s * 1000 / game_seconds if game_seconds else 0.0
+        out[name] = {"mean_score": mean_score, "ai_cpu_ms_per_game_second": cpu_per_s,
+                     "score_per_cpu_ms": mean_score / (cpu_s * 1000 / games) if cpu_s else 0.0}
+    return out
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Parancssori belépési pont: policyk összevetése."""
+    parser = argparse.ArgumentParser(description="Előretekintő tervező mérése headless játékokon")
+    parser.add_argument("--policies", default="rule,hybrid,plan")
+    parser.add_argument("--games", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--difficulty", type=int, default=1, choices=(0, 1, 2))
+    parser.add_argument("--budget-ms", type=float, default=3.0)
+    args = parser.parse_args(argv)
+
+    res = evaluate(args.policies.split(","), args.games, args.seed, args.difficulty,
+                   budget_ms=args.budget_ms)
+    for name, r in res.items():
+        print(f"{name:>8}: átlag pont {r['mean_score']:.0f} | "
+              f"AI CPU {r['ai_cpu_ms_per_game_second']:.2f} ms/játék-mp | "
+              f"{r['score_per_cpu_ms']:.2f} pont/CPU-ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""Beépített profilozás játékmenetekhez: cProfile vagy mintavételező profiler.
+
+    python main.py --profile                 # teljes játékmenet, cProfile
+    python main.py --profile=sample          # mintavételező (alacsony overhead)
+    python main.py --profile --profile-window  # F9 indítja/leállítja a mérést
+
+Minden mérési ablak végén a `profiles/` könyvtárba kerül:
+    <név>.pstats     – `pstats`/snakeviz/gprof2dot számára,
+    <név>.collapsed  – "f1;f2;f3 súly" soronként (flamegraph.pl, speedscope, inferno),
+    <név>.json       – címkék: nehézség, elért szint, AI mód(ok), mag, időtartam.
+
+cProfile módban a hívási láncot a hívó→hívott élekből arányosan bontjuk ki, így a
+.collapsed kimenet közelítés; mintavételező módban valódi (mintázott) stackek kerülnek bele,
+a .pstats pedig a mintákból épül.
+"""
+
+import cProfile
+import json
+import marshal
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+PROFILE_MODES = ("cprofile", "sample")
+DEFAULT_PROFILE_DIR = "profiles"
+SAMPLE_INTERVAL_MS = 1.0
+COLLAPSED_MAX_DEPTH = 64
+
+FuncKey = Tuple[str, int, str]  # (fájl, sor, függvény) – a pstats kulcsformátuma
+
+
+def _frame_key(code: Any) -> FuncKey:
+    return (code.co_filename, code.co_firstlineno, code.co_name)
+
+
+def _label(key: FuncKey) -> str:
+    """Flamegraph-barát címke (a ';' a collapsed formátum elválasztója, ezért kicseréljük)."""
+    filename, line, name = key
+    if filename == "~":  # beépített függvények cProfile-ban: ('~', 0, "<built-in method ...>")
+        text = name
+    else:
+        text = f"{name} ({os.path.basename(filename)}:{line})"
+    return text.replace(";", ",")
+
+
+class _Sampler:
+    """Háttérszál, amely fix időközönként lementi a fő szál stackjét."""
+
+    def __init__(self, interval_ms: float, thread_id: int) -> None:
+        self.interval_s = interval_ms / 1000.0
+        self.thread_id = thread_id
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="profiler-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack: List[FuncKey] = []
+            while frame is not None:
+                stack.append(_frame_key(frame.f_code))
+                frame = frame.f_back
+            stack.reverse()  # gyökértől a levélig
+            self.stacks[tuple(stack)] += 1
+            self.samples += 1
+
+    def pstats_dict(self) -> Dict[FuncKey, Tuple[int, int, float, float, Dict[FuncKey, Tuple]]]:
+        """A mintákból `pstats`-kompatibilis statisztika (idők másodpercben)."""
+        dt = self.interval_s
+        own: Counter = Counter()
+        inclusive: Counter = Counter()
+        edges: Counter = Counter()
+        edge_own: Counter = Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for func in set(stack):
+                inclusive[func] += count
+            for caller, callee in set(zip(stack, stack[1:])):
+                edges[(caller, callee)] += count
+            if len(stack) > 1:
+                edge_own[(stack[-2], stack[-1])] += count
+        callers: Dict[FuncKey, Dict[FuncKey, Tuple]] = {func: {} for func in inclusive}
+        for (caller, callee), count in edges.items():
+            callers[callee][caller] = (count, count, edge_own[(caller, callee)] * dt, count * dt)
+        return {func: (inclusive[func], inclusive[func], own[func] * dt, inclusive[func] * dt,
+                       callers[func])
+                for func in inclusive}
+
+
+def _collapsed_from_pstats(stats: Dict[FuncKey, Tuple], max_depth: int = COLLAPSED_MAX_DEPTH
+                           ) -> Counter:
+    """Közelítő collapsed stackek cProfile statisztikából (súly: mikroszekundum).
+
+    Minden függvény saját idejét a hívó→hívott élek kumulált idejének arányában
+    osztjuk szét a gyökerektől induló utak között.
+    """
+    children: Dict[FuncKey, List[Tuple[FuncKey, float]]] = {}
+    for callee, (_cc, _nc, _tt, _ct, callers) in stats.items():
+        for caller, edge in callers.items():
+            children.setdefault(caller, []).append((callee, edge[3]))
+    roots = [f for f, v in stats.items() if not v[4]]
+    out: Counter = Counter()
+
+    def expand(func: FuncKey, path: List[str], on_path: Set[FuncKey], fraction: float) -> None:
+        _cc, _nc, tt, ct, _callers = stats[func]
+        path.append(_label(func))
+        weight = int(tt * fraction * 1e6)
+        if weight > 0:
+            out[";".join(path)] += weight
+        if len(path) < max_depth and ct > 0:
+            for child, edge_ct in children.get(func, ()):
+                if child in on_path or child not in stats:
+                    continue
+                child_ct = stats[child][3]
+                child_fraction = fraction * edge_ct / child_ct if child_ct > 0 else 0.0
+                if child_fraction * child_ct * 1e6 >= 1:
+                    on_path.add(child)
+                    expand(child, path, on_path, child_fraction)
+                    on_path.discard(child)
+        path.pop()
+
+    for root in roots:
+        expand(root, [], {root}, 1.0)
+    return out
+
+
+class SessionProfiler:
+    """Egy játékmenet profilozása, ablakonként mentett kimenettel.
+
+    Attribútumok:
+        mode (str): "cprofile" vagy "sample".
+        out_dir (str): Kimeneti könyvtár.
+        running (bool): Éppen mér-e.
+        saved (List[str]): Az eddig mentett fájlok alapnevei (kiterjesztés nélkül).
+    """
+
+    def __init__(self, mode: str = "cprofile", out_dir: str = DEFAULT_PROFILE_DIR,
+                 tags: Optional[Dict[str, Any]] = None,
+                 sample_interval_ms: float = SAMPLE_INTERVAL_MS) -> None:
+        """Inicializálja a profilert (még nem indítja el).
+
+        Paraméterek:
+            mode (str): "cprofile" vagy "sample".
+            out_dir (str): Ide kerülnek a kimenetek.
+            tags (Optional[Dict[str,Any]]): Állandó címkék (pl. nehézség, mag).
+            sample_interval_ms (float): Mintavételi időköz "sample" módban.
+
+        Kivétel dobása:
+            ValueError: Ismeretlen mód esetén.
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Ismeretlen profil mód: {mode} (ismert: {', '.join(PROFILE_MODES)})")
+        self.mode = mode
+        self.out_dir = out_dir
+        self.tags: Dict[str, Any] = dict(tags or {})
+        self.sample_interval_ms = sample_interval_ms
+        self.running = False
+        self.saved: List[str] = []
+        self._profile: Optional[cProfile.Profile] = None
+        self._sampler: Optional[_Sampler] = None
+        self._started_at = 0.0
+        self._max_level = 0
+        self._modes: List[str] = []
+
+    def observe(self, level: int, ai_mode: str) -> None:
+        """Frame-enkénti címkegyűjtés az ablakhoz (elért szint, használt AI mód)."""
+        if not self.running:
+            return
+        if level > self._max_level:
+            self._max_level = level
+        if ai_mode not in self._modes:
+            self._modes.append(ai_mode)
+
+    def start(self) -> None:
+        """Mérési ablak indítása (ha már fut, nem csinál semmit)."""
+        if self.running:
+            return
+        self._max_level = 0
+        self._modes = []
+        self._started_at = time.perf_counter()
+        if self.mode == "cprofile":
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            self._sampler = _Sampler(self.sample_interval_ms, threading.get_ident())
+            self._sampler.start()
+        self.running = True
+
+    def stop(self) -> Optional[str]:
+        """Mérési ablak lezárása és mentése.
+
+        Visszatérés:
+            Optional[str]: A mentett fájlok alapneve, vagy None, ha nem futott.
+
+        Kivétel dobása:
+            OSError: Ha a kimeneti könyvtár/fájl nem írható.
+        """
+        if not self.running:
+            return None
+        duration_s = time.perf_counter() - self._started_at
+        if self._profile is not None:
+            self._profile.disable()
+            self._profile.create_stats()
+            stats = self._profile.stats  # type: ignore[attr-defined]
+            collapsed = _collapsed_from_pstats(stats)
+            self._profile = None
+        else:
+            assert self._sampler is not None
+            self._sampler.stop()
+            stats = self._sampler.pstats_dict()
+            weight_us = int(self._sampler.interval_s * 1e6)
+            collapsed = Counter({";".join(_label(k) for k in stack): n * weight_us
+                                 for stack, n in self._sampler.stacks.items()})
+            self._sampler = None
+        self.running = False
+        return self._save(stats, collapsed, duration_s)
+
+    def toggle(self) -> Optional[str]:
+        """Indít vagy leállít (hotkey-hez); leállításkor a mentett alapnevet adja."""
+        if self.running:
+            return self.stop()
+        self.start()
+        return None
+
+    def _save(self, stats: Dict[FuncKey, Tuple], collapsed: Counter, duration_s: float) -> str:
+        os.makedirs(self.out_dir, exist_ok=True)
+        tags = dict(self.tags)
+        tags.update({"profiler": self.mode, "level_reached": self._max_level,
+                     "ai_mode": "+".join(self._modes) or "n/a",
+                     "duration_s": round(duration_s, 3),
+                     "started": time.strftime("%Y-%m-%dT%H:%M:%S")})
+        name = "_".join([time.strftime("%Y%m%d-%H%M%S"), self.mode,
+                         str(tags.get("difficulty", "x")).lower(), f"L{self._max_level}",
+                         tags["ai_mode"]])
+        base = os.path.join(self.out_dir, name)
+        if base in self.saved:
+            base += f"_{len(self.saved)}"
+        with open(base + ".pstats", "wb") as f:
+            marshal.dump(stats, f)
+        with open(base + ".collapsed", "w", encoding="utf-8") as f:
+            for stack, weight in sorted(collapsed.items()):
+                f.write(f"{stack} {weight}\n")
+        with open(base + ".json", "w", encoding="utf-8") as f:
+            json.dump(tags, f, ensure_ascii=False, indent=2)
+        self.saved.append(base)
+        return base
@@ -0,0 +1,164 @@
+"""Prototípus-kiválasztás a KNN modellhez: szerkesztett (ENN) és kondenzált (CNN) legközelebbi szomszédok.
+
+A KNN minden tanítósort megtart, így a modell mérete és a döntésenkénti jóslási idő az
+`examples.csv`-vel együtt nő. A redukció a tanítóhalmazból prototípusokat választ:
+
+    - "enn" (Wilson-szerkesztés): elhagyja azokat a sorokat, amelyeket a saját k szomszédjuk
+      (önmaguk nélkül) másik akcióra szavaz – zajszűrés, a döntési határ kisimítása;
+    - "cnn" (Hart-kondenzálás): csak azokat a sorokat tartja meg, amelyek nélkül a meglévő
+      prototípusok 1-NN szabálya tévesen osztályozná őket – a határ menti pontok maradnak;
+    - "enn+cnn": előbb szerkesztés, utána kondenzálás (a zajos pontok nem kerülnek prototípusnak).
+
+Az elhagyott sorok súlya a legközelebbi azonos akciójú prototípushoz adódik, így a súlyozott
+szavazás (`WeightedKNeighborsClassifier`) továbbra is az eredeti példaszámot képviseli.
+
+    python train_player_ai.py selfplay_data --reduce enn+cnn
+"""
+
+from typing import Any, Tuple
+
+import numpy as np
+
+REDUCTION_METHODS = ("none", "enn", "cnn", "enn+cnn")
+CHUNK = 512            # távolságszámítás kötegmérete (memória: CHUNK × n)
+CONDENSE_CHUNK = 64    # a kondenzálás kisebb kötegben halad: minden új prototípus után újraszámol
+
+
+def _sq_dists(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    diff = A[:, None, :] - B[None, :, :]
+    return np.einsum("anb,anb->an", diff, diff)
+
+
+def edit_neighbours(X: Any, y: Any, weight: Any, k: int = 3) -> np.ndarray:
+    """Wilson-szerkesztés: a saját szomszédságuk által félreosztályozott sorok elhagyása.
+
+    A szavazás súlyozott (mint a modellben), a vizsgált sor önmagára nem szavaz; az azonos
+    (dx, dy) helyen álló, más akciójú sorok viszont igen.
+
+    Paraméterek:
+        X (array-like): (n, d) jellemzők.
+        y (array-like): (n,) címkék.
+        weight (array-like): (n,) mintasúlyok.
+        k (int): Szomszédszám.
+
+    Visszatérés:
+        np.ndarray: (n,) bool maszk – True, ha a sor megmarad.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y)
+    weight = np.asarray(weight, dtype=np.float64)
+    n = len(X)
+    if n <= k:
+        return np.ones(n, dtype=bool)
+    classes, labels = np.unique(y, return_inverse=True)
+    keep = np.ones(n, dtype=bool)
+    for start in range(0, n, CHUNK):
+        rows = np.arange(start, min(n, start + CHUNK))
+        d2 = _sq_dists(X[rows], X)
+        d2[np.arange(len(rows)), rows] = np.inf  # önmagára nem szavaz
+        nearest = np.argpartition(d2, k - 1, axis=1)[:, :k]
+        votes = np.zeros((len(rows), len(classes)))
+        np.add.at(votes, (np.repeat(np.arange(len(rows)), k), labels[nearest].reshape(-1)),
+                  weight[nearest].reshape(-1))
+        keep[rows] = np.argmax(votes, axis=1) == labels[rows]
+    # egy osztály se tűnjön el teljesen (különben a modell nem is ismerné)
+    for c in range(len(classes)):
+        members = labels == c
+        if not (keep & members).any():
+            keep[np.flatnonzero(members)[np.argmax(weight[members])]] = True
+    return keep
+
+
+def condense(X: Any, y: Any, weight: Any, seed: int = 0) -> np.ndarray:
+    """Hart-kondenzálás: minimális konzisztens részhalmaz az 1-NN szabályhoz.
+
+    Osztályonként a legnagyobb súlyú sorral indul, majd a sorokat (rögzített véletlen
+    sorrendben) addig járja újra, amíg mindegyiket helyesen osztályozza a legközelebbi
+    prototípus; a félreosztályozott sor prototípussá válik.
+
+    Visszatérés:
+        np.ndarray: (n,) bool maszk – True, ha a sor prototípus.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y)
+    weight = np.asarray(weight, dtype=np.float64)
+    n = len(X)
+    keep = np.zeros(n, dtype=bool)
+    for c in np.unique(y):
+        members = np.flatnonzero(y == c)
+        keep[members[np.argmax(weight[members])]] = True
+    order = np.random.default_rng(seed).permutation(n)
+    protos = list(np.flatnonzero(keep))
+    changed = True
+    while changed:
+        changed = False
+        start = 0
+        while start < n:
+            rows = order[start:start + CONDENSE_CHUNK]
+            P = np.asarray(protos)
+            nearest = P[np.argmin(_sq_dists(X[rows], X[P]), axis=1)]
+            wrong = np.flatnonzero((y[nearest] != y[rows]) & ~keep[rows])
+            if not len(wrong):
+                start += CONDENSE_CHUNK
+                continue
+            # az első tévesen osztályozott sor prototípus lesz; utána innen folytatjuk,
+            # mert az új prototípus a köteg további sorainak ítéletét is megváltoztathatja
+            first = rows[wrong[0]]
+            keep[first] = True
+            protos.append(first)
+            changed = True
+            start += int(wrong[0]) + 1
+    return keep
+
+
+def absorb_weights(X: Any, y: Any, weight: Any, keep: np.ndarray) -> np.ndarray:
+    """Az elhagyott sorok súlyát a legközelebbi azonos címkéjű megtartott sorhoz adja.
+
+    Visszatérés:
+        np.ndarray: (megtartott sorok,) új súlyok (int64); az összeg az eredeti súlyösszeg.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y)
+    weight = np.asarray(weight, dtype=np.int64)
+    kept = np.flatnonzero(keep)
+    new_weight = weight[kept].copy()
+    for c in np.unique(y[~keep]):
+        targets = kept[y[kept] == c]
+        dropped = np.flatnonzero(~keep & (y == c))
+        for start in range(0, len(dropped), CHUNK):
+            rows = dropped[start:start + CHUNK]
+            nearest = targets[np.argmin(_sq_dists(X[rows], X[targets]), axis=1)]
+            np.add.at(new_weight, np.searchsorted(kept, nearest), weight[rows])
+    return new_weight
+
+
+def reduce_prototypes(X: Any, y: Any, weight: Any, method: str, k: int = 3,
+                      seed: int = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """A tanítóhalmaz redukciója a megadott módszerrel.
+
+    Paraméterek:
+        X, y, weight (array-like): Tanítóadat (lásd `train_player_ai.load_training_data`).
+        method (str): `REDUCTION_METHODS` egyike.
+        k (int): A szerkesztés szomszédszáma (a modellével egyező).
+        seed (int): A kondenzálás bejárási sorrendjének magja.
+
+    Visszatérés:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: (X, y, weight) a prototípusokkal; a súlyok
+            összege megegyezik a bemenetével.
+
+    Kivétel dobása:
+        ValueError: Ismeretlen módszer esetén.
+    """
+    if method not in REDUCTION_METHODS:
+        raise ValueError(f"Ismeretlen redukció: {method!r} (választható: {', '.join(REDUCTION_METHODS)})")
+    X = np.asarray(X)
+    y = np.asarray(y)
+    weight = np.asarray(weight, dtype=np.int64)
+    keep = np.ones(len(y), dtype=bool)
+    if method in ("enn", "enn+cnn"):
+        keep = edit_neighbours(X, y, weight, k)
+    if method in ("cnn", "enn+cnn"):
+        idx = np.flatnonzero(keep)
+        keep = np.zeros(len(y), dtype=bool)
+        keep[idx[condense(X[idx], y[idx], weight[idx], seed)]] = True
+    return X[keep], y[keep], absorb_weights(X, y, weight, keep)
@@ -0,0 +1,213 @@
+"""Adaptív minőség-szabályozó: túlterhelt frame-eknél az elhagyható munka fokozatos leépítése.
+
+Ha a frame-munka (szimuláció + kirajzolás, várakozás nélkül) rendszeresen túllépi a
+keretet, a játék akkor is minden lépésben újraszínezi az ellenségeket, minden frame-ben
+újrarajzolja a HUD feliratait, és minden lépésben AI döntést számol. A `QualityGovernor`
+a legutóbbi frame-idők alapján szintenként kapcsolja le ezeket (`LEVELS`):
+
+    0 "full"     – minden be van kapcsolva;
+    1 "tint"     – a távolság-sáv szerinti újraszínezés befagy (a sprite-ok az utolsó színükön maradnak);
+    2 "hud"      – ezen felül a HUD (szint/pont/élet) csak `hud_every` frame-enként frissül;
+    3 "ai"       – ezen felül az AI akció `ai_hold` lépésig újrahasznosul (ritkább döntés);
+                   csak akkor érhető el, ha a hívó engedi (`QualityGovernor(ai_hold=True)`).
+
+A játékszabályok egyik szinten sem változnak: a mozgás, a véletlenszám-fogyasztás, az
+ütközés és a lövési cooldown ugyanaz; csak a látvány és az AI döntési gyakorisága romlik.
+Ha ismét van tartalék (a frame-idő tartósan a keret `recover_ratio`-szorosa alatt van),
+a szabályozó visszalép.
+
+    python main.py [--quality auto|off] [--frame-budget-ms 16.7]
+    python quality.py --enemies 2000 --budget-ms 8      # headless bemutató (szintek, frame-idők)
+"""
+
+import argparse
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+from helper import SIM_STEP_MS
+
+QUALITY_MODES = ("auto", "off")
+MAX_BACKOFF = 16
+AI_HOLD_LEVEL = 3   # az első szint, amely az AI döntést is ritkítja (`LEVELS`)
+
+
+class QualityLevel(NamedTuple):
+    """Egy minőségi szint beállításai.
+
+    Attribútumok:
+        name (str): A szint neve (kiírásokhoz, metrikához).
+        recolor (bool): Távolság-sáv szerinti ellenség-újraszínezés.
+        hud_every (int): A HUD értékei ennyi frame-enként frissülnek.
+        ai_hold (int): Ennyi lépésig újrahasznosul az utolsó AI akció (0: minden lépésben dönt).
+    """
+    name: str
+    recolor: bool
+    hud_every: int
+    ai_hold: int
+
+
+LEVELS = (
+    QualityLevel("full", True, 1, 0),
+    QualityLevel("tint", False, 1, 0),
+    QualityLevel("hud", False, 6, 0),    # 60 FPS-nél 10 Hz-es HUD
+    QualityLevel("ai", False, 6, 2),     # döntés minden 3. lépésben
+)
+
+
+class QualityGovernor:
+    """Frame-idő alapú minőség-szabályozó hiszterézissel.
+
+    A szabályozó csak egy teljes ablaknyi (`window`) frame után dönt az aktuális szinten:
+    ha az ablak p90 frame-ideje a keret fölött van, egy szinttel lejjebb lép; ha legalább
+    `recover_frames` frame óta ezen a szinten van, és a p90 a keret `recover_ratio`-szorosa
+    alatt marad, egy szinttel feljebb. Ha egy visszalépés után azonnal (egy ablakon belül)
+    újra le kell lépni, a következő visszalépés várakozása megduplázódik (legfeljebb
+    `MAX_BACKOFF`-szoros), így a határon álló terhelés nem billegteti a szinteket.
+
+    Attribútumok:
+        budget_ms (float): Frame-keret ms-ban (alapból egy szimulációs lépés).
+        enabled (bool): False esetén végig a teljes minőség marad (csak mér).
+        max_level (int): A legalacsonyabb elérhető szint indexe (az "ai" szint csak
+            `ai_hold=True` mellett érhető el).
+        level (int): Aktuális szint indexe a `LEVELS`-ben.
+        transitions (Dict[str,int]): Lelépések ("down") és visszalépések ("up") száma.
+        frames_at_level (List[int]): Szintenként eltöltött frame-ek.
+    """
+
+    def __init__(self, budget_ms: float = SIM_STEP_MS, enabled: bool = True, window: int = 30,
+                 recover_ratio: float = 0.6, recover_frames: int = 120, ai_hold: bool = True) -> None:
+        if budget_ms <= 0:
+            raise ValueError("a frame-keret pozitív kell legyen")
+        self.budget_ms = budget_ms
+        self.enabled = enabled
+        self.max_level = len(LEVELS) - 1 if ai_hold else AI_HOLD_LEVEL - 1
+        self.window = window
+        self.recover_ratio = recover_ratio
+        self.recover_frames = recover_frames
+        self.level = 0
+        self.transitions: Dict[str, int] = {"down": 0, "up": 0}
+        self.frames_at_level: List[int] = [0] * len(LEVELS)
+        self._recent: List[float] = []
+        self._since_change = 0
+        self._recover_wait = recover_frames
+
+    @property
+    def settings(self) -> QualityLevel:
+        """Az aktuális szint beállításai."""
+        return LEVELS[self.level]
+
+    def frame(self, work_ms: float) -> Optional[str]:
+        """Egy frame munkaidejének rögzítése; szintváltáskor visszaad (és kiír) egy sort.
+
+        Paraméterek:
+            work_ms (float): A frame munkaideje ms-ban (szimuláció + kirajzolás, várakozás nélkül).
+
+        Visszatérés:
+            Optional[str]: A szintváltás leírása vagy None.
+        """
+        self.frames_at_level[self.level] += 1
+        self._since_change += 1
+        recent = self._recent
+        recent.append(work_ms)
+        if len(recent) > self.window:
+            del recent[0]
+        if not self.enabled or len(recent) < self.window:
+            return None
+        p90 = sorted(recent)[int(self.window * 0.9)]
+        if p90 > self.budget_ms and self.level < self.max_level:
+            return self._change(+1, p90)
+        if (self.level > 0 and self._since_change >= self._recover_wait
+                and p90 < self.budget_ms * self.recover_ratio):
+            return self._change(-1, p90)
+        return None
+
+    def _change(self, step: int, p90: float) -> str:
+        old = LEVELS[self.level].name
+        if step > 0 and self.transitions["up"] and self._since_change <= self.window:
+            self._recover_wait = min(self._recover_wait * 2, self.recover_frames * MAX_BACKOFF)
+        self.level += step
+        self.transitions["down" if step > 0 else "up"] += 1
+        self._recent.clear()
+        self._since_change = 0
+        line = (f"[minőség] {old} -> {self.settings.name} (p90 frame {p90:.2f} ms, "
+                f"keret {self.budget_ms:.2f} ms)")
+        print(line)
+        return line
+
+    def summary(self) -> str:
+        """Egysoros összefoglaló: szintenkénti frame-arány és váltások."""
+        total = sum(self.frames_at_level) or 1
+        shares = ", ".join(f"{lvl.name} {n / total * 100:.0f}%"
+                           for lvl, n in zip(LEVELS, self.frames_at_level) if n)
+        return (f"minőség-szabályozó: {shares} | {self.transitions['down']} lelépés, "
+                f"{self.transitions['up']} visszalépés | keret {self.budget_ms:.2f} ms")
+
+
+def simulate(enemy_count: int, frames: int = 600, budget_ms: float = SIM_STEP_MS,
+             seed: int = 0) -> Dict[str, object]:
+    """Headless bemutató: színezett, kirajzolt szabály-AI játék a szabályozóval.
+
+    Frame-enként egy szimulációs lépés és a jelenet kirajzolása (HUD-dal) egy képernyőn
+    kívüli felületre; a szint beállításai ugyanúgy hatnak, mint a `main` játékkörében.
+
+    Visszatérés:
+        Dict[str,object]: {"governor": QualityGovernor, "frame_ms": szintenkénti átlagos frame-idő}
+    """
+    import pygame
+
+    import render
+    from headless import HeadlessGame, rule_policy
+    from helper import HEIGHT, WIDTH
+    from main import draw_ui
+    from stress import auto_grid
+
+    pygame.init()
+    screen = pygame.Surface((WIDTH, HEIGHT))
+    heart_img = pygame.Surface((32, 32), pygame.SRCALPHA)
+    game = HeadlessGame(1, seed, recolor=True, grid=auto_grid(enemy_count), enemy_count=enemy_count)
+    player_img = pygame.Surface(game.player_rect.size)
+    governor = QualityGovernor(budget_ms)
+    spent: List[List[float]] = [[] for _ in LEVELS]
+    hud = (game.level_data["level"], game.lives, game.score)
+    action, held = None, 0
+    for frame_no in range(frames):
+        q = governor.settings
+        t0 = time.perf_counter()
+        game.level_data["recolor_frozen"] = not q.recolor
+        if action is not None and held < q.ai_hold:
+            held += 1
+        else:
+            action, held = rule_policy(game), 0
+        if game.step(action):
+            break
+        if frame_no % q.hud_every == 0:
+            hud = (game.level_data["level"], game.lives, game.score)
+        render.begin_frame(screen)
+        render.draw_bullets(screen, game.bullets)
+        render.draw_enemies(screen, game.enemies)
+        render.draw_group(screen, game.powerups)
+        render.blit(screen, player_img, game.player_rect)
+        draw_ui(screen, hud[0], hud[1], heart_img, hud[2], True)
+        work_ms = (time.perf_counter() - t0) * 1000.0
+        spent[governor.level].append(work_ms)
+        governor.frame(work_ms)
+    frame_ms = {lvl.name: sum(s) / len(s) for lvl, s in zip(LEVELS, spent) if s}
+    return {"governor": governor, "frame_ms": frame_ms}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Parancssori belépési pont: a szabályozó viselkedése nagy ellenségrajjal."""
+    parser = argparse.ArgumentParser(description="Adaptív minőség-szabályozó headless bemutatója.")
+    parser.add_argument("--enemies", type=int, default=2000)
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--budget-ms", type=float, default=SIM_STEP_MS, help="frame-keret ms-ban")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    res = simulate(args.enemies, args.frames, args.budget_ms, args.seed)
+    for name, ms in res["frame_ms"].items():  # type: ignore[union-attr]
+        print(f"  {name:5s} átlag frame {ms:7.2f} ms")
+    print(res["governor"].summary())  # type: ignore[union-attr]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Kötegelt kirajzolás: előre renderelt lövedék-sprite, rétegenkénti `Surface.blits` és felirat-gyorsítótár.
+
+A `draw_game` korábban minden lövedéket külön `pygame.draw.circle`-lel, minden ellenséget
+külön `blit`-tel rajzolt, a `draw_ui` pedig minden frame-ben új `SysFont`-ot nyitott. Itt:
+    - a lövedék egyszer renderelődik (colorkey + RLE gyorsítás), utána csak másolódik;
+    - rétegenként (lövedékek, ellenségek, szívek) egyetlen `Surface.blits` hívás megy ki;
+    - a betűtípusok és a renderelt feliratok gyorsítótárból jönnek.
+
+A `stats` az utolsó frame rajzolási hívásait és kirajzolt sprite-jait számolja
+(`python bench.py render`).
+"""
+
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import pygame
+
+BULLET_RADIUS = 5
+BULLET_COLOR = (255, 255, 255)
+LABEL_CACHE_LIMIT = 256   # ennyi renderelt felirat fölött a gyorsítótárat ürítjük (a pontszám folyton változik)
+
+# az utolsó frame-ről: kiadott rajzolási hívások (fill/blit/blits/draw) és kirajzolt sprite-ok
+stats: Dict[str, int] = {"draw_calls": 0, "sprites": 0}
+
+_bullet: Dict[Tuple[int, Tuple[int, int, int]], pygame.Surface] = {}
+_fonts: Dict[int, pygame.font.Font] = {}
+_labels: Dict[Tuple[str, int, Tuple[int, int, int]], pygame.Surface] = {}
+
+
+def bullet_sprite(radius: int = BULLET_RADIUS, color: Tuple[int, int, int] = BULLET_COLOR) -> pygame.Surface:
+    """Az előre renderelt lövedék (egyszer készül, utána megosztott).
+
+    Pixelre ugyanaz, mint a `pygame.draw.circle(screen, color, (x, y), radius)`, ha a
+    sprite-ot a (x - radius, y - radius) pontra másoljuk.
+    """
+    key = (radius, color)
+    sprite = _bullet.get(key)
+    if sprite is None:
+        size = 2 * radius + 1
+        sprite = pygame.Surface((size, size))
+        key_color = (0, 0, 0) if color != (0, 0, 0) else (255, 0, 255)
+        sprite.fill(key_color)
+        pygame.draw.circle(sprite, color, (radius, radius), radius)
+        sprite.set_colorkey(key_color, pygame.RLEACCEL)
+        _bullet[key] = sprite
+    return sprite
+
+
+def font(size: int) -> pygame.font.Font:
+    """Gyorsítótárazott alapértelmezett betűtípus (`SysFont(None, size)`)."""
+    f = _fonts.get(size)
+    if f is None:
+        f = _fonts[size] = pygame.font.SysFont(None, size)
+    return f
+
+
+def label(text: str, size: int, color: Tuple[int, int, int]) -> pygame.Surface:
+    """Renderelt felirat; azonos (szöveg, méret, szín) hármasra újrahasznosul."""
+    key = (text, size, color)
+    surface = _labels.get(key)
+    if surface is None:
+        if len(_labels) >= LABEL_CACHE_LIMIT:
+            _labels.clear()
+        surface = _labels[key] = font(size).render(text, True, color)
+    return surface
+
+
+def begin_frame(screen: pygame.Surface, color: Tuple[int, int, int] = (0, 0, 0)) -> None:
+    """Új frame: háttér törlése és a számlálók nullázása."""
+    screen.fill(color)
+    stats["draw_calls"] = 1
+    stats["sprites"] = 0
+
+
+def blit_batch(screen: pygame.Surface, batch: Sequence[Tuple[pygame.Surface, Any]]) -> None:
+    """Egy réteg kirajzolása egyetlen `blits` hívással (üres rétegnél nincs hívás)."""
+    if not batch:
+        return
+    screen.blits(batch, doreturn=False)
+    stats["draw_calls"] += 1
+    stats["sprites"] += len(batch)
+
+
+def blit(screen: pygame.Surface, image: pygame.Surface, dest: Any) -> None:
+    """Egyedi sprite (játékos, felirat), a számlálókkal együtt."""
+    screen.blit(image, dest)
+    stats["draw_calls"] += 1
+    stats["sprites"] += 1
+
+
+def draw_bullets(screen: pygame.Surface, bullets: Iterable[Sequence[int]]) -> None:
+    """Minden lövedék egy `blits` kötegben, az előre renderelt sprite-tal."""
+    sprite = bullet_sprite()
+    r = BULLET_RADIUS
+    blit_batch(screen, [(sprite, (b[0] - r, b[1] - r)) for b in bullets])
+
+
+def draw_enemies(screen: pygame.Surface, enemies: List[Dict[str, Any]]) -> None:
+    """Minden ellenség egy `blits` kötegben."""
+    blit_batch(screen, [(e["image"], e["rect"]) for e in enemies])
+
+
+def draw_group(screen: pygame.Surface, group: pygame.sprite.Group) -> None:
+    """Sprite-csoport (`Group.draw` maga is egy `blits` köteg)."""
+    if group:
+        group.draw(screen)
+        stats["draw_calls"] += 1
+        stats["sprites"] += len(group)
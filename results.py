@@ -0,0 +1,318 @@
+"""Tartós mérési eredménytár (SQLite) és regresszió-riport.
+
+A `main.game_loop` AI-mérése (3 perces szakaszok módonként) minden lezárt szakaszt
+ide ír: pontszám, elért szint, túlélt szimulációs lépések, p95 frame-idő, AI döntési
+késleltetés, git revízió, nehézség, mag és a szakasz legmagasabb minőségi szintje
+(`quality_max`). A riport revíziónként összesít, és jelzi, ha az előző revízióhoz képest
+a pontszám vagy a teljesítmény a küszöbnél jobban romlott.
+
+    python results.py list [--limit 20]
+    python results.py report [--threshold 10] [--mode hybrid] [--difficulty normal]
+
+A `report` kilépési kódja 1, ha valamelyik csoport legutóbbi revíziója regressziót mutat.
+"""
+
+import argparse
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+DEFAULT_DB = "bench_results.sqlite"
+DEFAULT_THRESHOLD_PCT = 10.0
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    recorded TEXT NOT NULL,
+    git_rev TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    seed INTEGER,
+    score INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    frames INTEGER NOT NULL,
+    duration_s REAL NOT NULL,
+    frame_ms_p95 REAL,
+    decision_ms_mean REAL,
+    decision_ms_p95 REAL,
+    ended TEXT NOT NULL,
+    quality_max INTEGER
+);
+CREATE INDEX IF NOT EXISTS runs_group ON runs (mode, difficulty, git_rev);
+"""
+
+_COLUMNS = ("recorded", "git_rev", "mode", "difficulty", "seed", "score", "level", "frames",
+            "duration_s", "frame_ms_p95", "decision_ms_mean", "decision_ms_p95", "ended", "quality_max")
+
+
+def git_revision(cwd: Optional[str] = None) -> str:
+    """Az aktuális git revízió rövid hash-e ("-dirty" utótaggal, ha van nem commitolt változás).
+
+    Visszatérés:
+        str: Pl. "6a775a5" vagy "6a775a5-dirty"; git nélkül "unknown".
+    """
+    try:
+        out = subprocess.run(["git", "describe", "--always", "--dirty"], cwd=cwd or os.path.dirname(
+            os.path.abspath(__file__)), capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+    return out.stdout.strip() if out.returncode == 0 and out.stdout.strip() else "unknown"
+
+
+def _p95(values: Sequence[float]) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+class SegmentTracker:
+    """Egy mérési szakasz (egy AI mód egy futása) adatainak gyűjtése a játékkörben.
+
+    A döntési késleltetést a `DecisionLatencyGuard` (hisztogram) és a tervező
+    (`LookaheadPlanner.cpu_ms`) számlálóinak a szakasz eleje óta vett különbségéből számolja.
+    """
+
+    def __init__(self) -> None:
+        self.mode = ""
+        self._started = 0.0
+        self._frame_ms: List[float] = []
+        self._base_steps = 0
+        self._base_guard: Dict[str, Any] = {}
+        self._base_plan = (0, 0.0)
+        self._quality_max = 0
+
+    def start(self, mode: str, sim_steps: int, latency_guard: Any, planner: Any) -> None:
+        """Új szakasz kezdete.
+
+        Paraméterek:
+            mode (str): AI mód neve.
+            sim_steps (int): Eddigi szimulációs lépések (`FixedTimestep.sim.total`).
+            latency_guard (DecisionLatencyGuard): A játék döntés-őre.
+            planner (LookaheadPlanner): A játék tervezője.
+        """
+        self.mode = mode
+        self._started = time.perf_counter()
+        self._frame_ms = []
+        self._quality_max = 0
+        self._base_steps = sim_steps
+        self._base_guard = {"decisions": latency_guard.decisions, "total_ms": latency_guard.total_ms,
+                            "buckets": list(latency_guard.bucket_counts)}
+        self._base_plan = (planner.plans, planner.cpu_ms)
+
+    def frame(self, work_ms: float, quality_level: int = 0) -> None:
+        """Egy frame munkaideje (szimuláció + kirajzolás, várakozás nélkül) és minőségi szintje
+        (`QualityGovernor.level`; a szakasz legmagasabb szintje az eredménybe kerül)."""
+        self._frame_ms.append(work_ms)
+        if quality_level > self._quality_max:
+            self._quality_max = quality_level
+
+    def finish(self, score: int, level: int, sim_steps: int, latency_guard: Any, planner: Any,
+               ended: str) -> Dict[str, Any]:
+        """A szakasz lezárása; az eredmény `ResultStore.record`-nak átadható.
+
+        Paraméterek:
+            score (int): Elért pontszám.
+            level (int): Elért szint.
+            sim_steps (int): Szimulációs lépések összesen (`FixedTimestep.sim.total`).
+            latency_guard, planner: Mint `start`-nál.
+            ended (str): "timer" (letelt a szakasz ideje) vagy "game_over".
+
+        Visszatérés:
+            Dict[str,Any]: score, level, frames, duration_s, frame_ms_p95, decision_ms_mean,
+            decision_ms_p95, ended, quality_max, mode.
+        """
+        decision_mean: Optional[float] = None
+        decision_p95: Optional[float] = None
+        if self.mode == "plan":
+            plans = planner.plans - self._base_plan[0]
+            if plans:
+                decision_mean = (planner.cpu_ms - self._base_plan[1]) / plans
+        else:
+            decisions = latency_guard.decisions - self._base_guard["decisions"]
+            if decisions:
+                decision_mean = (latency_guard.total_ms - self._base_guard["total_ms"]) / decisions
+                counts = [now - before for now, before in
+                          zip(latency_guard.bucket_counts, self._base_guard["buckets"])]
+                seen = 0
+                decision_p95 = latency_guard.max_ms
+                for bound, count in zip(latency_guard.bucket_bounds_ms, counts):
+                    seen += count
+                    if seen >= 0.95 * decisions:
+                        decision_p95 = bound
+                        break
+        return {"mode": self.mode, "score": score, "level": level,
+                "frames": sim_steps - self._base_steps,
+                "duration_s": time.perf_counter() - self._started,
+                "frame_ms_p95": _p95(self._frame_ms), "decision_ms_mean": decision_mean,
+                "decision_ms_p95": decision_p95, "ended": ended, "quality_max": self._quality_max}
+
+
+class ResultStore:
+    """Hozzáfűző SQLite eredménytár.
+
+    Attribútumok:
+        path (str): Az adatbázisfájl.
+    """
+
+    def __init__(self, path: str = DEFAULT_DB) -> None:
+        """Megnyitja (szükség esetén létrehozza) az adatbázist.
+
+        Kivétel dobása:
+            sqlite3.Error: Ha a fájl nem nyitható vagy nem SQLite adatbázis.
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._conn.commit()
+
+    def record(self, run: Dict[str, Any], git_rev: Optional[str] = None,
+               difficulty: str = "normal", seed: Optional[int] = None) -> int:
+        """Egy mérés hozzáfűzése.
+
+        Paraméterek:
+            run (Dict[str,Any]): `SegmentTracker.finish` eredménye (vagy azonos kulcsú dict).
+            git_rev (Optional[str]): Revízió; None esetén `git_revision()`.
+            difficulty (str): Nehézség címkéje.
+            seed (Optional[int]): A játék magja.
+
+        Visszatérés:
+            int: Az új sor azonosítója.
+        """
+        row = dict(run)
+        row.update({"recorded": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "git_rev": git_rev or git_revision(), "difficulty": difficulty, "seed": seed})
+        cur = self._conn.execute(
+            f"INSERT INTO runs ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+            [row.get(c) for c in _COLUMNS])
+        self._conn.commit()
+        return int(cur.lastrowid)
+
+    def runs(self, limit: Optional[int] = None) -> List[sqlite3.Row]:
+        """A legutóbbi mérések (legújabb elöl)."""
+        sql = "SELECT * FROM runs ORDER BY id DESC"
+        return self._conn.execute(sql + (" LIMIT ?" if limit else ""),
+                                  (limit,) if limit else ()).fetchall()
+
+    def trends(self, mode: Optional[str] = None,
+               difficulty: Optional[str] = None) -> Dict[tuple, List[Dict[str, Any]]]:
+        """Revíziónkénti átlagok (mód, nehézség) csoportonként, első megjelenés szerinti sorrendben.
+
+        Visszatérés:
+            Dict[tuple,List[Dict]]: (mode, difficulty) -> [{"git_rev","n","score","level","frames",
+            "frame_ms_p95","decision_ms_mean"}, ...]
+        """
+        where, params = [], []
+        if mode:
+            where.append("mode = ?"); params.append(mode)
+        if difficulty:
+            where.append("difficulty = ?"); params.append(difficulty)
+        sql = ("SELECT mode, difficulty, git_rev, COUNT(*) AS n, AVG(score) AS score, "
+               "AVG(level) AS level, AVG(frames) AS frames, AVG(frame_ms_p95) AS frame_ms_p95, "
+               "AVG(decision_ms_mean) AS decision_ms_mean, MIN(id) AS first_id FROM runs "
+               + (f"WHERE {' AND '.join(where)} " if where else "")
+               + "GROUP BY mode, difficulty, git_rev ORDER BY mode, difficulty, first_id")
+        groups: Dict[tuple, List[Dict[str, Any]]] = {}
+        for row in self._conn.execute(sql, params):
+            groups.setdefault((row["mode"], row["difficulty"]), []).append(dict(row))
+        return groups
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def _change_pct(new: Optional[float], old: Optional[float]) -> Optional[float]:
+    if new is None or old is None or old == 0:
+        return None
+    return (new - old) / abs(old) * 100.0
+
+
+def regressions(current: Dict[str, Any], previous: Dict[str, Any],
+                threshold_pct: float = DEFAULT_THRESHOLD_PCT) -> List[str]:
+    """Egy revízió összevetése az előzővel.
+
+    Paraméterek:
+        current, previous (Dict[str,Any]): `ResultStore.trends` sorai.
+        threshold_pct (float): Megengedett romlás százalékban.
+
+    Visszatérés:
+        List[str]: A regressziók rövid leírása (üres, ha nincs).
+    """
+    found = []
+    score = _change_pct(current["score"], previous["score"])
+    if score is not None and score < -threshold_pct:
+        found.append(f"pont {score:+.1f}%")
+    for key, label in (("frame_ms_p95", "frame p95"), ("decision_ms_mean", "döntés")):
+        change = _change_pct(current[key], previous[key])
+        if change is not None and change > threshold_pct:
+            found.append(f"{label} {change:+.1f}%")
+    return found
+
+
+def _fmt(value: Optional[float], spec: str) -> str:
+    return "-" if value is None else format(value, spec)
+
+
+def report(store: ResultStore, threshold_pct: float = DEFAULT_THRESHOLD_PCT,
+           mode: Optional[str] = None, difficulty: Optional[str] = None) -> bool:
+    """Trend-táblázat kiírása csoportonként; True, ha a legutóbbi revízió valahol regressziót mutat."""
+    groups = store.trends(mode, difficulty)
+    if not groups:
+        print(f"Nincs mérés: {store.path}")
+        return False
+    latest_regressed = False
+    for (group_mode, group_difficulty), revs in groups.items():
+        print(f"\n{group_mode} / {group_difficulty}")
+        print(f"  {'revízió':<16} {'n':>3} {'pont':>8} {'szint':>6} {'lépés':>7} "
+              f"{'frame p95':>10} {'döntés ms':>10}  regresszió (előzőhöz, küszöb {threshold_pct:g}%)")
+        for i, rev in enumerate(revs):
+            flags = regressions(rev, revs[i - 1], threshold_pct) if i else []
+            if flags and i == len(revs) - 1:
+                latest_regressed = True
+            line = (f"  {rev['git_rev']:<16} {rev['n']:>3} {rev['score']:>8.0f} {rev['level']:>6.1f} "
+                    f"{rev['frames']:>7.0f} {_fmt(rev['frame_ms_p95'], '>7.2f')} ms "
+                    f"{_fmt(rev['decision_ms_mean'], '>10.3f')}")
+            print(line + ("  !! " + ", ".join(flags) if flags else ""))
+    return latest_regressed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Parancssori belépési pont. A visszatérési érték a folyamat kilépési kódja."""
+    parser = argparse.ArgumentParser(description="Mérési eredménytár: listázás és regresszió-riport")
+    parser.add_argument("--db", default=DEFAULT_DB, help="az SQLite adatbázis útvonala")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("list", help="a legutóbbi mérések")
+    p.add_argument("--limit", type=int, default=20)
+    p = sub.add_parser("report", help="revíziónkénti trend és regressziók")
+    p.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD_PCT,
+                   help="megengedett romlás százalékban (pont csökkenés, frame/döntés idő növekedés)")
+    p.add_argument("--mode", default=None)
+    p.add_argument("--difficulty", default=None)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"Nincs ilyen adatbázis: {args.db}")
+        return 2
+    store = ResultStore(args.db)
+    try:
+        if args.cmd == "list":
+            for row in store.runs(args.limit):
+                print(f"#{row['id']:<4} {row['recorded']} {row['git_rev']:<16} {row['mode']:<7} "
+                      f"{row['difficulty']:<7} seed={row['seed']} pont={row['score']} szint={row['level']} "
+                      f"lépés={row['frames']} frame p95={_fmt(row['frame_ms_p95'], '.2f')} ms "
+                      f"döntés={_fmt(row['decision_ms_mean'], '.3f')} ms "
+                      f"minőség max={_fmt(row['quality_max'], 'd')} ({row['ended']})")
+            return 0
+        return 1 if report(store, args.threshold, args.mode, args.difficulty) else 0
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
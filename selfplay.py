@@ -0,0 +1,163 @@
+"""Párhuzamos self-play adatgenerátor a `train_player_ai` számára.
+
+Sok headless játékot futtat párhuzamosan (folyamatonként egy shard), egy választott
+policyval (`helper.decide_action`, a hibrid AI, vagy "modul:függvény"), és a
+döntéseket ugyanabban a formátumban rögzíti, mint a manuális `log_example`:
+`dx, dy, action, speed_multiplier, enemy_count` (0=balra, 1=jobbra, 2=lő).
+
+Használat:
+    python selfplay.py --out selfplay_data --shards 8 --steps-per-shard 200000
+    python train_player_ai.py selfplay_data
+"""
+
+import argparse
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from helper import EXAMPLE_COLUMNS, Action, closest_enemy_center
+from headless import MAX_GAME_STEPS, HeadlessGame, resolve_policy
+
+
+def action_label(action: Optional[Action]) -> Optional[int]:
+    """AI akció leképezése a tanítóadat címkéjére.
+
+    Paraméterek:
+        action (Optional[Action]): {"move": ..., "shoot": ...}.
+
+    Visszatérés:
+        Optional[int]: 2 ha lő, 0/1 ha balra/jobbra mozog, különben None (nincs címke,
+        pl. "retreat" vagy helyben maradás).
+    """
+    if not action:
+        return None
+    if action.get("shoot"):
+        return 2
+    move = action.get("move")
+    if move == "left":
+        return 0
+    if move == "right":
+        return 1
+    return None
+
+
+def generate_shard(shard_index: int, out_dir: str, policy_name: str = "rule",
+                   steps: int = 100_000, sample_rate: float = 1.0,
+                   difficulty_index: int = 1, seed: int = 0,
+                   max_game_steps: int = MAX_GAME_STEPS) -> Dict[str, Any]:
+    """Egy shard legenerálása: játékok futtatása, amíg `steps` lépés össze nem gyűlik.
+
+    Paraméterek:
+        shard_index (int): A shard sorszáma (fájlnév és mag-eltolás).
+        out_dir (str): Kimeneti könyvtár.
+        policy_name (str): Policy neve (lásd `headless.resolve_policy`).
+        steps (int): Ennyi szimulációs lépést futtat összesen (több játékon át).
+        sample_rate (float): A lépések ekkora hányadát rögzíti (0 < rate <= 1), egyenletes
+            ritkítással (determinisztikus, nem fogyaszt a játék véletlenjéből).
+        difficulty_index (int): Nehézség (0..2).
+        seed (int): Alapmag; a shard i-edik játéka a `seed + shard_index * 100003 + i` magot kapja.
+        max_game_steps (int): Egy játék lépéskorlátja.
+
+    Visszatérés:
+        Dict[str,Any]: {"path","rows","steps","games","score_sum","seconds"}.
+
+    Kivétel dobása:
+        ValueError: Ha `sample_rate` nincs (0, 1] között.
+    """
+    if not 0 < sample_rate <= 1:
+        raise ValueError("sample_rate-nek (0, 1] között kell lennie")
+    policy = resolve_policy(policy_name)
+    path = Path(out_dir) / f"shard_{shard_index:05d}.csv"
+    rows = games = score_sum = done_steps = 0
+    sample_acc = 0.0
+    t0 = time.perf_counter()
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(EXAMPLE_COLUMNS)
+        while done_steps < steps:
+            game = HeadlessGame(difficulty_index, seed + shard_index * 100003 + games)
+            speed_multiplier = game.level_data["speed_multiplier"]
+            while not game.game_over and game.steps < max_game_steps and done_steps < steps:
+                action = policy(game)
+                sample_acc += sample_rate
+                if sample_acc >= 1.0:
+                    sample_acc -= 1.0
+                    label = action_label(action)
+                    center = closest_enemy_center(game.player_rect, game.enemies)
+                    if label is not None and center is not None:
+                        w.writerow([center[0] - game.player_rect.centerx,
+                                    center[1] - game.player_rect.centery,
+                                    label, speed_multiplier, len(game.enemies)])
+                        rows += 1
+                game.step(action)
+                done_steps += 1
+            games += 1
+            score_sum += game.score
+
+    return {"path": str(path), "rows": rows, "steps": done_steps, "games": games,
+            "score_sum": score_sum, "seconds": time.perf_counter() - t0}
+
+
+def generate(out_dir: str, shards: int, steps_per_shard: int, policy_name: str = "rule",
+             sample_rate: float = 1.0, difficulty_index: int = 1, seed: int = 0,
+             workers: Optional[int] = None) -> Dict[str, Any]:
+    """Több shard párhuzamos generálása folyamatkészleten.
+
+    Paraméterek:
+        out_dir (str): Kimeneti könyvtár (létrejön, ha nem létezik).
+        shards (int): Shardok száma.
+        steps_per_shard (int): Szimulációs lépések shardonként.
+        policy_name (str): Policy neve.
+        sample_rate (float): Mintavételi arány (0 < rate <= 1).
+        difficulty_index (int): Nehézség (0..2).
+        seed (int): Alapmag.
+        workers (Optional[int]): Folyamatok száma (None: CPU-k száma).
+
+    Visszatérés:
+        Dict[str,Any]: Összesített {"rows","steps","games","seconds","rows_per_hour"}.
+    """
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    t0 = time.perf_counter()
+    totals = {"rows": 0, "steps": 0, "games": 0, "score_sum": 0}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(generate_shard, i, out_dir, policy_name, steps_per_shard,
+                               sample_rate, difficulty_index, seed)
+                   for i in range(shards)]
+        for fut in as_completed(futures):
+            res = fut.result()
+            for key in totals:
+                totals[key] += res[key]
+            print(f"  {res['path']}: {res['rows']} sor, {res['games']} játék, "
+                  f"{res['steps'] / res['seconds']:.0f} lépés/s")
+    seconds = time.perf_counter() - t0
+    totals["seconds"] = seconds
+    totals["rows_per_hour"] = totals["rows"] / seconds * 3600 if seconds > 0 else 0.0
+    return totals
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Parancssori belépési pont."""
+    parser = argparse.ArgumentParser(description="Párhuzamos self-play tanítóadat-generátor")
+    parser.add_argument("--out", default="selfplay_data", help="kimeneti könyvtár a shardoknak")
+    parser.add_argument("--shards", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--steps-per-shard", type=int, default=100_000)
+    parser.add_argument("--policy", default="rule", help="rule | hybrid | modul:függvény")
+    parser.add_argument("--sample-rate", type=float, default=1.0)
+    parser.add_argument("--difficulty", type=int, default=1, choices=(0, 1, 2))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    totals = generate(args.out, args.shards, args.steps_per_shard, args.policy,
+                      args.sample_rate, args.difficulty, args.seed, args.workers)
+    print(f"Összesen: {totals['rows']} sor, {totals['games']} játék, "
+          f"{totals['seconds']:.1f} s -> {totals['rows_per_hour'] / 1e6:.2f} M sor/óra")
+
+
+if __name__ == "__main__":
+    main()
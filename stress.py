@@ -0,0 +1,168 @@
+"""Nagy ellenségrajos stressz-mód: skálázódási mérés az ellenségszám függvényében.
+
+Két használat:
+
+    python main.py --stress --enemies 600 [--grid 20x30]
+        Interaktív játék a megadott formációval; másodpercenként kiírja az élő
+        ellenségek számát, a frame-időt, a szimulációs lépés/s-t és a memóriát.
+
+    python stress.py --enemies 20,100,500,1000 [--recolor] [--steps 300]
+        Headless sorozatmérés: ellenségszámonként lépésidő (átlag/p95), lépés/s és RSS.
+        A `--recolor` a sprite-színezés költségét is beleméri (ez a kirajzolt játékban fut).
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from helper import COLS
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+
+def parse_grid(text: str) -> Tuple[int, int]:
+    """"SORxOSZLOP" formátumú rácsméret feldolgozása (pl. "20x30").
+
+    Kivétel dobása:
+        argparse.ArgumentTypeError: Hibás formátum vagy nem pozitív méret esetén.
+    """
+    try:
+        rows, cols = (int(v) for v in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"hibás rácsméret: {text!r} (várt: SORxOSZLOP, pl. 20x30)")
+    if rows <= 0 or cols <= 0:
+        raise argparse.ArgumentTypeError("a rács mérete pozitív kell legyen")
+    return rows, cols
+
+
+def auto_grid(enemy_count: int) -> Tuple[int, int]:
+    """Olyan (sorok, oszlopok) rács, amelybe `enemy_count` ellenség elfér (kb. 2:1 képarány)."""
+    cols = max(COLS, math.ceil(math.sqrt(enemy_count * 2)))
+    rows = max(1, math.ceil(enemy_count / cols))
+    return rows, cols
+
+
+def current_rss_mb() -> float:
+    """A folyamat aktuális rezidens memóriája MB-ban (Linuxon /proc, máshol a csúcsérték)."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    return 0.0
+
+
+class StressMonitor:
+    """Frame-idők gyűjtése és másodpercenkénti riport a stressz-módhoz.
+
+    Attribútumok:
+        interval_s (float): Riportok közti idő másodpercben.
+    """
+
+    def __init__(self, interval_s: float = 1.0) -> None:
+        self.interval_s = interval_s
+        self._frame_ms: List[float] = []
+        self._last_report = time.perf_counter()
+
+    def frame(self, work_ms: float) -> None:
+        """Egy frame munkaidejének (szimuláció + kirajzolás, várakozás nélkül) rögzítése."""
+        self._frame_ms.append(work_ms)
+
+    def maybe_report(self, enemies_alive: int, sim_rate: float) -> Optional[str]:
+        """Ha letelt az intervallum, visszaad (és kiír) egy riportsort, különben None.
+
+        Paraméterek:
+            enemies_alive (int): Élő ellenségek száma.
+            sim_rate (float): Mért szimulációs lépés/s.
+
+        Visszatérés:
+            Optional[str]: A riportsor vagy None.
+        """
+        now = time.perf_counter()
+        if now - self._last_report < self.interval_s or not self._frame_ms:
+            return None
+        frames = sorted(self._frame_ms)
+        avg = sum(frames) / len(frames)
+        p95 = frames[min(len(frames) - 1, int(len(frames) * 0.95))]
+        line = (f"[stressz] ellenség: {enemies_alive:5d} | frame átlag {avg:6.2f} ms, "
+                f"p95 {p95:6.2f} ms | sim {sim_rate:5.1f} lépés/s | RSS {current_rss_mb():6.1f} MB")
+        print(line)
+        self._frame_ms.clear()
+        self._last_report = now
+        return line
+
+
+def measure(enemy_count: int, steps: int = 300, recolor: bool = False,
+            grid: Optional[Tuple[int, int]] = None, seed: int = 0,
+            difficulty_index: int = 1) -> Dict[str, Any]:
+    """Headless mérés egy adott ellenségszámra.
+
+    Paraméterek:
+        enemy_count (int): Kezdő ellenségszám.
+        steps (int): Mért szimulációs lépések száma.
+        recolor (bool): Sprite-színezés bekapcsolva (a kirajzolt játék költsége).
+        grid (Optional[Tuple[int,int]]): Rács; None esetén `auto_grid`.
+        seed (int): Mag.
+        difficulty_index (int): Nehézség.
+
+    Visszatérés:
+        Dict[str,Any]: {"enemies","grid","step_ms_mean","step_ms_p95","steps_per_s","rss_mb","rss_delta_mb"}
+    """
+    from headless import HeadlessGame, rule_policy
+
+    grid = grid or auto_grid(enemy_count)
+    rss_before = current_rss_mb()
+    game = HeadlessGame(difficulty_index, seed, recolor=recolor, grid=grid,
+                        enemy_count=enemy_count)
+    samples: List[float] = []
+    t_start = time.perf_counter()
+    for _ in range(steps):
+        t0 = time.perf_counter()
+        game.step(rule_policy(game))
+        samples.append((time.perf_counter() - t0) * 1000.0)
+        if game.game_over:
+            break
+    elapsed = time.perf_counter() - t_start
+    samples.sort()
+    rss = current_rss_mb()
+    return {
+        "enemies": enemy_count,
+        "grid": f"{grid[0]}x{grid[1]}",
+        "step_ms_mean": sum(samples) / len(samples),
+        "step_ms_p95": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "steps_per_s": len(samples) / elapsed if elapsed > 0 else 0.0,
+        "rss_mb": rss,
+        "rss_delta_mb": rss - rss_before,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Parancssori belépési pont: skálázódási táblázat."""
+    parser = argparse.ArgumentParser(description="Stressz-mérés az ellenségszám függvényében")
+    parser.add_argument("--enemies", default="20,100,250,500,1000",
+                        help="vesszővel elválasztott ellenségszámok")
+    parser.add_argument("--steps", type=int, default=300)
+    parser.add_argument("--recolor", action="store_true", help="sprite-színezés beleszámítása")
+    parser.add_argument("--grid", type=parse_grid, default=None, help="fix rács, pl. 30x40")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'ellenség':>8} {'rács':>7} {'lépés ms':>9} {'p95 ms':>8} {'lépés/s':>9} {'RSS MB':>8} {'ΔRSS':>7}")
+    for n in (int(v) for v in args.enemies.split(",")):
+        r = measure(n, args.steps, args.recolor, args.grid, args.seed)
+        print(f"{r['enemies']:>8} {r['grid']:>7} {r['step_ms_mean']:>9.3f} {r['step_ms_p95']:>8.3f} "
+              f"{r['steps_per_s']:>9.0f} {r['rss_mb']:>8.1f} {r['rss_delta_mb']:>+7.1f}")
+
+
+if __name__ == "__main__":
+    main()
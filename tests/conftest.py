@@ -0,0 +1,8 @@
+"""Közös pytest-beállítás: a repó gyökere az import-útvonalon, pygame láthatatlan kijelzővel."""
+
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
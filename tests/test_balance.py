@@ -0,0 +1,44 @@
+"""`balance`: paraméter-megadás, rács és a lépéskorlátot figyelembe vevő rangsor."""
+
+import argparse
+import math
+
+import pytest
+
+from balance import grid_points, parse_param, rank_key
+
+
+def test_parse_param_list_and_range():
+    assert parse_param("lives=1,3") == ("lives", [1.0, 3.0])
+    assert parse_param("enemy_jump_chance_far=0.01:0.05:5") == ("enemy_jump_chance_far", (0.01, 0.05, 5))
+    name, (lo, hi, n) = parse_param("enemy_jump_chance_far=0.01:0.05")
+    assert (name, lo, hi) == ("enemy_jump_chance_far", 0.01, 0.05) and n >= 1
+
+
+@pytest.mark.parametrize("text", ["nincs_ilyen=1,2", "lives", "lives=a,b", "lives=3:1", "lives=1:2:0",
+                                  "lives=1:2:3:4"])
+def test_parse_param_rejects(text):
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_param(text)
+
+
+def test_grid_points_product_and_int_dedup():
+    points = grid_points([("enemy_jump_chance_far", (0.0, 0.1, 3)), ("lives", [1.0, 3.0])])
+    assert len(points) == 6
+    assert {p["lives"] for p in points} == {1, 3}
+    assert all(isinstance(p["lives"], int) for p in points)
+    assert [p["enemy_jump_chance_far"] for p in points[::2]] == pytest.approx([0.0, 0.05, 0.1])
+    # egészre kerekítve 1, 1.2, 1.4 ... egybeesik: minden pont csak egyszer
+    assert grid_points([("lives", (1.0, 2.0, 6))]) == [{"lives": 1}, {"lives": 2}]
+
+
+def _res(capped_rate, survival, score=0.0):
+    return {"capped_rate": capped_rate, "survival_s": survival, "ended": 0 if math.isnan(survival) else 1,
+            "score": score}
+
+
+def test_rank_key_prefers_capped_then_survival():
+    ranked = sorted([_res(0.0, 40.0), _res(0.5, 20.0), _res(0.5, 30.0), _res(1.0, math.nan, 5.0),
+                     _res(1.0, math.nan, 9.0)], key=rank_key, reverse=True)
+    assert [(r["capped_rate"], r["score"]) for r in ranked[:2]] == [(1.0, 9.0), (1.0, 5.0)]
+    assert [r["survival_s"] for r in ranked[2:]] == [30.0, 20.0, 40.0]
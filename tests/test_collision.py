@@ -0,0 +1,100 @@
+"""`collision`: rect előszűrés, maszk-alapú döntés és a lövedékek söpört (szakasz-) ütközése."""
+
+import pygame
+import pytest
+
+from collision import segment_entry, sprites_overlap
+from helper import _scaled_chance, handle_bullet_collisions, move_bullets
+
+
+def _mask(size, pixels):
+    """`size` méretű maszk, csak a `pixels` pontok beállítva."""
+    mask = pygame.mask.Mask(size)
+    for p in pixels:
+        mask.set_at(p)
+    return mask
+
+
+def test_segment_entry_without_mask_hits_rect_bottom():
+    rect = pygame.Rect(10, 10, 8, 8)
+    assert segment_entry(rect, None, 12, 0, 30) == 17
+    assert segment_entry(rect, None, 12, 12, 30) == 17
+    assert segment_entry(rect, None, 12, 0, 5) is None      # a szakasz a sprite fölött véget ér
+    assert segment_entry(rect, None, 18, 0, 30) is None     # a jobb szél már nem része
+
+
+def test_segment_entry_returns_lowest_opaque_pixel():
+    rect = pygame.Rect(10, 10, 8, 8)
+    mask = _mask(rect.size, [(2, 1), (2, 4)])
+    assert segment_entry(rect, mask, 12, 0, 30) == 14       # alulról az (2, 4) pixel jön először
+    assert segment_entry(rect, mask, 12, 0, 13) == 11       # a szakasz nem ér le a (2, 4)-ig
+    assert segment_entry(rect, mask, 13, 0, 30) is None     # átlátszó oszlop
+
+
+def test_segment_entry_falls_back_to_rect_for_mismatched_mask():
+    rect = pygame.Rect(0, 0, 8, 8)
+    assert segment_entry(rect, pygame.mask.Mask((4, 4)), 3, 0, 20) == 7
+
+
+def test_sprites_overlap_uses_masks_after_rect_test():
+    a = pygame.Rect(0, 0, 4, 4)
+    b = pygame.Rect(2, 2, 4, 4)
+    corner_a = _mask(a.size, [(0, 0)])
+    corner_b = _mask(b.size, [(0, 0)])
+    full = pygame.mask.Mask((4, 4), fill=True)
+    assert sprites_overlap(a, None, b, None)
+    assert not sprites_overlap(a, corner_a, b, corner_b)    # a rect-ek fednek, a pixelek nem
+    assert sprites_overlap(a, full, b, corner_b)            # b (0,0) pixele = a (2,2) pixele
+    assert not sprites_overlap(a, full, pygame.Rect(4, 0, 4, 4), full)
+
+
+# --- söpört lövedék-ütközés (`helper.move_bullets` + `helper.handle_bullet_collisions`) ---
+
+def _enemy(x, y, size=(20, 10), mask=None):
+    return {"rect": pygame.Rect((x, y), size), "mask": mask}
+
+
+def _shoot(bullets, enemies, scale):
+    """Egy lépés a játék sorrendjében: mozgás, majd találatvizsgálat a bejárt szakaszon."""
+    level_data = {"step_scale": scale}
+    move_bullets(bullets, scale)
+    return handle_bullet_collisions(bullets, enemies, pygame.sprite.Group(), 0, {}, level_data)
+
+
+def test_bullet_cannot_tunnel_through_enemy_at_coarse_step():
+    scale = 8                                               # 80 px/lépés, az ellenség csak 10 px magas
+    enemies = [_enemy(90, 100)]
+    bullets = [[100, 150]]                                  # a lépés végén (y=70) már az ellenség fölött
+    assert _shoot(bullets, enemies, scale) == 10
+    assert bullets == [] and enemies == []
+
+
+def test_first_enemy_along_segment_is_hit():
+    upper, lower = _enemy(90, 40), _enemy(90, 100)
+    enemies = [upper, lower]
+    bullets = [[100, 150]]
+    assert _shoot(bullets, enemies, 8) == 10
+    assert enemies == [upper]                               # alulról érkezik: az alsó kapja
+
+
+def test_transparent_column_lets_bullet_through():
+    mask = pygame.mask.Mask((20, 10), fill=True)
+    for y in range(10):
+        mask.set_at((10, y), 0)                             # átlátszó oszlop a lövedék vonalában
+    enemies = [_enemy(90, 100, mask=mask)]
+    bullets = [[100, 150]]
+    assert _shoot(bullets, enemies, 8) == 0
+    assert len(enemies) == 1 and bullets == [[100, 70]]
+
+
+def test_top_edge_hit_then_offscreen_bullets_dropped():
+    enemies = [_enemy(90, 0)]
+    bullets = [[100, 5], [300, 5]]                          # mindkettő a felső szélen túlra lép
+    assert _shoot(bullets, enemies, 1) == 10
+    assert enemies == [] and bullets == []                  # a találat megvan, a másik törlődik
+
+
+def test_scaled_chance_is_at_least_once_probability():
+    assert _scaled_chance(0.1, 1) == 0.1
+    assert _scaled_chance(0.1, 3) == pytest.approx(1 - 0.9 ** 3)
+    assert _scaled_chance(0.0, 4) == 0.0 and _scaled_chance(1.0, 4) == 1.0
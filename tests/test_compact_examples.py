@@ -0,0 +1,40 @@
+"""`compact_examples`: összevonás és `.npz` oda-vissza út."""
+
+import numpy as np
+import pytest
+
+from compact_examples import compact, dataset_info, load_dataset, save_dataset
+
+
+def test_compact_merges_duplicates_with_weights():
+    X, y, w = compact([[1, 2], [1, 2], [1, 2], [3, 4]], [0, 0, 1, 0])
+    assert X.tolist() == [[1, 2], [1, 2], [3, 4]]
+    assert y.tolist() == [0, 1, 0]
+    assert w.tolist() == [2, 1, 1]
+    assert w.sum() == 4                                     # minden eredeti példa képviselve
+
+
+def test_compact_quantum_and_existing_weights():
+    X, y, w = compact([[0.9, 0.0], [1.2, 0.0]], [2, 2], weight=[3, 4], quantum=1.0)
+    assert X.tolist() == [[1.0, 0.0]] and y.tolist() == [2] and w.tolist() == [7]
+    with pytest.raises(ValueError):
+        compact([[0, 0]], [0], quantum=-1.0)
+
+
+def test_save_load_round_trip(tmp_path):
+    dataset = compact([[5, -3], [5, -3], [0, 7]], [1, 1, 2], quantum=0.5)
+    path = str(tmp_path / "examples.npz")
+    save_dataset(path, dataset, quantum=0.5, sources=["examples.csv"])
+    for loaded, original in zip(load_dataset(path), dataset):
+        assert loaded.dtype == original.dtype
+        np.testing.assert_array_equal(loaded, original)
+    assert dataset_info(path) == {"rows": 2, "examples": 3, "quantum": 0.5, "sources": ["examples.csv"]}
+
+
+def test_load_dataset_rejects_foreign_npz(tmp_path):
+    path = tmp_path / "other.npz"
+    np.savez(path, a=np.zeros(2))
+    with pytest.raises(ValueError):
+        load_dataset(str(path))
+    with pytest.raises(FileNotFoundError):
+        load_dataset(str(tmp_path / "missing.npz"))
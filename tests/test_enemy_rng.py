@@ -0,0 +1,74 @@
+"""`helper.move_enemies` kötegelt sorsolása: ugrásgyakoriság, irány-egyensúly, reprodukálhatóság."""
+
+import math
+
+import numpy as np
+import pygame
+
+import helper
+
+Z_LIMIT = 4.0
+
+
+def _binomial_z(hits, trials, p):
+    """Az empirikus gyakoriság eltérése `p`-től, szórásegységben (normál közelítés)."""
+    return (hits / trials - p) / math.sqrt(p * (1 - p) / trials)
+
+
+def _player():
+    rect = pygame.Rect(0, 0, 20, 20)
+    rect.center = (helper.WIDTH // 2, helper.HEIGHT // 2)
+    return rect
+
+
+def _enemies(starts):
+    return [{"rect": pygame.Rect(x, y, 2, 2), "image": None, "float_x": float(x), "float_y": float(y)}
+            for x, y in starts]
+
+
+def test_jump_rates_and_directions_match_constants():
+    """Minden lépés előtt az ellenségek visszakerülnek a kiinduló helyükre (közeli és távoli
+    sáv), így egy lépés ellenségenként egy független Bernoulli-kísérlet."""
+    player_rect = _player()
+    per_band, steps = 50, 2000
+    # közeli sáv: a játékos közepén; távoli: ~180 px-re (a követési küszöbön belül, hogy a
+    # sima mozgás ne keveredjen az ugrással)
+    starts = ([(player_rect.centerx - 1, player_rect.centery - 1)] * per_band +
+              [(player_rect.centerx - 1, player_rect.centery - 181)] * per_band)
+    enemies = _enemies(starts)
+    level_data = {"rng": np.random.default_rng(0), "recolor": False}
+    counts = {"close": [0, 0, 0], "far": [0, 0, 0]}         # [kísérlet, ugrás, negatív x-irány]
+    for _ in range(steps):
+        for e, (x, y) in zip(enemies, starts):
+            e["float_x"], e["float_y"] = float(x), float(y)
+            e["rect"].topleft = (x, y)
+        helper.move_enemies(enemies, level_data, player_rect)
+        for i, (e, (x, _y)) in enumerate(zip(enemies, starts)):
+            band = counts["close" if i < per_band else "far"]
+            band[0] += 1
+            shift = e["float_x"] - x
+            if abs(shift) >= helper.ENEMY_JUMP_DISTANCE - 1:
+                band[1] += 1
+                band[2] += shift < 0
+    for band, p in (("close", helper.ENEMY_JUMP_CHANCE_CLOSE), ("far", helper.ENEMY_JUMP_CHANCE_FAR)):
+        trials, jumps, negative = counts[band]
+        assert abs(_binomial_z(jumps, trials, p)) < Z_LIMIT, (band, jumps / trials, p)
+        assert abs(_binomial_z(negative, jumps, 0.5)) < Z_LIMIT, (band, negative, jumps)
+
+
+def _run(seed, steps=200):
+    player_rect = _player()
+    rng = np.random.default_rng(seed)
+    starts = [(int(x), int(y)) for x, y in rng.integers(0, 400, size=(40, 2))]
+    enemies = _enemies(starts)
+    level_data = {"rng": np.random.default_rng(seed), "recolor": False}
+    trace = []
+    for _ in range(steps):
+        helper.move_enemies(enemies, level_data, player_rect)
+        trace.append([(e["float_x"], e["float_y"]) for e in enemies])
+    return trace
+
+
+def test_same_seed_reproduces_move_enemies():
+    assert _run(3) == _run(3)
+    assert _run(3) != _run(4)
@@ -0,0 +1,73 @@
+"""`gamestate.GameState`: pillanatkép → léptetés → visszaállítás → léptetés ugyanazt adja."""
+
+import numpy as np
+import pytest
+
+from gamestate import GameState
+from headless import HeadlessGame, rule_policy
+
+STEPS = 120
+# rögzített akciósor: mozgás mindkét irányba és folyamatos lövés (találatok, pontszám)
+ACTIONS = [{"move": "left" if (i // 20) % 2 else "right", "shoot": True} for i in range(STEPS)]
+
+
+def _fingerprint(state):
+    """Összevethető állapot: ellenségek, lövedékek, pont, élet, játékidő és a következő RNG-húzások.
+
+    Az RNG-t egy másolaton húzzuk, hogy a vizsgált állapot ne változzon.
+    """
+    state._ensure_rng()
+    rng = np.random.Generator(np.random.PCG64(0))
+    rng.bit_generator.state = state.level_data["rng"].bit_generator.state
+    enemies = [(tuple(e["rect"]), e["float_x"], e["float_y"]) for e in state.enemies]
+    return (enemies, [tuple(b) for b in state.bullets], state.score, state.lives, state.time_ms,
+            state.player_rect.topleft, rng.random(8).tolist())
+
+
+@pytest.fixture(scope="module")
+def game():
+    game = HeadlessGame(1, seed=7)
+    for _ in range(60):                                     # legyenek lövedékek és időzítők is
+        game.step(rule_policy(game))
+    return game
+
+
+def test_capture_defers_rng_and_leaves_live_game_untouched(game):
+    live_state = game.level_data["rng"].bit_generator.state
+    root = game.snapshot()
+    assert root.level_data["rng"] is None                   # halasztott: csak léptetéskor bomlik ki
+    scratch = root.clone()
+    for action in ACTIONS:
+        scratch.step(action)
+    assert game.level_data["rng"].bit_generator.state == live_state
+    assert root.level_data["rng"] is None
+
+
+def test_restore_replays_identically(game):
+    root = game.snapshot()
+    scratch = root.clone()
+    runs = []
+    for _ in range(2):
+        scratch.restore(root)
+        assert scratch.level_data["rng"] is None            # újra halasztott, a root állapotából
+        for action in ACTIONS:
+            scratch.step(action)
+        runs.append(_fingerprint(scratch))
+    assert runs[0] == runs[1]
+    assert runs[0][:2] != _fingerprint(root)[:2]            # a lépések tényleg változtattak
+    fresh = root.clone()
+    for action in ACTIONS:
+        fresh.step(action)
+    assert _fingerprint(fresh) == runs[0]                   # független klón is ugyanoda jut
+
+
+def test_snapshot_steps_match_live_game(game):
+    root = game.snapshot()
+    branch = root.clone()
+    for action in ACTIONS:
+        branch.step(action)
+    live = HeadlessGame(1, seed=0)
+    live.restore(root)                                      # `apply_to`: az élő objektumokba
+    for action in ACTIONS:
+        live.step(action)
+    assert _fingerprint(live.snapshot()) == _fingerprint(branch)
@@ -0,0 +1,58 @@
+"""`knn_model.NumpyKNN`: ugyanazt jósolja, mint az sklearn modell (holtversenyekben is)."""
+
+import numpy as np
+import pytest
+from sklearn.neighbors import KNeighborsClassifier
+
+from compact_examples import WeightedKNeighborsClassifier
+from knn_model import NumpyKNN
+
+
+def _data(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.integers(-20, 21, size=(n, 2)).astype(float)   # egész rács: sok azonos távolság
+    y = rng.integers(0, 3, size=n)
+    return X, y, rng
+
+
+@pytest.mark.parametrize("weights", ["uniform", "distance"])
+def test_matches_weighted_sklearn_on_random_and_tied_queries(weights):
+    X, y, rng = _data()
+    w = rng.integers(1, 4, size=len(y))
+    model = WeightedKNeighborsClassifier(n_neighbors=3, weights=weights).fit(X, y, sample_weight=w)
+    knn = NumpyKNN.from_sklearn(model)
+    random_q = rng.uniform(-25, 25, size=(2 * knn.chunk + 7, 2))     # több köteg
+    integer_q = np.round(random_q)
+    assert knn.tied_at_k(integer_q).any()                   # tényleg vannak holtversenyek
+    for queries in (random_q, integer_q, X):
+        np.testing.assert_array_equal(knn.predict(queries), model.predict(queries))
+        np.testing.assert_allclose(knn.predict_proba(queries), model.predict_proba(queries))
+
+
+def test_matches_plain_sklearn_where_no_tie():
+    X, y, rng = _data(seed=1)
+    model = KNeighborsClassifier(n_neighbors=5).fit(X, y)
+    knn = NumpyKNN.from_sklearn(model)
+    queries = rng.uniform(-25, 25, size=(3000, 2))
+    free = ~knn.tied_at_k(queries)
+    np.testing.assert_array_equal(knn.predict(queries[free]), model.predict(queries[free]))
+
+
+def test_batches_larger_than_chunk(monkeypatch):
+    X, y, rng = _data(seed=2)
+    knn = NumpyKNN.from_sklearn(WeightedKNeighborsClassifier(n_neighbors=3).fit(X, y))
+    queries = np.round(rng.uniform(-25, 25, size=(500, 2)))
+    whole, ties = knn.predict(queries), knn.tied_at_k(queries)
+    monkeypatch.setattr("knn_model.QUERY_CHUNK", 7)
+    assert knn.chunk == 7
+    np.testing.assert_array_equal(knn.predict(queries), whole)
+    np.testing.assert_array_equal(knn.tied_at_k(queries), ties)
+
+
+def test_save_load_round_trip(tmp_path):
+    X, y, rng = _data(seed=3)
+    knn = NumpyKNN.from_sklearn(WeightedKNeighborsClassifier(n_neighbors=3).fit(X, y))
+    path = str(tmp_path / "model.npz")
+    knn.save(path)
+    queries = rng.uniform(-25, 25, size=(100, 2))
+    np.testing.assert_array_equal(NumpyKNN.load(path).predict(queries), knn.predict(queries))
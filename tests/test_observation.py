@@ -0,0 +1,46 @@
+"""`observation.PixelObserver`: halmozási sorrend és egyezés a másolatos alappal."""
+
+import numpy as np
+import pygame
+import pytest
+
+from observation import PixelObserver, copy_observation
+
+SIZE = (16, 12)
+
+
+def _surface(gray):
+    surface = pygame.Surface(SIZE, depth=32)
+    surface.fill((gray, gray, gray))
+    return surface
+
+
+def test_stack_is_oldest_to_newest_across_wraparound():
+    observer = PixelObserver(SIZE, factor=4, stack=3)
+    assert observer.observe(_surface(10)).shape == (3, 3, 4)
+    obs = observer.stacked()
+    assert [int(f[0, 0]) for f in obs] == [0, 0, 10]        # kezdetben nullákkal kitöltve (a súlyok összege 256)
+    for gray in (20, 30, 40, 50):                           # a gyűrű többször is körbeér
+        obs = observer.observe(_surface(gray))
+    assert [int(f[0, 0]) for f in obs] == [30, 40, 50]
+    assert int(observer.latest[0, 0]) == 50
+    assert not obs.flags.writeable
+
+
+def test_reset_clears_stack():
+    observer = PixelObserver(SIZE, factor=2, stack=2)
+    observer.observe(_surface(100))
+    observer.reset()
+    assert not observer.stacked().any()
+
+
+def test_matches_copy_baseline():
+    rng = np.random.default_rng(0)
+    surface = pygame.surfarray.make_surface(rng.integers(0, 256, SIZE + (3,), dtype=np.uint8))
+    observer = PixelObserver(SIZE, factor=3)
+    assert np.array_equal(observer.observe(surface)[0], copy_observation(surface, 3))
+
+
+def test_rejects_wrong_size():
+    with pytest.raises(ValueError):
+        PixelObserver(SIZE).observe(pygame.Surface((8, 8)))
@@ -0,0 +1,22 @@
+"""`quality.QualityGovernor`: lelépés a keret fölött, az "ai" szint csak engedéllyel."""
+
+from quality import AI_HOLD_LEVEL, LEVELS, QualityGovernor
+
+
+def _overload(governor, frames=400):
+    for _ in range(frames):
+        governor.frame(governor.budget_ms * 2)
+
+
+def test_steps_down_to_ai_level_when_allowed():
+    governor = QualityGovernor(10.0, window=5)
+    _overload(governor)
+    assert governor.level == len(LEVELS) - 1 and governor.settings.ai_hold
+
+
+def test_skips_ai_level_when_hold_disallowed():
+    governor = QualityGovernor(10.0, window=5, ai_hold=False)
+    _overload(governor)
+    assert governor.level == AI_HOLD_LEVEL - 1
+    assert not governor.settings.ai_hold
+    assert governor.transitions["down"] == AI_HOLD_LEVEL - 1
@@ -0,0 +1,65 @@
+"""`timers.TimerHeap` és a rá épülő power-up / lövési cooldown események (`helper.process_timers`)."""
+
+from helper import (BASE_SHOOT_DELAY, POWERUP_DURATIONS, POWERUP_SHOOT_DELAYS, activate_powerup,
+                    process_timers, refresh_shot_cooldown, update_shoot_delay)
+from timers import TimerHeap
+
+STAR = POWERUP_DURATIONS["star"]
+
+
+def _level_data():
+    return {"last_shot_time": 0, "timers": TimerHeap()}
+
+
+def test_pop_due_returns_due_events_in_order():
+    timers = TimerHeap()
+    timers.schedule(30, "c")
+    timers.schedule(10, "a", 1)
+    timers.schedule(10, "b", 2)                             # azonos időnél a felvétel sorrendje
+    assert timers.pop_due(5) == []
+    assert timers.pop_due(10) == [("a", 1), ("b", 2)]
+    assert len(timers) == 1 and timers.fired == 2
+    copy = timers.copy()
+    assert timers.pop_due(100) == [("c", None)]
+    assert len(copy) == 1                                   # a másolat független
+
+
+def test_effect_expires_and_restores_shoot_delay():
+    level_data, player_powerups = _level_data(), {}
+    activate_powerup("star", player_powerups, level_data, 1000)
+    assert update_shoot_delay(player_powerups) == POWERUP_SHOOT_DELAYS["star"]
+    process_timers(1000 + STAR - 1, level_data, [], player_powerups)
+    assert "star" in player_powerups
+    process_timers(1000 + STAR, level_data, [], player_powerups)
+    assert player_powerups == {}
+    assert update_shoot_delay(player_powerups) == BASE_SHOOT_DELAY
+
+
+def test_rearmed_effect_ignores_stale_expiry():
+    level_data, player_powerups = _level_data(), {}
+    activate_powerup("star", player_powerups, level_data, 1000)
+    activate_powerup("star", player_powerups, level_data, 3000)   # újra felvéve, mielőtt lejárt
+    process_timers(1000 + STAR, level_data, [], player_powerups)
+    assert player_powerups == {"star": 3000}                # az első lejárat már érvénytelen
+    process_timers(3000 + STAR, level_data, [], player_powerups)
+    assert player_powerups == {}
+
+
+def test_shot_ready_is_invalidated_by_newer_generation():
+    level_data = _level_data()
+    refresh_shot_cooldown(level_data, 100, 0)               # 101 ms-nál lenne kész
+    refresh_shot_cooldown(level_data, 300, 50)              # hosszabb késleltetés: 301 ms-nál
+    assert level_data["shot_ready"] is False
+    process_timers(101, level_data, [], {})
+    assert level_data["shot_ready"] is False                # régi generáció: nem hat
+    process_timers(301, level_data, [], {})
+    assert level_data["shot_ready"] is True
+
+
+def test_powerup_despawn_is_returned_to_caller():
+    level_data = _level_data()
+    marker = object()
+    level_data["timers"].schedule(500, "powerup_despawn", marker)
+    assert process_timers(499, level_data, [], {}) == []
+    assert process_timers(500, level_data, [], {}) == [marker]
+    assert process_timers(600, {}, [], {}) == []            # időzítő nélkül nincs teendő
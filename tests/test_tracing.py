@@ -0,0 +1,76 @@
+"""`tracing.Tracer`: gyűrűpuffer körbeérése és a rekordok időrendje."""
+
+import json
+import types
+
+import pytest
+
+from tracing import DETAIL_PHASES, INSTANT, Tracer, instrument
+
+
+def test_records_before_wraparound():
+    tracer = Tracer(capacity=4)
+    nid = tracer.name_id("lépés")
+    assert tracer.name_id("lépés") == nid
+    tracer.span(nid, tracer.now(), 7)
+    tracer.event(tracer.name_id("lövés"))
+    records = tracer.records()
+    assert [(name, arg) for _, _, name, arg in records] == [("lépés", 7), ("lövés", 0)]
+    assert records[0][1] >= 0 and records[1][1] == INSTANT
+    assert tracer.written == 2
+
+
+def test_wraparound_keeps_latest_in_order():
+    tracer = Tracer(capacity=3)
+    nid = tracer.name_id("x")
+    for i in range(1, 8):
+        tracer.event(nid, i)
+    assert [arg for _, _, _, arg in tracer.records()] == [5, 6, 7]
+    assert tracer.written == 7
+    tracer.event(nid, 8)                                    # pontosan a puffer határán
+    assert [arg for _, _, _, arg in tracer.records()] == [6, 7, 8]
+
+
+def test_wrapped_functions_write_same_ring():
+    tracer = Tracer(capacity=3)
+    plain = tracer.wrap(lambda: None, "üres")               # beépített (inline) írás
+    counted = tracer.wrap(lambda items: items.pop(), "pop", counted=0, event="kivét")
+    for _ in range(2):
+        plain()
+        counted([1, 2])                                     # szakasz + esemény (1 elem fogyott)
+    # írások: üres, pop, kivét, üres, pop, kivét -> a legutóbbi három marad
+    assert [(name, arg) for _, _, name, arg in tracer.records()] == [("üres", 0), ("pop", 0), ("kivét", 1)]
+    assert tracer.written == 6
+
+
+def test_export_chrome(tmp_path):
+    tracer = Tracer(capacity=2)
+    nid = tracer.name_id("x")
+    for i in range(3):
+        tracer.span(nid, tracer.now(), i)
+    path = tmp_path / "trace.json"
+    assert tracer.export_chrome(str(path), {"seed": 1}) == 2
+    doc = json.loads(path.read_text(encoding="utf-8"))
+    assert [ev["args"]["n"] for ev in doc["traceEvents"][1:]] == [1, 2]
+    assert doc["otherData"] == {"seed": 1, "written": 3, "capacity": 2}
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        Tracer(capacity=0)
+
+
+def test_instrument_skips_detail_phases_unless_requested():
+    module = types.ModuleType("fake")
+    module.move_player = lambda: None
+    module.move_enemies = lambda: None
+    assert "move_player" in DETAIL_PHASES and "move_enemies" not in DETAIL_PHASES
+    original = module.move_player
+    for detail in (False, True):
+        tracer = Tracer(capacity=8)
+        restore = instrument(tracer, [module], detail=detail)
+        module.move_player()
+        module.move_enemies()
+        assert [name for _, _, name, _ in tracer.records()] == (["move_player"] if detail else []) + ["move_enemies"]
+        restore()
+        assert module.move_player is original
@@ -0,0 +1,72 @@
+"""Min-kupac alapú időzítő a játékórához.
+
+Az események (power-up lejárat, lövési cooldown vége) a lejárati idejük szerint egy
+min-kupacban várnak; frame-enként csak a kupac tetejét kell megnézni (O(1)), és csak
+a tényleg esedékes események kerülnek elő (O(log n) eseményenként). Az események
+egyszerű adatok (idő, sorszám, fajta, payload), így a kupac olcsón másolható.
+
+Törlés helyett "lusta érvénytelenítést" használunk: a kezelő ellenőrzi, hogy az esemény
+még aktuális-e (pl. ugyanaz az aktiválási idő / generáció), és ha nem, nem csinál semmit.
+"""
+
+import heapq
+from typing import Any, List, Tuple
+
+TimerEvent = Tuple[float, int, str, Any]  # (esedékesség ms, sorszám, fajta, payload)
+
+
+class TimerHeap:
+    """Játékidő szerinti eseményütemező.
+
+    Attribútumok:
+        fired (int): Eddig kiváltott események száma (mérés/diagnosztika).
+    """
+
+    def __init__(self) -> None:
+        self._heap: List[TimerEvent] = []
+        self._seq = 0
+        self.fired = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def schedule(self, due_ms: float, kind: str, payload: Any = None) -> None:
+        """Új esemény felvétele.
+
+        Paraméterek:
+            due_ms (float): Esedékesség játékidőben (`game_ticks()` skála).
+            kind (str): Eseményfajta, ez alapján választ kezelőt a hívó.
+            payload (Any): Tetszőleges adat a kezelőnek.
+
+        Visszatérés:
+            None
+        """
+        self._seq += 1
+        heapq.heappush(self._heap, (due_ms, self._seq, kind, payload))
+
+    def pop_due(self, now_ms: float) -> List[Tuple[str, Any]]:
+        """Kiveszi az összes `now_ms`-ig esedékes eseményt, időrendben.
+
+        Paraméterek:
+            now_ms (float): Aktuális játékidő.
+
+        Visszatérés:
+            List[Tuple[str, Any]]: (fajta, payload) párok.
+        """
+        heap = self._heap
+        if not heap or heap[0][0] > now_ms:
+            return []
+        due: List[Tuple[str, Any]] = []
+        while heap and heap[0][0] <= now_ms:
+            _t, _seq, kind, payload = heapq.heappop(heap)
+            due.append((kind, payload))
+        self.fired += len(due)
+        return due
+
+    def copy(self) -> "TimerHeap":
+        """Sekély másolat (a payloadok közösek maradnak)."""
+        other = TimerHeap()
+        other._heap = list(self._heap)
+        other._seq = self._seq
+        other.fired = self.fired
+        return other
@@ -0,0 +1,167 @@
+"""Időzítési segédek a játékkörhöz: fix lépésközű szimuláció és rátaszámlálók.
+
+A szimuláció (mozgás, lövés, ütközés) fix logikai ütemben fut (`SIM_HZ`), a
+kirajzolás pedig olyan gyakran, ahogy a kijelző/gép engedi. Lassú frame esetén
+több szimulációs lépés fut le egy kirajzolás előtt (a köztes kirajzolások
+kimaradnak), így a játéklogika nem lassul le.
+"""
+
+import time
+from typing import Dict, List, Optional
+
+from helper import SIM_HZ
+
+
+class RateCounter:
+    """Eseményszámláló, amely nagyjából másodpercenként frissített rátát is ad.
+
+    Attribútumok:
+        total (int): Összes eddigi esemény.
+        rate (float): Utolsó mérési ablakban mért ráta (esemény/másodperc).
+    """
+
+    def __init__(self, window_s: float = 1.0) -> None:
+        self.window_s = window_s
+        self.total = 0
+        self.rate = 0.0
+        self._window_count = 0
+        self._window_start = time.perf_counter()
+
+    def tick(self, n: int = 1) -> None:
+        """Rögzít `n` eseményt, és ha letelt az ablak, újraszámolja a rátát.
+
+        Paraméterek:
+            n (int): Események száma (alapértelmezett: 1).
+
+        Visszatérés:
+            None
+        """
+        self.total += n
+        self._window_count += n
+        now = time.perf_counter()
+        elapsed = now - self._window_start
+        if elapsed >= self.window_s:
+            self.rate = self._window_count / elapsed
+            self._window_count = 0
+            self._window_start = now
+
+
+class FixedTimestep:
+    """Akkumulátoros ütemező: a valós frame-időből fix hosszú szimulációs lépéseket képez.
+
+    Attribútumok:
+        step_ms (float): Egy szimulációs lépés hossza ms-ban.
+        max_steps_per_frame (int): Ennyi lépésnél többet egy frame-ben nem futtatunk
+            (spirál-halál elleni védelem); a maradék időt eldobjuk.
+        sim (RateCounter): Szimulációs lépések száma / rátája.
+        render (RateCounter): Kirajzolt frame-ek száma / rátája.
+        skipped_renders (int): Terhelés miatt kihagyott kirajzolások (plusz lépések) száma.
+        dropped_ms (float): A lépéskorlát miatt eldobott szimulációs idő ms-ban.
+    """
+
+    def __init__(self, step_hz: float = SIM_HZ, max_steps_per_frame: int = 8) -> None:
+        if step_hz <= 0:
+            raise ValueError("step_hz-nek pozitívnak kell lennie")
+        self.step_ms = 1000.0 / step_hz
+        self.max_steps_per_frame = max_steps_per_frame
+        self.accumulator = 0.0
+        self.sim = RateCounter()
+        self.render = RateCounter()
+        self.skipped_renders = 0
+        self.dropped_ms = 0.0
+
+    def begin_frame(self, frame_ms: float) -> int:
+        """Hozzáadja a frame idejét az akkumulátorhoz, és visszaadja a futtatandó lépések számát.
+
+        Paraméterek:
+            frame_ms (float): Az előző frame óta eltelt valós idő ms-ban (pl. `clock.tick()`).
+
+        Visszatérés:
+            int: Ebben a frame-ben lefuttatandó szimulációs lépések száma (0 is lehet).
+        """
+        self.accumulator += max(0.0, frame_ms)
+        steps = int(self.accumulator // self.step_ms)
+        if steps > self.max_steps_per_frame:
+            self.dropped_ms += (steps - self.max_steps_per_frame) * self.step_ms
+            steps = self.max_steps_per_frame
+        self.accumulator -= steps * self.step_ms
+        if self.accumulator > self.step_ms:
+            # a korlát miatt ennyivel maradtunk le -> nem halmozzuk tovább
+            self.accumulator %= self.step_ms
+        if steps > 1:
+            self.skipped_renders += steps - 1
+        return steps
+
+    def step_done(self) -> None:
+        """Egy lefutott szimulációs lépés rögzítése."""
+        self.sim.tick()
+
+    def frame_rendered(self) -> None:
+        """Egy kirajzolt frame rögzítése."""
+        self.render.tick()
+
+    def summary(self) -> str:
+        """Rövid, egysoros összefoglaló a számlálókról (pl. ablakcímhez vagy konzolra)."""
+        return (f"sim {self.sim.rate:.0f} Hz | render {self.render.rate:.0f} FPS | "
+                f"kihagyott render: {self.skipped_renders}")
+
+
+class CpuMeter:
+    """A folyamat CPU-használata állapotonként (pl. "menu", "game", "paused").
+
+    A CPU-idő `time.process_time()` (minden szál), a falióra `time.perf_counter()`;
+    a százalék a kettő aránya, így látszik, mennyit spórol a tétlen menü vagy a szünet.
+
+    Attribútumok:
+        state (Optional[str]): Az aktuális állapot.
+        totals (Dict[str, List[float]]): Állapotonként [falióra s, CPU s].
+    """
+
+    def __init__(self) -> None:
+        self.state: Optional[str] = None
+        self.totals: Dict[str, List[float]] = {}
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        self._sample_wall = self._wall
+        self._sample_cpu = self._cpu
+
+    def switch(self, state: str) -> None:
+        """Az eddig eltelt időt az előző állapothoz könyveli, és átvált `state`-re."""
+        if state == self.state:
+            return
+        wall, cpu = time.perf_counter(), time.process_time()
+        if self.state is not None:
+            acc = self.totals.setdefault(self.state, [0.0, 0.0])
+            acc[0] += wall - self._wall
+            acc[1] += cpu - self._cpu
+        self.state = state
+        self._wall, self._cpu = wall, cpu
+
+    def sample(self) -> float:
+        """CPU% az előző `sample` hívás óta (az ablak címsorához)."""
+        wall, cpu = time.perf_counter(), time.process_time()
+        elapsed = wall - self._sample_wall
+        percent = (cpu - self._sample_cpu) / elapsed * 100.0 if elapsed > 0 else 0.0
+        self._sample_wall, self._sample_cpu = wall, cpu
+        return percent
+
+    def percent(self, state: str) -> float:
+        """Átlagos CPU% a megadott állapotban (a folyamatban lévő szakasszal együtt)."""
+        wall, cpu = self.totals.get(state, [0.0, 0.0])
+        if state == self.state:
+            wall += time.perf_counter() - self._wall
+            cpu += time.process_time() - self._cpu
+        return cpu / wall * 100.0 if wall > 0 else 0.0
+
+    def summary(self) -> str:
+        """Egysoros összefoglaló állapotonként: CPU% és eltöltött idő."""
+        states = list(self.totals)
+        if self.state is not None and self.state not in states:
+            states.append(self.state)
+        parts = []
+        for state in states:
+            wall = self.totals.get(state, [0.0, 0.0])[0]
+            if state == self.state:
+                wall += time.perf_counter() - self._wall
+            parts.append(f"{state} {self.percent(state):.1f}% ({wall:.0f} s)")
+        return "CPU: " + " | ".join(parts)
@@ -0,0 +1,207 @@
+"""Alacsony overheadű eseménynapló (ring buffer) Chrome trace-event exporttal.
+
+Az összesített időzítők (`timing`, `latency_guard`) nem mutatják meg, mi történt egy
+konkrét lassú frame-ben. A `Tracer` időbélyeges szakaszokat (span) és pillanatnyi
+eseményeket rögzít egy előre lefoglalt bináris gyűrűpufferbe (`bytearray`, rekordonként 24
+bájt: kezdet ns, hossz ns, név-azonosító, argumentum – egyetlen `struct.pack_into` hívással),
+így a legutóbbi N rekord mindig megvan, és a memória nem nő.
+
+    python main.py --trace [trace.json]     # F10: azonnali mentés, kilépéskor is ment
+    python bench.py trace                   # overhead-mérés headless játékon
+
+Kikapcsolva nincs költsége: a `update_game_state` fázisait (`PHASES`) csak az `instrument`
+csomagolja be bekapcsoláskor, a `main` saját szakaszai pedig `tracer is not None`
+feltételhez kötöttek. A kimenet a chrome://tracing, a Perfetto (ui.perfetto.dev) vagy a
+speedscope idővonalán nyitható meg.
+"""
+
+import json
+import struct
+import time
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_TRACE_PATH = "trace.json"
+DEFAULT_CAPACITY = 1 << 16     # rekord (1,5 MB); 60 FPS-nél kb. fél perc teljes játékmenet
+RECORD = struct.Struct("<qqii")  # kezdet_ns, hossz_ns (-1: pillanatnyi esemény), név-id, argumentum
+INSTANT = -1
+
+# A `update_game_state` fázisai (és amit hívnak): név -> (számlált lista argumentumindexe,
+# esemény neve). Ha a lista hossza a hívás alatt változik, a különbség eseményként is bekerül.
+PHASES: Dict[str, Tuple[Optional[int], Optional[str]]] = {
+    "update_game_state": (None, None),
+    "decide_action": (None, None),
+    "process_timers": (None, None),
+    "move_player": (None, None),
+    "spawn_powerup": (None, None),
+    "handle_shooting": (1, "shot"),                 # bullets: nő
+    "move_bullets": (None, None),
+    "handle_bullet_collisions": (1, "hit"),         # enemies: csökken
+    "collect_powerups": (1, "powerup_pickup"),      # powerups: csökken
+    "move_enemies": (None, None),
+    "check_player_collision": (None, None),
+    "reset_level": (None, None),
+}
+# Olcsó, eseményt nem adó fázisok: egy rekord (~1 µs) náluk a fázis idejével összemérhető,
+# ezért csak kérésre (`detail=True`, `--trace-detail`) kerülnek a naplóba.
+DETAIL_PHASES = frozenset({"process_timers", "move_player", "spawn_powerup", "move_bullets"})
+
+
+class Tracer:
+    """Gyűrűpufferes span/esemény-rögzítő.
+
+    Attribútumok:
+        capacity (int): Rekordok száma a pufferben (a legrégebbiek felülíródnak).
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        if capacity <= 0:
+            raise ValueError("a kapacitás pozitív kell legyen")
+        self.capacity = capacity
+        self._buf = bytearray(RECORD.size * capacity)
+        self._limit = RECORD.size * capacity
+        self._pos = 0
+        self._laps = 0
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._origin_ns = time.perf_counter_ns()
+
+    now = staticmethod(time.perf_counter_ns)
+
+    @property
+    def written(self) -> int:
+        """Eddig rögzített rekordok (a felülírtakkal együtt)."""
+        return self._laps * self.capacity + self._pos // RECORD.size
+
+    def name_id(self, name: str) -> int:
+        """A név egész azonosítója (a forró úton előre lekérendő)."""
+        nid = self._ids.get(name)
+        if nid is None:
+            nid = self._ids[name] = len(self._names)
+            self._names.append(name)
+        return nid
+
+    def _write(self, start_ns: int, dur_ns: int, nid: int, arg: int) -> None:
+        i = self._pos
+        RECORD.pack_into(self._buf, i, start_ns, dur_ns, nid, arg)
+        i += RECORD.size
+        if i == self._limit:
+            i = 0
+            self._laps += 1
+        self._pos = i
+
+    def span(self, nid: int, start_ns: int, arg: int = 0) -> None:
+        """Lezárt szakasz `start_ns`-től (`now()`) mostanáig."""
+        self._write(start_ns, time.perf_counter_ns() - start_ns, nid, arg)
+
+    def event(self, nid: int, arg: int = 0) -> None:
+        """Pillanatnyi esemény (pl. lövés, találat) most."""
+        self._write(time.perf_counter_ns(), INSTANT, nid, arg)
+
+    def records(self) -> List[Tuple[int, int, str, int]]:
+        """A pufferben lévő rekordok időrendben: (kezdet_ns, hossz_ns, név, argumentum)."""
+        view = memoryview(self._buf)
+        chunks = (view[self._pos:], view[:self._pos]) if self._laps else (view[:self._pos],)
+        names = self._names
+        return [(start, dur, names[nid], arg)
+                for chunk in chunks for start, dur, nid, arg in RECORD.iter_unpack(chunk)]
+
+    def export_chrome(self, path: str, metadata: Optional[Dict[str, Any]] = None) -> int:
+        """A puffer mentése Chrome trace-event JSON-ba (időbélyegek µs-ban, a tracer indulásától).
+
+        Visszatérés:
+            int: A kiírt események száma.
+        """
+        events: List[Dict[str, Any]] = [
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": 1, "args": {"name": "játékkör"}}]
+        for start, dur, name, arg in self.records():
+            ts = (start - self._origin_ns) / 1000.0
+            if dur == INSTANT:
+                ev: Dict[str, Any] = {"name": name, "ph": "i", "s": "t", "ts": ts, "pid": 1, "tid": 1}
+            else:
+                ev = {"name": name, "ph": "X", "ts": ts, "dur": dur / 1000.0, "pid": 1, "tid": 1}
+            if arg:
+                ev["args"] = {"n": arg}
+            events.append(ev)
+        doc = {"traceEvents": events, "displayTimeUnit": "ms",
+               "otherData": dict(metadata or {}, written=self.written, capacity=self.capacity)}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(doc, f)
+        return len(events) - 1
+
+    def wrap(self, func: Callable[..., Any], name: str, counted: Optional[int] = None,
+             event: Optional[str] = None) -> Callable[..., Any]:
+        """`func` becsomagolása: minden hívás egy `name` szakasz; `counted` indexű lista
+        hosszváltozása `event` eseményként (a változás abszolút értékével) rögzül.
+
+        A rekord írása a csomagolóba van beépítve (nincs további metódushívás), mert ez
+        frame-enként több tucatszor fut.
+        """
+        nid = self.name_id(name)
+        eid = self.name_id(event or name)
+        now = time.perf_counter_ns
+        pack = RECORD.pack_into
+        size = RECORD.size
+        buf = self._buf
+        limit = self._limit
+
+        if counted is None:
+            def traced(*args: Any, **kwargs: Any) -> Any:
+                t0 = now()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    t1 = now()
+                    i = self._pos
+                    pack(buf, i, t0, t1 - t0, nid, 0)
+                    i += size
+                    if i == limit:
+                        i = 0
+                        self._laps += 1
+                    self._pos = i
+        else:
+            def traced(*args: Any, **kwargs: Any) -> Any:
+                items = args[counted]
+                before = len(items)
+                t0 = now()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    t1 = now()
+                    self._write(t0, t1 - t0, nid, 0)
+                    delta = len(items) - before
+                    if delta:
+                        self._write(t1, INSTANT, eid, abs(delta))
+        traced.__wrapped__ = func  # type: ignore[attr-defined]
+        return traced
+
+
+def instrument(tracer: Tracer, modules: Iterable[ModuleType],
+               phases: Dict[str, Tuple[Optional[int], Optional[str]]] = PHASES,
+               detail: bool = False) -> Callable[[], None]:
+    """A `phases` függvények becsomagolása minden megadott modulban, ahol az eredetire mutatnak.
+
+    A `from helper import *` miatt ugyanaz a függvény több modul névterében is szerepel;
+    mindegyikben ugyanarra a csomagolóra cseréljük. A `DETAIL_PHASES` fázisai csak
+    `detail=True` mellett csomagolódnak.
+
+    Visszatérés:
+        Callable[[],None]: Visszaállító függvény (az eredeti függvényeket teszi vissza).
+    """
+    modules = list(modules)
+    patched: List[Tuple[ModuleType, str, Any]] = []
+    for name, (counted, event) in phases.items():
+        if name in DETAIL_PHASES and not detail:
+            continue
+        originals = {id(getattr(m, name)): getattr(m, name) for m in modules if callable(getattr(m, name, None))}
+        for func in originals.values():
+            wrapper = tracer.wrap(func, name, counted, event)
+            for module in modules:
+                if getattr(module, name, None) is func:
+                    patched.append((module, name, func))
+                    setattr(module, name, wrapper)
+
+    def restore() -> None:
+        for module, name, func in reversed(patched):
+            setattr(module, name, func)
+    return restore
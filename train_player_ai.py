@@ -1,76 +1,157 @@
 from sklearn.model_selection import train_test_split
-from sklearn.neighbors import KNeighborsClassifier
 from sklearn.metrics import accuracy_score
 import joblib
-import csv
-from typing import List, Tuple
+import numpy as np
+from typing import Any, Tuple
+import argparse
 import sys
+import time
 from pathlib import Path
 
-def train_player_ai(csv_path: str = "examples.csv", model_path: str = "player_model.joblib") -> Tuple[float, int]:
+from compact_examples import WeightedKNeighborsClassifier, load_dataset, load_examples
+from knn_model import NumpyKNN, verify
+from prototypes import REDUCTION_METHODS, reduce_prototypes
+
+MAX_ACCURACY_DROP = 0.02   # ennél nagyobb pontosságvesztésnél a teljes modell marad
+LATENCY_PROBES = 300       # döntésenkénti jóslási idő mérésének ismétlésszáma
+
+def load_training_data(path: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Tanítóadat betöltése súlyokkal: tömörített `.npz` vagy CSV / shard-könyvtár.
+
+    Paraméterek:
+        path (str): `compact_examples.py` kimenete (`.npz`), CSV fájl vagy shard-könyvtár.
+
+    Visszatérés:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: (X, y, weight); CSV-nél minden súly 1.
+
+    Kivétel dobása:
+        FileNotFoundError: Ha a forrás nem létezik.
+        ValueError: Hiányzó fejléc vagy hibás adatkészlet esetén.
+    """
+    if Path(path).suffix == ".npz":
+        return load_dataset(path)
+    X, y = load_examples(path)
+    return (np.asarray(X, dtype=np.float32).reshape(-1, 2), np.asarray(y, dtype=np.int64),
+            np.ones(len(y), dtype=np.int64))
+
+
+def decision_latency_us(model: Any, X: np.ndarray, probes: int = LATENCY_PROBES) -> float:
+    """Egyetlen döntés jóslási ideje µs-ban a játék útvonalán (`NumpyKNN.predict_one`)."""
+    knn = NumpyKNN.from_sklearn(model)
+    queries = X[np.arange(probes) % len(X)].astype(np.float64)
+    t0 = time.perf_counter()
+    for q in queries:
+        knn.predict_one(*q)
+    return (time.perf_counter() - t0) / probes * 1e6
+
+
+def train_player_ai(csv_path: str = "examples.csv", model_path: str = "player_model.joblib",
+                    reduce: str = "none", max_accuracy_drop: float = MAX_ACCURACY_DROP) -> Tuple[float, int]:
     """Betanít egy K-közeli szomszédok (KNN) modellt az examples.csv alapján, és elmenti.
 
     Paraméterek:
-        csv_path (str): Az adatokat tartalmazó CSV fájl elérési útja (alapértelmezett: "examples.csv").
+        csv_path (str): Az adatokat tartalmazó CSV fájl elérési útja (alapértelmezett: "examples.csv"),
+            egy könyvtár, amelynek minden `*.csv` shardját beolvassa (pl. `selfplay.py` kimenete),
+            vagy a `compact_examples.py` által írt `.npz` adatkészlet. Ez utóbbinál a sorok
+            súlyozottak (összevont duplikátumok), a szavazatok a súlyokkal arányosak.
         model_path (str): A kimeneti modell fájl elérési útja (alapértelmezett: "player_model.joblib").
+        reduce (str): Prototípus-redukció (`prototypes.REDUCTION_METHODS`); "none" esetén
+            minden tanítósor a modellben marad. Redukciónál a teljes és a redukált modellt
+            ugyanazon a teszthalmazon vetjük össze (prototípusszám, pontosság, döntési idő).
+        max_accuracy_drop (float): Ha a redukált modell pontossága ennél többel (0..1) elmarad
+            a teljesétől, a teljes modell mentődik.
 
     Visszatérés:
         Tuple[float, int]: (pontosság, minták száma)
             - pontosság (float): A modell pontossága a tesztadatokon (0.0 és 1.0 között).
-            - minták száma (int): A tanító és teszt adatok teljes száma.
+            - minták száma (int): A tanító és teszt adatok teljes száma (súlyozott
+              adatkészletnél az összevont sorok által képviselt példák száma).
 
     Mellékhatás:
-        - A betanított modell a megadott `model_path`-ra mentődik.
+        - A betanított modell a megadott `model_path`-ra mentődik, mellé az sklearn nélkül
+          betölthető `.npz` változat (`knn_model.NumpyKNN`), egyezés-ellenőrzés után.
         - A konzolra kiíródik a modell pontossága és a mentés megerősítése.
         - Hiba esetén (pl. üres CSV, hiányzó fejléc) a program kilép hibaüzenettel.
 
     Kivétel dobása:
-        FileNotFoundError: Ha a `csv_path` nem létezik.
-        ValueError: Ha a CSV üres vagy hiányzik a szükséges fejléc.
+        FileNotFoundError: Ha a `csv_path` nem létezik (vagy a könyvtárban nincs CSV).
+        ValueError: Ha a CSV üres, hiányzik a szükséges fejléc vagy ismeretlen a redukció.
     """
     # Adatok betöltése
-    if not Path(csv_path).exists():
-        raise FileNotFoundError(f"A {csv_path} fájl nem létezik.")
-
-    X: List[List[float]] = []
-    y: List[int] = []
-
-    with open(csv_path, newline="", encoding="utf-8") as f:
-        r = csv.DictReader(f)
-        # Ellenőrizzük a fejlécet
-        if not all(field in r.fieldnames for field in ["dx", "dy", "action"]):
-            raise ValueError("A CSV-nek tartalmaznia kell a 'dx', 'dy', 'action' oszlopokat.")
-        
-        for row in r:
-            X.append([float(row["dx"]), float(row["dy"])])
-            y.append(int(row["action"]))
-
-    if not X:
+    X, y, weight = load_training_data(csv_path)
+    if not len(X):
         raise ValueError(f"A {csv_path} üres, nincs adat a tanításhoz.")
+    weighted = bool((weight != 1).any())
 
     # Adatok felosztása
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42
+    X_train, X_test, y_train, y_test, w_train, w_test = train_test_split(
+        X, y, weight, test_size=0.2, random_state=42
     )
 
-    # Modell tanítása
-    model = KNeighborsClassifier(n_neighbors=3)
-    model.fit(X_train, y_train)
+    # Modell tanítása (összevont duplikátumoknál a súlyok a szavazatokban élnek tovább;
+    # a holtversenyek determinisztikusak, így az .npz export jóslatai azonosak)
+    model = WeightedKNeighborsClassifier(n_neighbors=3)
+    model.fit(X_train, y_train, sample_weight=w_train if weighted else None)
+    if weighted:
+        print(f"Súlyozott adatkészlet: {len(X)} egyedi sor, {int(weight.sum())} példa")
 
     # Pontosság kiértékelése
     pred = model.predict(X_test)
-    acc = accuracy_score(y_test, pred)
+    acc = accuracy_score(y_test, pred, sample_weight=w_test if weighted else None)
     print(f"Pontosság: {round(acc * 100, 1)}%")
 
+    # Prototípus-redukció: kisebb modell, gyorsabb döntés, ha a pontosság nem romlik túl sokat
+    if reduce != "none":
+        t0 = time.perf_counter()
+        X_red, y_red, w_red = reduce_prototypes(X_train, y_train, w_train, reduce, k=model.n_neighbors)
+        reduce_s = time.perf_counter() - t0
+        reduced = WeightedKNeighborsClassifier(n_neighbors=min(model.n_neighbors, len(X_red)))
+        reduced.fit(X_red, y_red, sample_weight=w_red)
+        acc_red = accuracy_score(y_test, reduced.predict(X_test), sample_weight=w_test if weighted else None)
+        full_us = decision_latency_us(model, X_test if len(X_test) else X_train)
+        red_us = decision_latency_us(reduced, X_test if len(X_test) else X_train)
+        print(f"Redukció ({reduce}, {reduce_s:.1f} s): {len(X_train)} -> {len(X_red)} prototípus "
+              f"({len(X_train) / max(1, len(X_red)):.1f}×) | pontosság {acc * 100:.1f}% -> {acc_red * 100:.1f}% "
+              f"({(acc_red - acc) * 100:+.1f} pont) | döntés {full_us:.0f} -> {red_us:.0f} µs")
+        if acc - acc_red > max_accuracy_drop:
+            print(f"Figyelem: a pontosságvesztés meghaladja a {max_accuracy_drop * 100:.1f} pontot, "
+                  f"a teljes modell mentődik")
+        else:
+            model, acc = reduced, acc_red
+
     # Modell mentése
     joblib.dump(model, model_path)
     print(f"Mentve: {model_path}")
 
-    return acc, len(X)
+    # sklearn-mentes változat a játéknak (gyorsabb betöltés, nem függ az sklearn verziótól)
+    knn = NumpyKNN.from_sklearn(model)
+    check = verify(model, knn)
+    npz_path = Path(model_path).with_suffix(".npz")
+    if check["mismatches"]:
+        npz_path.unlink(missing_ok=True)  # egy régi .npz ne előzze meg az új .joblib-ot
+        print(f"Figyelem: {check['mismatches']}/{check['queries']} eltérő jóslat, az .npz nem készült el")
+    else:
+        knn.save(str(npz_path))
+        t0 = time.perf_counter()
+        NumpyKNN.load(npz_path)
+        print(f"Mentve: {npz_path} ({check['queries']} lekérdezésen azonos jóslat, "
+              f"betöltés {(time.perf_counter() - t0) * 1000:.1f} ms)")
+
+    return acc, int(weight.sum())
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="KNN játékos-modell tanítása")
+    parser.add_argument("source", nargs="?", default="examples.csv",
+                        help="CSV fájl, shard-könyvtár vagy tömörített .npz (alapértelmezett: examples.csv)")
+    parser.add_argument("-o", "--output", default="player_model.joblib", help="kimeneti modell (.joblib)")
+    parser.add_argument("--reduce", choices=REDUCTION_METHODS, default="none",
+                        help="prototípus-redukció: enn (zajszűrés), cnn (kondenzálás), enn+cnn (mindkettő)")
+    parser.add_argument("--max-accuracy-drop", type=float, default=MAX_ACCURACY_DROP * 100, metavar="PONT",
+                        help="ennél nagyobb pontosságvesztésnél (százalékpont) a teljes modell marad")
+    args = parser.parse_args()
     try:
-        accuracy, sample_count = train_player_ai()
+        accuracy, sample_count = train_player_ai(args.source, args.output, args.reduce,
+                                                 args.max_accuracy_drop / 100)
         print(f"Tanító és teszt minták száma: {sample_count}")
     except (FileNotFoundError, ValueError) as e:
         print(f"Hiba: {e}")